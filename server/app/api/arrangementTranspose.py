@@ -0,0 +1,98 @@
+# app/api/arrangementTranspose.py
+import re
+from functools import lru_cache
+from typing import Optional
+
+from app.api.chordTheory import CHORD_SUFFIX, pitch_class, split_key, note_names
+from app.api.chordVoicings import chord_diagrams
+
+# A chord token on a chord line, with any brackets/bar lines around it kept
+_TOKEN_RE = re.compile(
+    rf"^([(\[{{|]*)([A-G][#♯b♭]?)({CHORD_SUFFIX})"
+    r"(?:/([A-G][#♯b♭]?))?([)\]}|.,:*]*)$"
+)
+_WORD_RE = re.compile(r"\S+")
+
+
+@lru_cache(maxsize=4096)
+def transpose_chord(token: str, shift: int, spelling: int) -> Optional[str]:
+    """'F#m7/C#' up 3 -> 'Am7/E', spelled as in the major key on `spelling`;
+    None if the token isn't a chord. The suffix is kept as written."""
+    match = _TOKEN_RE.match(token)
+    if not match:
+        return None
+    before, root, suffix, bass, after = match.groups()
+    names = note_names(spelling)
+    root = names[(pitch_class(root) + shift) % 12]
+    if bass:
+        bass = names[(pitch_class(bass) + shift) % 12]
+    return f"{before}{root}{suffix}{'/' + bass if bass else ''}{after}"
+
+
+# Chord lines repeat across verses and choruses
+@lru_cache(maxsize=4096)
+def transpose_chord_line(line: str, shift: int, spelling: int) -> str:
+    """Transpose every chord on a chord line. Each chord stays at its column
+    above the lyrics; one that grew ("Bb" -> "B" is fine, "E" -> "F#" isn't)
+    only pushes the next chord right when they would touch."""
+    out = []
+    end = 0
+    for match in _WORD_RE.finditer(line):
+        token = transpose_chord(match.group(), shift, spelling) or match.group()
+        start = match.start() if not out else max(match.start(), end + 1)
+        out.append(" " * (start - end) + token)
+        end = start + len(token)
+    return "".join(out)
+
+
+def _transpose_symbol(symbol: str, shift: int, spelling: int) -> str:
+    return transpose_chord(symbol, shift, spelling) or transpose_chord_line(symbol, shift, spelling)
+
+
+def transpose_arrangement(arrangement: dict, key: Optional[str] = None, capo: Optional[int] = None) -> dict:
+    """FullSongArrangement dict moved to `key` and/or played with `capo`.
+
+    Chords are concert pitch, so a new key rewrites every chord name (the
+    song keeps its mode: "A" for an E minor song means A minor) while a new
+    capo only changes the diagram shapes. Substitution `theory` text is
+    left as written. Raises ValueError for a key that doesn't parse.
+    """
+    result = dict(arrangement)
+    shift = spelling = 0
+    if key is not None:
+        source, minor = split_key(arrangement.get("key"))
+        target, _ = split_key(key)
+        shift = (target - source) % 12
+        spelling = (target + 3) % 12 if minor else target
+        result["key"] = note_names(spelling)[target] + ("m" if minor else "")
+    if capo is not None:
+        if capo and arrangement.get("instrument") == "Piano":
+            raise ValueError("Piano has no capo")
+        result["capoFret"] = capo
+
+    if shift:
+        result["progressionSummary"] = [
+            _transpose_symbol(chord, shift, spelling) for chord in arrangement.get("progressionSummary") or []
+        ]
+        result["tablature"] = [
+            {**section, "lines": [
+                {**line, "lyrics": transpose_chord_line(line["lyrics"], shift, spelling)} if line.get("isChordLine") else line
+                for line in section.get("lines") or []
+            ]}
+            for section in arrangement.get("tablature") or []
+        ]
+        result["substitutions"] = [
+            {**sub,
+             "originalChord": _transpose_symbol(sub["originalChord"], shift, spelling),
+             "substitutedChord": _transpose_symbol(sub["substitutedChord"], shift, spelling)}
+            for sub in arrangement.get("substitutions") or []
+        ]
+
+    diagrammed = [d["chord"] for d in arrangement.get("chordDiagrams") or []]
+    if shift:
+        diagrammed = [_transpose_symbol(chord, shift, spelling) for chord in diagrammed]
+    result["chordDiagrams"] = chord_diagrams(
+        list(result.get("progressionSummary") or []) + diagrammed,
+        result.get("instrument"), result.get("tuning"), result.get("capoFret") or 0,
+    )
+    return result
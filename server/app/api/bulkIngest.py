@@ -0,0 +1,239 @@
+# app/api/bulkIngest.py
+import json
+from dataclasses import dataclass
+from typing import Callable, Optional
+from fastapi import HTTPException, Request
+from pydantic import ValidationError
+from sqlalchemy import select, update, tuple_, insert as core_insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import BULK_BATCH_SIZE, BULK_MAX_ROWS
+
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+class RowLimitExceeded(Exception):
+    """An NDJSON stream went past BULK_MAX_ROWS after rows were loaded."""
+
+
+@dataclass
+class BulkSpec:
+    """How one model is bulk-loaded: its input schema, the natural key that
+    identifies an existing row, and any columns derived from the input."""
+    model: type
+    schema: type
+    key_columns: tuple
+    derive: Optional[Callable[[dict], dict]] = None
+    # column -> referenced model, checked per batch so one bad row doesn't
+    # fail the whole insert on a foreign key violation
+    references: Optional[dict] = None
+
+    @property
+    def key_attrs(self):
+        return [getattr(self.model, column) for column in self.key_columns]
+
+    def key_of(self, values: dict):
+        return tuple(values[column] for column in self.key_columns)
+
+
+# ---------------------------
+# Request parsing
+# ---------------------------
+
+async def _ndjson_rows(request: Request):
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line
+    if buffer.strip():
+        yield buffer
+
+
+async def read_rows(request: Request):
+    """Yields (index, raw row) from a JSON array body or an NDJSON stream.
+    Raw rows are dicts, or the undecodable NDJSON line as an error string.
+
+    An oversized JSON array is rejected (413) before anything is loaded. An
+    NDJSON stream can't be counted up front, so it stops at BULK_MAX_ROWS
+    with RowLimitExceeded and the rows read so far are still loaded.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    count = 0
+    if content_type in NDJSON_TYPES:
+        async for line in _ndjson_rows(request):
+            if count >= BULK_MAX_ROWS:
+                raise RowLimitExceeded()
+            try:
+                yield count, json.loads(line)
+            except ValueError as e:
+                yield count, f"Invalid JSON: {e}"
+            count += 1
+        return
+
+    try:
+        body = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+    if not isinstance(body, list):
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+    if len(body) > BULK_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"At most {BULK_MAX_ROWS} rows per request")
+    for index, row in enumerate(body):
+        yield index, row
+
+
+# ---------------------------
+# Batched upserts
+# ---------------------------
+
+def _insert_ignoring_conflicts(db: AsyncSession, spec: BulkSpec):
+    table = spec.model.__table__
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return core_insert(table)
+    return insert(table).on_conflict_do_nothing(index_elements=list(spec.key_columns))
+
+
+async def _drop_dangling_references(db: AsyncSession, spec: BulkSpec, rows: list, results: list) -> list:
+    for column, target in (spec.references or {}).items():
+        wanted = {values[column] for _, values in rows if values.get(column) is not None}
+        if not wanted:
+            continue
+        found = set((await db.execute(select(target.id).where(target.id.in_(wanted)))).scalars())
+        missing = wanted - found
+        if not missing:
+            continue
+        for index, values in rows:
+            if values.get(column) in missing:
+                results[index] = {"index": index, "status": "error",
+                                  "error": f"Unknown {column} {values[column]}"}
+        rows = [(i, v) for i, v in rows if v.get(column) not in missing]
+    return rows
+
+
+async def _flush_batch(db: AsyncSession, spec: BulkSpec, batch: list, on_conflict: str,
+                       results: list, omitted: dict):
+    """Upserts one batch with a fixed number of round-trips: one SELECT of
+    existing keys, one multi-row INSERT and one executemany UPDATE per set
+    of columns provided (usually one). `omitted` maps a row's index to the
+    optional fields it left out, which an update keeps as stored."""
+    # The last occurrence of a key in the batch wins
+    latest = {}
+    for index, values in batch:
+        key = spec.key_of(values)
+        if key in latest:
+            results[latest[key][0]] = {"index": latest[key][0], "status": "skipped",
+                                       "error": "Superseded by a later row with the same key"}
+        latest[key] = (index, values)
+    rows = list(latest.values())
+
+    rows = await _drop_dangling_references(db, spec, rows, results)
+    if not rows:
+        return
+
+    key_attrs = spec.key_attrs
+    key_expr = key_attrs[0] if len(key_attrs) == 1 else tuple_(*key_attrs)
+    keys = [spec.key_of(values) for _, values in rows]
+    lookup = [key[0] for key in keys] if len(key_attrs) == 1 else keys
+    existing = {
+        tuple(row[1:]): row[0]
+        for row in await db.execute(select(spec.model.id, *key_attrs).where(key_expr.in_(lookup)))
+    }
+
+    new_rows = [(i, v) for i, v in rows if spec.key_of(v) not in existing]
+    old_rows = [(i, v) for i, v in rows if spec.key_of(v) in existing]
+
+    if new_rows:
+        stmt = _insert_ignoring_conflicts(db, spec).returning(spec.model.id, *key_attrs)
+        inserted = {tuple(row[1:]): row[0] for row in await db.execute(stmt, [v for _, v in new_rows])}
+        for index, values in new_rows:
+            row_id = inserted.get(spec.key_of(values))
+            if row_id is None:
+                # Inserted concurrently by another request
+                results[index] = {"index": index, "status": "skipped", "error": "Conflicting concurrent insert"}
+            else:
+                results[index] = {"index": index, "status": "inserted", "id": row_id}
+
+    if old_rows and on_conflict == "update":
+        by_columns = {}
+        for index, values in old_rows:
+            row = {column: value for column, value in values.items() if column not in omitted.get(index, ())}
+            row["id"] = existing[spec.key_of(values)]
+            by_columns.setdefault(frozenset(row), []).append(row)
+        for rows_with_columns in by_columns.values():
+            await db.execute(update(spec.model), rows_with_columns)
+    for index, values in old_rows:
+        status = "updated" if on_conflict == "update" else "skipped"
+        results[index] = {"index": index, "status": status, "id": existing[spec.key_of(values)]}
+
+    await db.commit()
+
+
+async def _flush_or_fail(db: AsyncSession, spec: BulkSpec, batch: list, on_conflict: str,
+                         results: list, omitted: dict):
+    try:
+        await _flush_batch(db, spec, batch, on_conflict, results, omitted)
+    except SQLAlchemyError as e:
+        # Earlier batches stay committed; this one is reported row by row
+        await db.rollback()
+        print(f"❌ Bulk {spec.model.__tablename__} batch failed: {getattr(e, 'orig', None) or e}")
+        for index, _ in batch:
+            results[index] = {"index": index, "status": "error", "error": "Database error while saving this batch"}
+
+
+async def bulk_upsert(db: AsyncSession, spec: BulkSpec, rows, on_conflict: str = "update") -> dict:
+    """Validates and loads rows in batches of BULK_BATCH_SIZE, committing
+    per batch. Returns counts plus one status entry per input row, and
+    `truncated` when an NDJSON stream was cut off at BULK_MAX_ROWS."""
+    results = []
+    batch = []
+    omitted = {}
+    truncated = False
+    try:
+        async for index, raw in rows:
+            results.append(None)
+            if isinstance(raw, str):
+                results[index] = {"index": index, "status": "error", "error": raw}
+                continue
+            try:
+                row = spec.schema.model_validate(raw)
+            except ValidationError as e:
+                results[index] = {"index": index, "status": "error",
+                                  "error": "; ".join(err["msg"] for err in e.errors())}
+                continue
+            # Inserts need every column; updates only touch what was sent
+            values = row.model_dump()
+            unset = set(values) - row.model_fields_set
+            if unset:
+                omitted[index] = unset
+            if spec.derive is not None:
+                values.update(spec.derive(values))
+            batch.append((index, values))
+            if len(batch) >= BULK_BATCH_SIZE:
+                await _flush_or_fail(db, spec, batch, on_conflict, results, omitted)
+                batch = []
+                omitted = {}
+    except RowLimitExceeded:
+        truncated = True
+    if batch:
+        await _flush_or_fail(db, spec, batch, on_conflict, results, omitted)
+
+    counts = {"inserted": 0, "updated": 0, "skipped": 0, "error": 0}
+    for result in results:
+        counts[result["status"]] += 1
+    return {
+        "inserted": counts["inserted"],
+        "updated": counts["updated"],
+        "skipped": counts["skipped"],
+        "failed": counts["error"],
+        "truncated": truncated,
+        "results": results,
+    }
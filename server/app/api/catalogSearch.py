@@ -0,0 +1,327 @@
+# app/api/catalogSearch.py
+import time
+import asyncio
+import bisect
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from collections import defaultdict
+from dataclasses import dataclass
+
+import numpy as np
+from sqlalchemy import select, func, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import (
+    SEARCH_BACKEND, SEARCH_FUZZY_THRESHOLD, SEARCH_INDEX_TTL, SEARCH_SIGNATURE_TTL,
+)
+from app.database import SessionLocal
+from app.api.catalogService import normalize_lookup_key
+
+# A row's score blends how much of the query it contains (typo tolerant)
+# with how many whole query words it matches
+FUZZY_WEIGHT = 0.7
+LEXICAL_WEIGHT = 0.3
+# Rows read per query while building an in-process index
+SEARCH_BUILD_BATCH = 5000
+
+
+@dataclass
+class SearchSpec:
+    """What one model is searched on. The SQL documents built here must stay
+    identical to the index expressions in the catalog_search_indexes
+    migration, or PostgreSQL won't use the indexes."""
+    model: type
+    fields: tuple           # columns returned for each hit
+    fuzzy_columns: tuple    # trigram (typo-tolerant) match
+    text_columns: tuple     # full-text (whole word) match
+    ts_config: str = "simple"
+
+    @property
+    def table(self) -> str:
+        return self.model.__tablename__
+
+    @staticmethod
+    def document(columns: tuple) -> str:
+        return " || ' ' || ".join(f"coalesce({column}, '')" for column in columns)
+
+    @property
+    def loaded_columns(self) -> tuple:
+        extra = [c for c in self.fuzzy_columns + self.text_columns if c not in self.fields]
+        return self.fields + tuple(dict.fromkeys(extra))
+
+
+def trigrams(value: str) -> set:
+    """pg_trgm-style trigrams: every word padded with two leading spaces and
+    one trailing space, so short words and word starts still match."""
+    grams = set()
+    for word in normalize_lookup_key(value).split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def _prefix_bounds(prefix: str):
+    """[low, high) covering every string that starts with `prefix`."""
+    low = prefix.lower()
+    return low, low[:-1] + chr(ord(low[-1]) + 1)
+
+
+# ---------------------------
+# In-process index (SQLite, PostgreSQL without pg_trgm, or SEARCH_BACKEND=memory)
+# ---------------------------
+
+class MemoryIndex:
+    """Trigram and word postings over one table. Postings are numpy arrays
+    of row positions, so scoring a query is one vectorized count over the
+    query's postings rather than a pass over every row."""
+
+    def __init__(self, spec: SearchSpec, rows, signature: tuple):
+        self.signature = signature
+        self.built_at = time.monotonic()
+        width = len(spec.fields)
+        columns = spec.loaded_columns
+        fuzzy_at = [columns.index(c) for c in spec.fuzzy_columns]
+        text_at = [columns.index(c) for c in spec.text_columns]
+        title_at = columns.index("title")
+
+        grams = defaultdict(list)
+        words = defaultdict(list)
+        prefixes = []
+        self.rows = []
+        for position, row in enumerate(rows):
+            self.rows.append(tuple(row[:width]))
+            for gram in trigrams(" ".join(str(row[i] or "") for i in fuzzy_at)):
+                grams[gram].append(position)
+            for word in set(normalize_lookup_key(" ".join(str(row[i] or "") for i in text_at)).split()):
+                words[word].append(position)
+            prefixes.append((str(row[title_at] or "").lower(), row[0], position))
+
+        self.grams = {gram: np.array(p, dtype=np.int32) for gram, p in grams.items()}
+        self.words = {word: np.array(p, dtype=np.int32) for word, p in words.items()}
+        prefixes.sort()
+        self.prefix_keys = [key for key, _, _ in prefixes]
+        self.prefix_rows = [position for _, _, position in prefixes]
+
+    def expired(self) -> bool:
+        return time.monotonic() - self.built_at > SEARCH_INDEX_TTL
+
+    def _hits(self, postings: dict, keys: set) -> np.ndarray:
+        matched = [postings[key] for key in keys if key in postings]
+        if not matched:
+            return np.zeros(len(self.rows), dtype=np.int64)
+        return np.bincount(np.concatenate(matched), minlength=len(self.rows))
+
+    def search(self, query: str, limit: int, threshold: float) -> list:
+        query_grams = trigrams(query)
+        query_words = set(normalize_lookup_key(query).split())
+        if not query_grams or not self.rows:
+            return []
+
+        fuzzy = self._hits(self.grams, query_grams) / len(query_grams)
+        word_hits = self._hits(self.words, query_words)
+        matched = np.flatnonzero((fuzzy >= threshold) | (word_hits == len(query_words)))
+        scores = FUZZY_WEIGHT * fuzzy[matched] + LEXICAL_WEIGHT * word_hits[matched] / len(query_words)
+        if matched.size > limit:
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            matched, scores = matched[top], scores[top]
+        # Best score first; ties in id order (rows are loaded by id)
+        order = np.lexsort((matched, -scores))
+        return [(self.rows[matched[i]], float(scores[i])) for i in order]
+
+    def complete(self, prefix: str, limit: int) -> list:
+        low, high = _prefix_bounds(prefix)
+        start = bisect.bisect_left(self.prefix_keys, low)
+        end = min(bisect.bisect_left(self.prefix_keys, high, lo=start), start + limit)
+        return [self.rows[self.prefix_rows[i]] for i in range(start, end)]
+
+
+# ---------------------------
+# PostgreSQL (pg_trgm + full-text GIN indexes)
+# ---------------------------
+
+def _pg_search_sql(spec: SearchSpec):
+    fuzzy = f"({spec.document(spec.fuzzy_columns)})"
+    vector = f"to_tsvector('{spec.ts_config}', {spec.document(spec.text_columns)})"
+    tsquery = f"websearch_to_tsquery('{spec.ts_config}', :q)"
+    # `<%` (word similarity above the threshold) and `@@` are both answered
+    # from GIN indexes; only matching rows are ranked
+    return text(f"""
+        SELECT {", ".join(spec.fields)},
+               {FUZZY_WEIGHT} * word_similarity(:q, {fuzzy})
+               + {LEXICAL_WEIGHT} * ts_rank_cd({vector}, {tsquery}, 32) AS score
+        FROM {spec.table}
+        WHERE :q <% {fuzzy} OR {vector} @@ {tsquery}
+        ORDER BY score DESC, id
+        LIMIT :limit
+    """)
+
+
+def _pg_complete_sql(spec: SearchSpec):
+    # Range scan on the (lower(title) COLLATE "C") btree, already in order
+    return text(f"""
+        SELECT {", ".join(spec.fields)}
+        FROM {spec.table}
+        WHERE lower(title) COLLATE "C" >= :low AND lower(title) COLLATE "C" < :high
+        ORDER BY lower(title) COLLATE "C", id
+        LIMIT :limit
+    """)
+
+
+class CatalogSearch:
+    """Ranked search and autocomplete over catalog tables.
+
+    In-process indexes are built on a background thread from the sync
+    engine. Searches keep using the current index while its replacement is
+    built and swapped in; only the very first search of a table waits.
+    """
+
+    def __init__(self):
+        self._indexes = {}
+        self._signatures = {}
+        self._builds = {}       # table -> Future of the running build
+        self._dirty = set()     # tables written to while their build ran
+        self._guard = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="search-index")
+        self._pg_trgm = None
+        self.builds = 0
+
+    async def engine_for(self, db: AsyncSession) -> str:
+        if SEARCH_BACKEND == "memory" or db.get_bind().dialect.name != "postgresql":
+            return "memory"
+        if self._pg_trgm is None:
+            self._pg_trgm = bool((await db.execute(
+                text("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')")
+            )).scalar())
+            if not self._pg_trgm:
+                print("⚠️ pg_trgm is not installed, catalog search uses the in-process index")
+        return "postgres" if self._pg_trgm else "memory"
+
+    async def _signature(self, db: AsyncSession, spec: SearchSpec) -> tuple:
+        """(row count, max id) of the table, re-read at most every
+        SEARCH_SIGNATURE_TTL seconds so searches don't each pay for it."""
+        cached = self._signatures.get(spec.table)
+        if cached is not None and time.monotonic() - cached[1] < SEARCH_SIGNATURE_TTL:
+            return cached[0]
+        signature = tuple((await db.execute(select(func.count(), func.max(spec.model.id)))).one())
+        self._signatures[spec.table] = (signature, time.monotonic())
+        return signature
+
+    def _rows(self, db, spec: SearchSpec):
+        """Rows in id order, read in batches so only postings (not every
+        lesson text at once) stay in memory."""
+        columns = [getattr(spec.model, c) for c in spec.loaded_columns]
+        last_id = 0
+        while True:
+            batch = db.execute(
+                select(*columns).where(spec.model.id > last_id).order_by(spec.model.id).limit(SEARCH_BUILD_BATCH)
+            ).all()
+            yield from batch
+            if len(batch) < SEARCH_BUILD_BATCH:
+                return
+            last_id = batch[-1][0]
+
+    def _build(self, spec: SearchSpec) -> MemoryIndex:
+        """Runs on the index thread: build, swap in, and build again if the
+        table was written to meanwhile."""
+        try:
+            while True:
+                with self._guard:
+                    self._dirty.discard(spec.table)
+                started = time.perf_counter()
+                db = SessionLocal()
+                try:
+                    signature = tuple(db.execute(select(func.count(), func.max(spec.model.id))).one())
+                    index = MemoryIndex(spec, self._rows(db, spec), signature)
+                finally:
+                    db.close()
+                self._indexes[spec.table] = index
+                self._signatures[spec.table] = (signature, time.monotonic())
+                self.builds += 1
+                print(f"🔎 Built {spec.table} search index: {len(index.rows)} rows in {time.perf_counter() - started:.2f}s")
+                with self._guard:
+                    if spec.table not in self._dirty:
+                        del self._builds[spec.table]
+                        return index
+        except Exception as e:
+            with self._guard:
+                self._builds.pop(spec.table, None)
+            print(f"❌ Building {spec.table} search index failed: {e}")
+            raise
+
+    def _schedule(self, spec: SearchSpec) -> Future:
+        """Start a background build, or have the running one go again."""
+        with self._guard:
+            build = self._builds.get(spec.table)
+            if build is not None:
+                self._dirty.add(spec.table)
+                return build
+            build = self._builds[spec.table] = self._executor.submit(self._build, spec)
+            return build
+
+    async def _memory_index(self, db: AsyncSession, spec: SearchSpec) -> MemoryIndex:
+        index = self._indexes.get(spec.table)
+        if index is None:
+            return await asyncio.wrap_future(self._schedule(spec))
+        if index.expired() or index.signature != await self._signature(db, spec):
+            self._schedule(spec)
+        return index
+
+    def invalidate(self, spec: SearchSpec):
+        """Rebuild the in-process index in the background after writes: the
+        row count alone doesn't show in-place updates, and it is only
+        re-read every SEARCH_SIGNATURE_TTL seconds."""
+        self._signatures.pop(spec.table, None)
+        if spec.table in self._indexes:
+            self._schedule(spec)
+
+    def wait_until_built(self, spec: SearchSpec, timeout: float = None):
+        """Block until no build of the table is running (scripts, tests)."""
+        build = self._builds.get(spec.table)
+        if build is not None:
+            wait([build], timeout=timeout)
+
+    def clear(self):
+        """Forget every index, after letting running builds finish."""
+        wait(list(self._builds.values()))
+        self._indexes.clear()
+        self._signatures.clear()
+
+    async def search(self, db: AsyncSession, spec: SearchSpec, query: str, limit: int) -> dict:
+        engine = await self.engine_for(db)
+        if not normalize_lookup_key(query):
+            return {"query": query, "engine": engine, "items": []}
+
+        if engine == "postgres":
+            await db.execute(
+                text("SELECT set_config('pg_trgm.word_similarity_threshold', :threshold, true)"),
+                {"threshold": str(SEARCH_FUZZY_THRESHOLD)},
+            )
+            rows = (await db.execute(_pg_search_sql(spec), {"q": query, "limit": limit})).all()
+            hits = [(tuple(row[:-1]), float(row[-1])) for row in rows]
+        else:
+            index = await self._memory_index(db, spec)
+            hits = index.search(query, limit, SEARCH_FUZZY_THRESHOLD)
+
+        return {
+            "query": query,
+            "engine": engine,
+            "items": [{**dict(zip(spec.fields, row)), "score": round(score, 4)} for row, score in hits],
+        }
+
+    async def complete(self, db: AsyncSession, spec: SearchSpec, prefix: str, limit: int) -> dict:
+        engine = await self.engine_for(db)
+        prefix = prefix.lstrip()
+        if not prefix:
+            return {"prefix": prefix, "engine": engine, "items": []}
+
+        if engine == "postgres":
+            low, high = _prefix_bounds(prefix)
+            rows = (await db.execute(_pg_complete_sql(spec), {"low": low, "high": high, "limit": limit})).all()
+        else:
+            index = await self._memory_index(db, spec)
+            rows = index.complete(prefix, limit)
+
+        return {"prefix": prefix, "engine": engine, "items": [dict(zip(spec.fields, row)) for row in rows]}
+
+
+catalog_search = CatalogSearch()
@@ -0,0 +1,183 @@
+# app/api/catalogService.py
+import re
+import json
+import asyncio
+import unicodedata
+from datetime import timedelta, timezone
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+
+from app.config import CATALOG_ENABLED, CATALOG_VERSION, CATALOG_MAX_AGE_DAYS
+from app.database import SessionLocal
+from app.models import Song, SongAlias, ChordProgression, Instrument, utcnow
+
+
+def normalize_lookup_key(text: str) -> str:
+    """'Wonderwall – Oasis!' -> 'wonderwall oasis'"""
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return " ".join(re.sub(r"[^\w]+", " ", text.lower()).split())
+
+
+def arrangement_variant(request) -> str:
+    return f"{request.instrument.lower()}:{'simple' if request.simplify else 'full'}"
+
+
+class SongCatalogService:
+    """Stores generated FullSongArrangements in songs/chord_progressions so
+    repeat requests are answered from the database instead of an LLM."""
+
+    def __init__(self):
+        self.enabled = CATALOG_ENABLED
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.saves = 0
+        self._refreshing = {}
+
+    # ---------------------------
+    # Sync DB work (run in the threadpool)
+    # ---------------------------
+
+    def _find_song_id(self, db, query_key: str):
+        song_id = db.query(SongAlias.song_id).filter(SongAlias.alias == query_key).scalar()
+        if song_id is None:
+            song_id = db.query(Song.id).filter(Song.lookup_key == query_key).scalar()
+        return song_id
+
+    def _is_stale(self, entry: ChordProgression) -> bool:
+        if entry.version != CATALOG_VERSION or entry.refreshed_at is None:
+            return True
+        refreshed_at = entry.refreshed_at
+        if refreshed_at.tzinfo is None:
+            refreshed_at = refreshed_at.replace(tzinfo=timezone.utc)
+        return utcnow() - refreshed_at > timedelta(days=CATALOG_MAX_AGE_DAYS)
+
+    def _lookup(self, request):
+        db = SessionLocal()
+        try:
+            song_id = self._find_song_id(db, normalize_lookup_key(request.songQuery))
+            if song_id is None:
+                return None
+            entry = (
+                db.query(ChordProgression)
+                .filter(
+                    ChordProgression.song_id == song_id,
+                    ChordProgression.variant == arrangement_variant(request),
+                    ChordProgression.arrangement.isnot(None),
+                )
+                .first()
+            )
+            if entry is None:
+                return None
+            return json.loads(entry.arrangement), self._is_stale(entry)
+        finally:
+            db.close()
+
+    def _save(self, request, arrangement: dict):
+        db = SessionLocal()
+        try:
+            title = arrangement.get("songTitle") or request.songQuery
+            artist = arrangement.get("artist")
+            lookup_key = normalize_lookup_key(f"{title} {artist or ''}")
+
+            song = db.query(Song).filter(Song.lookup_key == lookup_key).first()
+            if song is None:
+                song = Song(title=title, artist=artist, lookup_key=lookup_key)
+                db.add(song)
+                db.flush()
+
+            query_key = normalize_lookup_key(request.songQuery)
+            alias = db.query(SongAlias).filter(SongAlias.alias == query_key).first()
+            if alias is None:
+                db.add(SongAlias(alias=query_key, song_id=song.id))
+            else:
+                alias.song_id = song.id
+
+            variant = arrangement_variant(request)
+            entry = (
+                db.query(ChordProgression)
+                .filter(ChordProgression.song_id == song.id, ChordProgression.variant == variant)
+                .first()
+            )
+            if entry is None:
+                instrument_id = (
+                    db.query(Instrument.id)
+                    .filter(func.lower(Instrument.name) == request.instrument.lower())
+                    .limit(1)
+                    .scalar()
+                )
+                entry = ChordProgression(song_id=song.id, variant=variant, instrument_id=instrument_id)
+                db.add(entry)
+
+            entry.arrangement = json.dumps(arrangement)
+            entry.progression = " ".join(arrangement.get("progressionSummary") or [])
+            entry.skill_level = "Beginner" if request.simplify else None
+            entry.version = CATALOG_VERSION
+            entry.refreshed_at = utcnow()
+            db.commit()
+        except IntegrityError:
+            # A concurrent request stored the same song first; theirs wins
+            db.rollback()
+        finally:
+            db.close()
+
+    # ---------------------------
+    # Async API used by the router
+    # ---------------------------
+
+    async def lookup(self, request):
+        """Returns (arrangement_dict, is_stale) or None on a miss."""
+        if not self.enabled:
+            return None
+        try:
+            entry = await run_in_threadpool(self._lookup, request)
+        except Exception as e:
+            print(f"⚠ Catalog lookup failed: {e}")
+            return None
+
+        if entry is None:
+            self.misses += 1
+        elif entry[1]:
+            self.stale_hits += 1
+        else:
+            self.hits += 1
+        return entry
+
+    async def save(self, request, arrangement: dict):
+        if not self.enabled:
+            return
+        try:
+            await run_in_threadpool(self._save, request, arrangement)
+            self.saves += 1
+        except Exception as e:
+            print(f"⚠ Catalog save failed: {e}")
+
+    def schedule_refresh(self, request, regenerate):
+        """Regenerate a stale entry in the background, at most once at a time."""
+        key = (normalize_lookup_key(request.songQuery), arrangement_variant(request))
+        if key in self._refreshing:
+            return
+        task = asyncio.create_task(regenerate())
+        self._refreshing[key] = task
+
+        def _done(t):
+            self._refreshing.pop(key, None)
+            if not t.cancelled() and t.exception() is not None:
+                print(f"⚠ Catalog refresh failed: {t.exception()}")
+
+        task.add_done_callback(_done)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "staleHits": self.stale_hits,
+            "misses": self.misses,
+            "saves": self.saves,
+            "refreshing": len(self._refreshing),
+        }
+
+
+song_catalog = SongCatalogService()
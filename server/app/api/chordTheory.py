@@ -0,0 +1,218 @@
+# app/api/chordTheory.py
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+# A chord is stored as one byte: semitones above the key's tonic * 8 +
+# quality. Minor keys are expressed from their relative major, so
+# "Am F C G" and "C G Am F" share the same numerals (vi IV I V / I V vi IV).
+MAJOR, MINOR, DIMINISHED, AUGMENTED, SUSPENDED, DOMINANT = range(6)
+# Matching ignores sevenths and suspensions: V7 and Vsus still act as V
+_FOLDED = {DOMINANT: MAJOR, SUSPENDED: MAJOR}
+
+NGRAM = 3
+
+NOTE_NAMES = ["C", "Db", "D", "Eb", "E", "F", "F#", "G", "Ab", "A", "Bb", "B"]
+SHARP_NAMES = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
+FLAT_NAMES = ["C", "Db", "D", "Eb", "E", "F", "Gb", "G", "Ab", "A", "Bb", "B"]
+_SHARP_KEYS = {7, 2, 9, 4, 11, 6}
+_FLAT_KEYS = {5, 10, 3, 8, 1}
+_NATURALS = {"C": 0, "D": 2, "E": 4, "F": 5, "G": 7, "A": 9, "B": 11}
+_ACCIDENTALS = {"": 0, "#": 1, "♯": 1, "b": -1, "♭": -1}
+_NUMERALS = {"I": 0, "II": 2, "III": 4, "IV": 5, "V": 7, "VI": 9, "VII": 11}
+_DEGREE_NAMES = ["I", "bII", "II", "bIII", "III", "IV", "#IV", "V", "bVI", "VI", "bVII", "VII"]
+# Diatonic triads of a major key, used to guess the key of bare chord names
+_DIATONIC = {0 * 8 + MAJOR, 2 * 8 + MINOR, 4 * 8 + MINOR, 5 * 8 + MAJOR,
+             7 * 8 + MAJOR, 9 * 8 + MINOR, 11 * 8 + DIMINISHED}
+# Tie-break for key guessing: keys with fewer accidentals first
+_KEY_PREFERENCE = [0, 7, 5, 2, 10, 9, 3, 4, 8, 11, 1, 6]
+
+# Chord-quality suffixes: anything else after the root ("Chorus", "Bridge",
+# "Intro") is a word, not a chord
+CHORD_SUFFIX = r"(?:maj|min|mi|m|M|dim|aug|sus|add|no|alt|ø|°|o|\+|-|Δ|\d|b|#|♯|♭|\(|\))*"
+_NUMERAL = r"VII|VI|V|IV|III|II|I|vii|vi|v|iv|iii|ii|i"
+_CHORD_RE = re.compile(rf"^([A-G])([#♯b♭]?)({CHORD_SUFFIX})(?:/([A-G][#♯b♭]?))?$")
+_NUMERAL_RE = re.compile(rf"^([#♯b♭]?)({_NUMERAL})({CHORD_SUFFIX})(?:/[#♯b♭]?(?:{_NUMERAL}))?$")
+_KEY_RE = re.compile(r"^([A-G])([#♯b♭]?)\s*(m|min|minor|maj|major)?$", re.IGNORECASE)
+_SPLIT_RE = re.compile(r"->|[\s,|–—→>()\[\]]+|-(?=[A-G#♯b♭IViv])")
+
+
+@dataclass
+class EncodedProgression:
+    tonic: int      # pitch class of the (relative) major key
+    codes: bytes
+
+    @property
+    def key(self) -> str:
+        return NOTE_NAMES[self.tonic]
+
+    def numerals(self) -> list:
+        return [code_numeral(code) for code in self.codes]
+
+
+def _quality(suffix: str, upper: bool = True) -> int:
+    if suffix.startswith(("maj", "M", "Δ")):
+        return MAJOR if upper else MINOR
+    lowered = suffix.lower()
+    if lowered.startswith(("dim", "°", "o", "ø")) or "m7b5" in lowered:
+        return DIMINISHED
+    if lowered.startswith(("aug", "+")):
+        return AUGMENTED
+    if suffix.startswith(("m", "min", "-")):
+        return MINOR
+    if lowered.startswith("sus"):
+        return SUSPENDED
+    if re.match(r"^(7|9|11|13)", suffix):
+        return DOMINANT if upper else MINOR
+    return MAJOR if upper else MINOR
+
+
+def pitch_class(name: str) -> int:
+    """'F#' -> 6, 'Bb' -> 10."""
+    return (_NATURALS[name[0].upper()] + _ACCIDENTALS[name[1:]]) % 12
+
+
+def split_key(key: str):
+    """(tonic pitch class, is minor): 'G' -> (7, False), 'E minor' /
+    'Em (capo 2)' -> (4, True)."""
+    match = _KEY_RE.match(re.sub(r"\(.*?\)", "", key or "").strip())
+    if not match:
+        raise ValueError(f"Unrecognized key: {key}")
+    letter, accidental, mode = match.groups()
+    return pitch_class(letter + accidental), bool(mode) and (mode == "m" or mode.lower().startswith("min"))
+
+
+def parse_key(key: str) -> int:
+    """'G' -> 7, 'Em' / 'E minor' -> 7 (relative major)."""
+    tonic, minor = split_key(key)
+    return (tonic + 3) % 12 if minor else tonic
+
+
+def note_names(tonic: int) -> list:
+    """Spelling for the major key on `tonic` (its relative major for minor
+    keys): flat keys spell with flats, sharp keys with sharps."""
+    if tonic in _FLAT_KEYS:
+        return FLAT_NAMES
+    if tonic in _SHARP_KEYS:
+        return SHARP_NAMES
+    return NOTE_NAMES
+
+
+def parse_chord(symbol: str):
+    """'F#m7' -> (6, MINOR); slash basses are ignored. None if not a chord."""
+    match = _CHORD_RE.match(symbol)
+    if not match:
+        return None
+    letter, accidental, suffix, _ = match.groups()
+    return pitch_class(letter + accidental), _quality(suffix)
+
+
+def parse_numeral(symbol: str):
+    """'bVII' -> (10, MAJOR), 'vi' -> (9, MINOR), 'V7' -> (7, DOMINANT)."""
+    match = _NUMERAL_RE.match(symbol)
+    if not match:
+        return None
+    accidental, numeral, suffix = match.groups()
+    degree = (_NUMERALS[numeral.upper()] + _ACCIDENTALS[accidental]) % 12
+    upper = numeral.isupper()
+    if suffix.startswith(("°", "o", "dim", "ø")):
+        return degree, DIMINISHED
+    if suffix.startswith(("+", "aug")):
+        return degree, AUGMENTED
+    return degree, _quality(suffix, upper)
+
+
+def code_numeral(code: int) -> str:
+    degree, quality = divmod(code, 8)
+    name = _DEGREE_NAMES[degree]
+    if quality in (MINOR, DIMINISHED):
+        name = name.lower()
+    return name + {DIMINISHED: "°", AUGMENTED: "+", SUSPENDED: "sus", DOMINANT: "7"}.get(quality, "")
+
+
+def _guess_tonic(chords: list) -> int:
+    def score(tonic: int):
+        codes = [((root - tonic) % 12) * 8 + _FOLDED.get(quality, quality) for root, quality in chords]
+        fit = sum(code in _DIATONIC for code in codes)
+        # Songs tend to start and end on the tonic (or its relative minor)
+        fit += 0.5 * (codes[0] in (MAJOR, 9 * 8 + MINOR)) + 0.5 * (codes[-1] in (MAJOR, 9 * 8 + MINOR))
+        return fit, -_KEY_PREFERENCE.index(tonic)
+    return max(range(12), key=score)
+
+
+def parse_progression(text: str, key: Optional[str] = None, strict: bool = False) -> Optional[EncodedProgression]:
+    """Encode chord names ("C G Am F") or numerals ("I-V-vi-IV") relative
+    to `key`, guessing the key from the chords when it isn't given.
+
+    Unrecognized tokens are skipped, or raise ValueError when `strict`.
+    Returns None when nothing parses.
+    """
+    tonic = parse_key(key) if key else None
+    chords, numerals = [], []
+    for token in _SPLIT_RE.split(text or ""):
+        if not token:
+            continue
+        chord = parse_chord(token)
+        if chord is not None:
+            chords.append((len(chords) + len(numerals), chord))
+            continue
+        numeral = parse_numeral(token)
+        if numeral is not None:
+            numerals.append((len(chords) + len(numerals), numeral))
+        elif strict:
+            raise ValueError(f"Unrecognized chord: {token}")
+
+    if not chords and not numerals:
+        return None
+    if tonic is None:
+        tonic = _guess_tonic([chord for _, chord in chords]) if chords else 0
+
+    codes = [None] * (len(chords) + len(numerals))
+    for position, (root, quality) in chords:
+        codes[position] = ((root - tonic) % 12) * 8 + quality
+    for position, (degree, quality) in numerals:
+        codes[position] = degree * 8 + quality
+    return EncodedProgression(tonic=tonic, codes=bytes(codes))
+
+
+# ---------------------------
+# Matching
+# ---------------------------
+
+def fold(codes: bytes) -> bytes:
+    return bytes((code & ~7) | _FOLDED.get(code & 7, code & 7) for code in codes)
+
+
+def _pack(gram) -> int:
+    value = 0
+    for code in gram:
+        value = (value << 8) | code
+    return value
+
+
+def ngrams(codes: bytes, cyclic: bool = True) -> set:
+    """Packed NGRAM-chord windows over the folded codes. Progressions are
+    loops, so stored rows wrap around: "vi IV I V" matches "I V vi IV"."""
+    folded = fold(codes)
+    if cyclic:
+        if not folded:
+            return set()
+        looped = folded * (NGRAM // len(folded) + 2)
+        return {_pack(looped[i:i + NGRAM]) for i in range(len(folded))}
+    return {_pack(folded[i:i + NGRAM]) for i in range(len(folded) - NGRAM + 1)}
+
+
+def gram_range(codes: bytes):
+    """[low, high] of packed grams starting with the (shorter than NGRAM)
+    folded `codes`; grams are packed big-endian so this is one range scan."""
+    prefix = _pack(fold(codes))
+    shift = 8 * (NGRAM - len(codes))
+    return prefix << shift, ((prefix + 1) << shift) - 1
+
+
+def contains(codes: bytes, fragment: bytes) -> bool:
+    """Whether the loop `codes` plays `fragment` contiguously."""
+    folded, wanted = fold(codes), fold(fragment)
+    if not folded:
+        return False
+    return wanted in folded * (len(wanted) // len(folded) + 2)
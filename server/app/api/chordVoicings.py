@@ -0,0 +1,315 @@
+# app/api/chordVoicings.py
+import re
+from functools import lru_cache
+from typing import Optional
+
+from app.api.chordTheory import CHORD_SUFFIX, NOTE_NAMES, pitch_class
+
+# Intervals (semitones above the root) per chord suffix
+CHORD_INTERVALS = {
+    "": (0, 4, 7), "m": (0, 3, 7), "5": (0, 7),
+    "dim": (0, 3, 6), "aug": (0, 4, 8), "sus2": (0, 2, 7), "sus4": (0, 5, 7),
+    "6": (0, 4, 7, 9), "m6": (0, 3, 7, 9), "7": (0, 4, 7, 10), "maj7": (0, 4, 7, 11),
+    "m7": (0, 3, 7, 10), "mmaj7": (0, 3, 7, 11), "dim7": (0, 3, 6, 9), "m7b5": (0, 3, 6, 10),
+    "7sus4": (0, 5, 7, 10), "add9": (0, 4, 7, 2), "madd9": (0, 3, 7, 2),
+    "9": (0, 4, 7, 10, 2), "m9": (0, 3, 7, 10, 2), "maj9": (0, 4, 7, 11, 2), "13": (0, 4, 7, 10, 9),
+}
+_SUFFIX_ALIASES = {
+    "maj": "", "M": "", "min": "m", "mi": "m", "-": "m",
+    "M7": "maj7", "ma7": "maj7", "Δ": "maj7", "Δ7": "maj7", "min7": "m7", "-7": "m7",
+    "°": "dim", "o": "dim", "°7": "dim7", "o7": "dim7", "ø": "m7b5", "ø7": "m7b5", "m7-5": "m7b5",
+    "+": "aug", "sus": "sus4", "2": "sus2", "add2": "add9", "mM7": "mmaj7", "m(maj7)": "mmaj7",
+}
+_CHORD_RE = re.compile(rf"^([A-G][#♯b♭]?)({CHORD_SUFFIX})(?:/([A-G][#♯b♭]?))?$")
+
+# Open strings as MIDI notes, lowest string first
+TUNINGS = {
+    "Guitar": {
+        "standard": (40, 45, 50, 55, 59, 64),
+        "drop d": (38, 45, 50, 55, 59, 64),
+        "half step down": (39, 44, 49, 54, 58, 63),
+        "full step down": (38, 43, 48, 53, 57, 62),
+        "drop c": (36, 43, 48, 53, 57, 62),
+        "dadgad": (38, 45, 50, 55, 57, 62),
+        "open g": (38, 43, 50, 55, 59, 62),
+        "open d": (38, 45, 50, 54, 57, 62),
+        "open e": (40, 47, 52, 56, 59, 64),
+    },
+    # Standard ukulele is re-entrant: the G string sits above the C
+    "Ukulele": {
+        "standard": (67, 60, 64, 69),
+        "low g": (55, 60, 64, 69),
+        "baritone": (50, 55, 59, 64),
+        "d tuning": (69, 62, 66, 71),
+    },
+}
+_TUNING_ALIASES = {
+    "eb standard": "half step down", "e flat": "half step down", "d standard": "full step down",
+    "gcea": "standard", "dgbe": "baritone", "adf#b": "d tuning",
+}
+COMMON_SUFFIXES = ("", "m", "7", "maj7", "m7", "dim", "aug", "sus2", "sus4", "6", "m6", "9",
+                   "add9", "7sus4", "m7b5", "dim7", "5")
+# Inversions (G/B, C/G, D/F#, Am/G...) warmed for these
+COMMON_SLASH_SUFFIXES = ("", "m", "7", "m7")
+
+MAX_FRET = 12
+MAX_SPAN = 3        # highest minus lowest fretted note
+MAX_FINGERS = 4
+MIN_PLAYED = 4      # strings sounding in a guitar shape, so the bass stays full
+OPEN_POSITION = 3   # highest fret of an open-string ("cowboy") shape
+PIANO_FINGERS = {1: [1], 2: [1, 5], 3: [1, 3, 5], 4: [1, 2, 3, 5], 5: [1, 2, 3, 4, 5]}
+
+
+def split_chord(symbol: str):
+    """'F#m7/C#' -> (6, 'm7', 1). Suffixes outside CHORD_INTERVALS are cut
+    back to the longest known one ('7b9' plays as '7'). None if not a chord."""
+    match = _CHORD_RE.match((symbol or "").strip())
+    if not match:
+        return None
+    root, suffix, bass = match.groups()
+    suffix = _SUFFIX_ALIASES.get(suffix, suffix)
+    while suffix not in CHORD_INTERVALS:
+        suffix = _SUFFIX_ALIASES.get(suffix[:-1], suffix[:-1])
+    return pitch_class(root), suffix, pitch_class(bass) if bass else None
+
+
+@lru_cache(maxsize=256)
+def resolve_tuning(instrument: str, tuning: Optional[str]) -> tuple:
+    """Open-string MIDI notes for a named ("Drop D") or spelled-out
+    ("D A D G B E") tuning; the instrument's standard tuning otherwise."""
+    tunings = TUNINGS[instrument]
+    text = (tuning or "").lower()
+    text = re.sub(r"\(.*?\)", "", text).replace("tuning", "").replace("-", " ").strip() or "standard"
+    name = _TUNING_ALIASES.get(text.replace(" ", ""), _TUNING_ALIASES.get(text, text))
+    if name in tunings:
+        return tunings[name]
+
+    # Spelled out: keep each string near the matching standard string
+    standard = tunings["standard"]
+    spelled = re.sub(r"\(.*?\)", "", tuning or "").strip()
+    if not re.fullmatch(r"(?:[A-Ga-g][#b♯♭]?[\s,]*)+", spelled):
+        return standard
+    notes = re.findall(r"[A-Ga-g][#b♯♭]?", spelled)
+    if len(notes) != len(standard):
+        return standard
+    midi = []
+    for note, reference in zip(notes, standard):
+        pc = pitch_class(note[0].upper() + note[1:])
+        offset = (pc - reference) % 12
+        midi.append(reference + offset if offset <= 6 else reference + offset - 12)
+    return tuple(midi)
+
+
+def _note_name(midi: int) -> str:
+    return f"{NOTE_NAMES[midi % 12]}{midi // 12 - 1}"
+
+
+# ---------------------------
+# Fretted instruments
+# ---------------------------
+
+def _fingering(frets: tuple):
+    """Finger per string (0 open, None muted) and fingers used, or None if
+    it needs more than MAX_FINGERS. Lowest fret is the index finger. When
+    separate fingers run out, strings at one fret share a finger (a barre:
+    the index in F's 133211, the ring in B's x24442) if every string between
+    them is fretted at or above that fret."""
+    fretted = sorted((fret, string) for string, fret in enumerate(frets) if fret not in ("X", 0))
+    fingers = [None if fret == "X" else 0 for fret in frets]
+    if not fretted:
+        return fingers, 0
+    low = fretted[0][0]
+
+    def assign(groups):
+        result = list(fingers)
+        next_free = 1
+        for fret, strings in groups:
+            finger = max(fret - low + 1, next_free)
+            for string in strings:
+                result[string] = finger
+            next_free = finger + 1
+        return result, next_free - 1
+
+    result, used = assign([(fret, [string]) for fret, string in fretted])
+    if used <= MAX_FINGERS:
+        return result, used
+
+    def barres(top: int):
+        groups = []
+        for fret, string in fretted:
+            # Only the index finger barres the lowest fret
+            if groups and groups[-1][0] == fret and fret <= top and (fret > low or len(groups) == 1):
+                between = frets[groups[-1][1][0]:string + 1]
+                if all(f != "X" and f >= fret for f in between):
+                    groups[-1][1].append(string)
+                    continue
+            groups.append((fret, [string]))
+        return groups
+
+    # Index-finger barre first (F: 133211), then barres higher up too
+    for top in (low, MAX_FRET):
+        result, used = assign(barres(top))
+        if used <= MAX_FINGERS:
+            return result, used
+    return None
+
+
+def _score(tuning: tuple, frets: tuple, fingers_used: int) -> float:
+    """Lower is easier and sounds fuller: low on the neck, all strings
+    ringing, few fingers, a small stretch. Open strings only count in open
+    position; mixed with notes further up (x20402 for Bm) they make odd
+    shapes and cost extra. A note doubled at the same pitch is a wasted string."""
+    fretted = [fret for fret in frets if fret not in ("X", 0)]
+    played = [open_note + fret for open_note, fret in zip(tuning, frets) if fret != "X"]
+    opens = sum(fret == 0 for fret in frets)
+    position = min(fretted) if fretted else 0
+    stretch = max(fretted) - position if fretted else 0
+    open_cost = -0.5 if not fretted or max(fretted) <= OPEN_POSITION else 0.5
+    unisons = len(played) - len(set(played))
+    return (2 * position + 1.5 * (len(frets) - len(played) + unisons) + open_cost * opens
+            + fingers_used + stretch + 2 * max(0, stretch - 2))
+
+
+@lru_cache(maxsize=8192)
+def fretted_voicing(tuning: tuple, root: int, suffix: str, bass: Optional[int] = None, bass_rule: bool = True):
+    """Easiest playable shape for the chord on `tuning`, as (frets, fingers)
+    with frets lowest string first, or None.
+
+    Every chord tone must sound (the fifth may be left out of four-plus note
+    chords). With `bass_rule` the lowest string played is the bass note and
+    only the lowest strings may be muted, leaving at least MIN_PLAYED;
+    otherwise every string is played.
+    """
+    intervals = CHORD_INTERVALS[suffix]
+    tones = {(root + i) % 12 for i in intervals}
+    required = {(root + i) % 12 for i in intervals if not (i == 7 and len(intervals) >= 4)}
+    if bass is not None:
+        tones.add(bass)
+        required.add(bass)
+    lowest = bass if bass is not None else root
+    strings = len(tuning)
+    best = None
+
+    for low in range(1, MAX_FRET - MAX_SPAN + 1):
+        options = []
+        for open_note in tuning:
+            choices = [0] if open_note % 12 in tones else []
+            choices += [f for f in range(low, low + MAX_SPAN + 1) if (open_note + f) % 12 in tones]
+            options.append(choices)
+
+        def walk(index, frets, sounding, started):
+            nonlocal best
+            missing = required - sounding
+            if len(missing) > strings - index:
+                return
+            if index == strings:
+                if missing or not started:
+                    return
+                fingering = _fingering(frets)
+                if fingering is None:
+                    return
+                score = _score(tuning, frets, fingering[1])
+                if best is None or score < best[0]:
+                    best = (score, frets, fingering[0])
+                return
+            if bass_rule and not started and index < strings - MIN_PLAYED:
+                walk(index + 1, frets + ("X",), sounding, False)
+            for fret in options[index]:
+                pc = (tuning[index] + fret) % 12
+                if bass_rule and not started and pc != lowest:
+                    continue
+                walk(index + 1, frets + (fret,), sounding | {pc}, True)
+
+        walk(0, (), frozenset(), False)
+        # Open-position shapes are searched first; stop once one is found
+        # that nothing further up the neck can beat
+        if best is not None and best[0] <= 2 * (low + 1) - 0.5 * strings:
+            break
+
+    if best is None:
+        return None
+    return list(best[1]), best[2]
+
+
+# ---------------------------
+# Piano
+# ---------------------------
+
+def piano_voicing(root: int, suffix: str, bass: Optional[int] = None):
+    """Close root-position voicing around middle C: (MIDI notes, fingers).
+    A slash bass is added an octave below (left hand, no finger)."""
+    base = 60 + root if root <= 7 else 48 + root
+    notes = sorted(base + (i if i != 2 or len(CHORD_INTERVALS[suffix]) < 4 else 14)
+                   for i in CHORD_INTERVALS[suffix])
+    fingers = list(PIANO_FINGERS[len(notes)])
+    if bass is not None and bass != root:
+        notes.insert(0, base - 12 + (bass - root) % 12)
+        fingers.insert(0, None)
+    return notes, fingers
+
+
+# ---------------------------
+# ChordDiagrams
+# ---------------------------
+
+def chord_diagram(symbol: str, instrument: str = "Guitar", tuning: Optional[str] = None, capo: int = 0):
+    """ChordDiagram dict for a concert-pitch chord symbol, or None.
+
+    With a capo, frets count from the capo (0 is the capo'd open string), so
+    the shape is the chord transposed down by `capo` semitones.
+    """
+    parsed = split_chord(symbol)
+    if parsed is None:
+        return None
+    root, suffix, bass = parsed
+
+    if instrument == "Piano":
+        notes, fingers = piano_voicing(root, suffix, bass)
+        return {"chord": symbol, "frets": notes, "fingers": fingers, "capoFret": 0,
+                "notes": [_note_name(n) for n in notes]}
+
+    if instrument not in TUNINGS:
+        return None
+    capo = max(0, min(int(capo or 0), MAX_FRET - MAX_SPAN))
+    open_strings = resolve_tuning(instrument, tuning)
+    # Positional like warm_voicing_table: lru_cache keys keyword and
+    # positional calls differently
+    shape = fretted_voicing(
+        open_strings,
+        (root - capo) % 12,
+        suffix,
+        None if bass is None else (bass - capo) % 12,
+        instrument != "Ukulele",
+    )
+    if shape is None:
+        return None
+    frets, fingers = shape
+    notes = [_note_name(open_note + capo + fret) for open_note, fret in zip(open_strings, frets) if fret != "X"]
+    return {"chord": symbol, "frets": frets, "fingers": fingers, "capoFret": capo, "notes": notes}
+
+
+def chord_diagrams(chords: list, instrument: str = "Guitar", tuning: Optional[str] = None, capo: int = 0) -> list:
+    """One diagram per distinct chord, in first-use order."""
+    diagrams = []
+    for symbol in dict.fromkeys(c.strip() for c in chords or [] if isinstance(c, str) and c.strip()):
+        diagram = chord_diagram(symbol, instrument, tuning, capo)
+        if diagram is not None:
+            diagrams.append(diagram)
+    return diagrams
+
+
+def warm_voicing_table():
+    """Precompute every root x COMMON_SUFFIXES shape, plus the inversions of
+    COMMON_SLASH_SUFFIXES chords, for every tuning of each instrument. A
+    capo shape is the same chord a capo lower, so capo positions hit the
+    table too; only rarer slash chords are searched on demand."""
+    for instrument, tunings in TUNINGS.items():
+        bass_rule = instrument != "Ukulele"
+        for open_strings in tunings.values():
+            for root in range(12):
+                for suffix in COMMON_SUFFIXES:
+                    fretted_voicing(open_strings, root, suffix, None, bass_rule)
+                for suffix in COMMON_SLASH_SUFFIXES:
+                    for interval in CHORD_INTERVALS[suffix][1:]:
+                        fretted_voicing(open_strings, root, suffix, (root + interval) % 12, bass_rule)
+    return fretted_voicing.cache_info().currsize
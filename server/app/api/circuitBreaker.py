@@ -0,0 +1,123 @@
+# app/api/circuitBreaker.py
+import time
+from collections import deque
+
+from app.config import (
+    AI_BREAKER_ERROR_THRESHOLD,
+    AI_BREAKER_WINDOW,
+    AI_BREAKER_MIN_REQUESTS,
+    AI_BREAKER_COOLDOWN,
+)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Error-rate circuit breaker for one AI provider.
+
+    Closed: calls flow and outcomes are tracked over a rolling window.
+    Open: calls are refused until the cool-down elapses.
+    Half-open: a single trial call decides whether to close or re-open.
+    """
+
+    def __init__(self, name: str, error_threshold: float, window: int,
+                 min_requests: int, cooldown: float):
+        self.name = name
+        self.error_threshold = error_threshold
+        self.min_requests = min_requests
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.trip_count = 0
+        self.opened_at = None
+        self._outcomes = deque(maxlen=max(1, window))
+        self._trial_in_flight = False
+
+    def error_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    def allow(self) -> bool:
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.cooldown:
+                return False
+            self.state = HALF_OPEN
+            self._trial_in_flight = False
+
+        if self.state == HALF_OPEN:
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+
+        return True
+
+    def _stale(self, started) -> bool:
+        """Outcomes are ignored while open, and from calls started before
+        the latest trip: they describe the outage that already tripped it
+        and mustn't re-trip it, extend the cool-down or stand in for the
+        half-open trial."""
+        if self.state == OPEN:
+            return True
+        return started is not None and self.opened_at is not None and started < self.opened_at
+
+    def record_success(self, started: float = None):
+        if self._stale(started):
+            return
+        if self.state == HALF_OPEN:
+            print(f"✓ {self.name.title()} circuit closed")
+            self.state = CLOSED
+            self._outcomes.clear()
+            self._trial_in_flight = False
+        self._outcomes.append(True)
+
+    def record_failure(self, started: float = None):
+        if self._stale(started):
+            return
+        if self.state == HALF_OPEN:
+            self._trip()
+            return
+        self._outcomes.append(False)
+        if len(self._outcomes) >= self.min_requests and self.error_rate() >= self.error_threshold:
+            self._trip()
+
+    def release(self, started: float = None):
+        """The call ended without an outcome (e.g. it was cancelled)."""
+        if self.state == HALF_OPEN and not self._stale(started):
+            self._trial_in_flight = False
+
+    def _trip(self):
+        print(f"⚡ {self.name.title()} circuit opened (error rate {self.error_rate():.0%})")
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self.trip_count += 1
+        self._trial_in_flight = False
+
+    def snapshot(self) -> dict:
+        retry_in = None
+        if self.state == OPEN:
+            retry_in = max(0.0, self.cooldown - (time.monotonic() - self.opened_at))
+        return {
+            "state": self.state,
+            "tripCount": self.trip_count,
+            "errorRate": round(self.error_rate(), 3),
+            "windowSize": len(self._outcomes),
+            "retryInSeconds": retry_in,
+        }
+
+
+def _breaker(name: str) -> CircuitBreaker:
+    return CircuitBreaker(
+        name,
+        error_threshold=AI_BREAKER_ERROR_THRESHOLD,
+        window=AI_BREAKER_WINDOW,
+        min_requests=AI_BREAKER_MIN_REQUESTS,
+        cooldown=AI_BREAKER_COOLDOWN,
+    )
+
+
+provider_breakers = {
+    "gemini": _breaker("gemini"),
+    "grok": _breaker("grok"),
+}
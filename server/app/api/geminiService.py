@@ -1,10 +1,20 @@
 import os
-import re
 import json
+import time
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 import google.generativeai as genai
 
+from app.config import (
+    GEMINI_EXECUTION_MODE,
+    GEMINI_MAX_CONCURRENCY,
+    GEMINI_PROBE_INTERVAL,
+    GEMINI_PROBE_TIMEOUT,
+)
+from app.api.providerLimiter import provider_limiters
+from app.api.jsonStream import extract_json
+
 # Load environment variables
 load_dotenv()
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
@@ -13,27 +23,126 @@ GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 class GeminiMusicService:
     def __init__(self):
         self.model = None
-        self.available = False
+        self.execution_mode = GEMINI_EXECUTION_MODE
+        self.limiter = provider_limiters["gemini"]
+        self._executor = None
+        if self.execution_mode == "executor":
+            self._executor = ThreadPoolExecutor(
+                max_workers=GEMINI_MAX_CONCURRENCY,
+                thread_name_prefix="gemini"
+            )
 
-        if not GEMINI_API_KEY:
+        # Readiness is probed in the background after startup (see
+        # start_readiness_probe); until the first probe finishes we assume a
+        # configured key is usable so cold starts never wait on the network.
+        self.configured = bool(GEMINI_API_KEY)
+        self.available = self.configured
+        self.last_probe_at = None
+        self.last_probe_error = None
+        self._probe_task = None
+
+        if not self.configured:
             print("❌ GEMINI_API_KEY is missing in .env file.")
-            return
 
-        try:
+    def _ensure_model(self):
+        if self.model is None:
             genai.configure(api_key=GEMINI_API_KEY)
 
             # Using Gemini 2.0 Flash
             self.model = genai.GenerativeModel('gemini-2.0-flash')
+        return self.model
 
-            # Connectivity test
-            test_response = self.model.generate_content("Test connection. Reply with 'OK'.")
-            if test_response and hasattr(test_response, 'text') and test_response.text.strip() == "OK":
-                self.available = True
-                print("✓ Gemini 2.0 Flash Connected Successfully")
-            else:
-                print("❌ Gemini connection test failed.")
+    async def probe(self) -> bool:
+        """Connectivity test; updates `available` from the result."""
+        if not self.configured:
+            self.available = False
+            return False
+
+        try:
+            test_response = await asyncio.wait_for(
+                self._generate("Test connection. Reply with 'OK'."),
+                timeout=GEMINI_PROBE_TIMEOUT
+            )
+            ok = bool(test_response and getattr(test_response, 'text', None)
+                      and test_response.text.strip() == "OK")
+            self.last_probe_error = None if ok else "Unexpected probe reply"
         except Exception as e:
-            print(f"❌ Gemini initialization error: {e}")
+            ok = False
+            self.last_probe_error = str(e) or type(e).__name__
+
+        first_probe = self.last_probe_at is None
+        if ok and (first_probe or not self.available):
+            print("✓ Gemini 2.0 Flash Connected Successfully")
+        elif not ok and (first_probe or self.available):
+            print(f"❌ Gemini connection test failed: {self.last_probe_error}")
+
+        self.available = ok
+        self.last_probe_at = time.time()
+        return ok
+
+    async def _probe_loop(self):
+        while True:
+            await self.probe()
+            await asyncio.sleep(GEMINI_PROBE_INTERVAL)
+
+    def start_readiness_probe(self):
+        if self.configured and self._probe_task is None:
+            self._probe_task = asyncio.create_task(self._probe_loop())
+
+    async def stop_readiness_probe(self):
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            try:
+                await self._probe_task
+            except asyncio.CancelledError:
+                pass
+            self._probe_task = None
+
+    def status(self) -> dict:
+        return {
+            "configured": self.configured,
+            "available": self.available,
+            "lastProbeAt": self.last_probe_at,
+            "lastProbeError": self.last_probe_error,
+        }
+
+    async def _generate(self, prompt: str, **kwargs):
+        """Run generate_content without blocking the event loop."""
+        model = self._ensure_model()
+        async with self.limiter.slot():
+            if self._executor is not None:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(
+                    self._executor,
+                    lambda: model.generate_content(prompt, **kwargs)
+                )
+            return await model.generate_content_async(prompt, **kwargs)
+
+    async def _stream_text(self, prompt: str):
+        """Yield response text chunks as Gemini produces them."""
+        if not self.available:
+            raise Exception("Gemini API is not available. Check your API Key.")
+
+        model = self._ensure_model()
+        config = {"response_mime_type": "application/json"}
+        async with self.limiter.slot():
+            if self._executor is not None:
+                loop = asyncio.get_running_loop()
+                chunks = await loop.run_in_executor(
+                    self._executor,
+                    lambda: iter(model.generate_content(prompt, generation_config=config, stream=True))
+                )
+                while True:
+                    chunk = await loop.run_in_executor(self._executor, next, chunks, None)
+                    if chunk is None:
+                        break
+                    yield chunk.text
+            else:
+                response = await model.generate_content_async(
+                    prompt, generation_config=config, stream=True
+                )
+                async for chunk in response:
+                    yield chunk.text
 
     async def _generate_json(self, prompt: str) -> dict:
         """Send prompt to Gemini API and parse JSON reliably."""
@@ -41,7 +150,7 @@ class GeminiMusicService:
             raise Exception("Gemini API is not available. Check your API Key.")
 
         try:
-            response = self.model.generate_content(
+            response = await self._generate(
                 prompt,
                 generation_config={"response_mime_type": "application/json"}
             )
@@ -55,10 +164,8 @@ class GeminiMusicService:
                 data = json.loads(text)
             except json.JSONDecodeError:
                 # Attempt to extract JSON if extra text exists
-                match = re.search(r"\{.*\}", text, re.DOTALL)
-                if match:
-                    data = json.loads(match.group(0))
-                else:
+                data = extract_json(text)
+                if data is None:
                     raise ValueError(f"Could not parse JSON: {text[:200]}...")
 
             # Unwrap list if needed
@@ -78,13 +185,14 @@ class GeminiMusicService:
     # Real data generation methods
     # ---------------------------
 
-    async def generateSongArrangement(self, request) -> dict:
+    def _song_arrangement_prompt(self, request) -> str:
         instrument = getattr(request, 'instrument', 'Guitar')
         simplify = "Use only easy open chords" if getattr(request, 'simplify', True) else "Include 7ths and suspended chords"
 
         prompt = f"""
         You are an expert music transcriber. Create a valid JSON song sheet for "{request.songQuery}" on {instrument}.
         Constraint: {simplify}.
+        Write chords at concert pitch, even when a capo is used.
 
         JSON schema:
         {{
@@ -93,6 +201,7 @@ class GeminiMusicService:
           "key": "Key (e.g. C Major)",
           "instrument": "{instrument}",
           "tuning": "Standard (E A D G B E)",
+          "capoFret": 0,
           "progressionSummary": ["Chord1", "Chord2"],
           "tablature": [
             {{
@@ -103,14 +212,17 @@ class GeminiMusicService:
               ]
             }}
           ],
-          "chordDiagrams": [
-            {{"chord": "C", "frets": [-1,3,2,0,1,0], "fingers": [0,3,2,0,1,0], "capoFret": 0}}
-          ],
           "substitutions": [],
           "practiceTips": ["Specific tip 1", "Specific tip 2"]
         }}
         """
-        return await self._generate_json(prompt)
+        return prompt
+
+    async def generateSongArrangement(self, request) -> dict:
+        return await self._generate_json(self._song_arrangement_prompt(request))
+
+    def stream_song_arrangement(self, request):
+        return self._stream_text(self._song_arrangement_prompt(request))
 
     async def generate_backing_track(self, prompt: str) -> dict:
         full_prompt = f"""
@@ -137,7 +249,7 @@ class GeminiMusicService:
         """
         return await self._generate_json(full_prompt)
 
-    async def generate_lesson(self, skill: str, instrument: str, focus: str) -> dict:
+    def _lesson_prompt(self, skill: str, instrument: str, focus: str) -> str:
         prompt = f"""
         You are a music teacher. Generate a lesson plan for a {skill} {instrument} player focusing on "{focus}".
         Must be educational, around 600 words.
@@ -150,11 +262,19 @@ class GeminiMusicService:
           "goals": ["Specific Goal 1", "Specific Goal 2", "Specific Goal 3"]
         }}
         """
-        return await self._generate_json(prompt)
+        return prompt
+
+    async def generate_lesson(self, skill: str, instrument: str, focus: str) -> dict:
+        return await self._generate_json(self._lesson_prompt(skill, instrument, focus))
+
+    def stream_lesson(self, skill: str, instrument: str, focus: str):
+        return self._stream_text(self._lesson_prompt(skill, instrument, focus))
 
-    async def generate_rhythm_pattern(self, time_sig: str, level: str) -> dict:
+    async def generate_rhythm_pattern(self, time_sig: str, level: str, style: str = None) -> dict:
+        style_text = f" in a {style} style" if style else ""
         prompt = f"""
-        Create a rhythm/strumming pattern for a {level} player in {time_sig} time signature.
+        Create a rhythm/strumming pattern for a {level} player in {time_sig} time signature{style_text}.
+        List one entry per stroke; the durations must add up to exactly one bar.
 
         Return valid JSON:
         {{
@@ -162,8 +282,8 @@ class GeminiMusicService:
           "timeSignature": "{time_sig}",
           "description": "How to play it",
           "pattern": [
-            {{"beat": 1, "stroke": "Down", "duration": "quarter"}},
-            {{"beat": 2, "stroke": "Up", "duration": "eighth"}}
+            {{"beat": 1, "count": "1", "stroke": "Down", "duration": "quarter"}},
+            {{"beat": 2, "count": "&", "stroke": "Up", "duration": "eighth"}}
           ]
         }}
         """
@@ -214,9 +334,11 @@ class GeminiMusicService:
         """
         return await self._generate_json(prompt)
 
-    async def get_practice_advice(self, sessions: list) -> dict:
+    async def get_practice_advice(self, stats: dict) -> dict:
         prompt = f"""
-        Act as a practice coach. Analyze these past sessions: {json.dumps(sessions)}.
+        Act as a practice coach. Analyze this summary of the student's practice
+        history (minutes, streaks, trend in minutes per day, breakdowns by
+        instrument/focus/lesson/song): {json.dumps(stats)}.
 
         Return valid JSON:
         {{
@@ -1,18 +1,93 @@
 import httpx
 import json
-import re
 import os
-import time
+import random
+import asyncio
+import importlib.util
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from dotenv import load_dotenv
 
+from app.config import (
+    GROK_HTTP2,
+    GROK_TIMEOUT,
+    GROK_MAX_CONNECTIONS,
+    GROK_MAX_KEEPALIVE,
+    GROK_BACKOFF_BASE,
+    GROK_BACKOFF_MAX,
+)
+from app.api.providerLimiter import provider_limiters
+from app.api.jsonStream import extract_json
+
 load_dotenv()
 GROK_API_KEY = os.getenv("GROK_API_KEY")
+GROK_API_URL = "https://api.x.ai/v1/chat/completions"
+
+
+class GrokRetryableError(Exception):
+    def __init__(self, message: str, retry_after: float = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _parse_retry_after(value: str):
+    """Retry-After is either delta-seconds or an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def _backoff_delay(attempt: int, retry_after: float = None) -> float:
+    if retry_after is not None:
+        return min(retry_after, GROK_BACKOFF_MAX)
+    # Full jitter: spread retries so concurrent callers don't stampede together
+    return random.uniform(0, min(GROK_BACKOFF_MAX, GROK_BACKOFF_BASE * 2 ** attempt))
+
 
 class GrokService:
     def __init__(self):
         self.api_key = GROK_API_KEY
         self.headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else None
         self.available = bool(self.headers)
+        self.limiter = provider_limiters["grok"]
+        self._client = None
+
+    async def open(self):
+        """Create the shared pooled client (called from the app startup hook)."""
+        if self._client is not None:
+            return
+        http2 = GROK_HTTP2 and importlib.util.find_spec("h2") is not None
+        if GROK_HTTP2 and not http2:
+            print("⚠ GROK_HTTP2 is set but the 'h2' package is missing — using HTTP/1.1")
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(GROK_TIMEOUT, connect=10.0),
+            limits=httpx.Limits(
+                max_connections=GROK_MAX_CONNECTIONS,
+                max_keepalive_connections=GROK_MAX_KEEPALIVE,
+            ),
+            http2=http2,
+        )
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        # Scripts that never ran the app lifecycle still get a pooled client
+        if self._client is None:
+            await self.open()
+        return self._client
 
     async def _call_grok(self, prompt: str, max_tokens: int = 3000, retries: int = 2):
         if not self.headers:
@@ -25,44 +100,68 @@ class GrokService:
             "max_tokens": max_tokens,
             "top_p": 0.92
         }
+        client = await self._get_client()
 
         for attempt in range(retries + 1):
             try:
-                async with httpx.AsyncClient(timeout=60.0) as client:
-                    resp = await client.post(
-                        "https://api.x.ai/v1/chat/completions",
-                        json=payload,
-                        headers=self.headers
+                async with self.limiter.slot():
+                    resp = await client.post(GROK_API_URL, json=payload, headers=self.headers)
+                if resp.status_code == 429 or resp.status_code >= 500:
+                    raise GrokRetryableError(
+                        f"Grok returned HTTP {resp.status_code}",
+                        retry_after=_parse_retry_after(resp.headers.get("Retry-After"))
                     )
-                    if resp.status_code == 429:
-                        wait = 2 ** attempt
-                        print(f"Grok rate limited — retrying in {wait}s (attempt {attempt + 1})")
-                        time.sleep(wait)
-                        continue
-                    resp.raise_for_status()
-                    return resp.json()["choices"][0]["message"]["content"]
-            except Exception as e:
+                resp.raise_for_status()
+                return resp.json()["choices"][0]["message"]["content"]
+            except (GrokRetryableError, httpx.TransportError) as e:
                 if attempt == retries:
                     raise e
-                wait = 2 ** attempt
-                print(f"Grok request failed — retrying in {wait}s (attempt {attempt + 1})")
-                time.sleep(wait)
+                wait = _backoff_delay(attempt, getattr(e, "retry_after", None))
+                print(f"Grok request failed ({e}) — retrying in {wait:.2f}s (attempt {attempt + 1})")
+                await asyncio.sleep(wait)
 
-    def _extract_json(self, text: str):
-        if not text:
-            return None
-        match = re.search(r"\{(?:[^{}]|(?:\{[^{}]*\}))*\}", text, re.DOTALL)
-        if not match:
-            return None
-        try:
-            return json.loads(match.group(0))
-        except json.JSONDecodeError:
-            return None
+    async def _stream_grok(self, prompt: str, max_tokens: int = 3000):
+        """Yield content deltas from Grok's server-sent event stream."""
+        if not self.headers:
+            raise Exception("GROK_API_KEY missing")
 
-    async def generate_song_arrangement(self, request):
+        payload = {
+            "model": "grok-beta",
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": 0.75,
+            "max_tokens": max_tokens,
+            "top_p": 0.92,
+            "stream": True
+        }
+        client = await self._get_client()
+
+        async with self.limiter.slot():
+            async with client.stream("POST", GROK_API_URL, json=payload, headers=self.headers) as resp:
+                resp.raise_for_status()
+                async for line in resp.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    delta = json.loads(data)["choices"][0].get("delta", {}).get("content")
+                    if delta:
+                        yield delta
+
+    def stream_song_arrangement(self, request):
         if not self.available:
             raise Exception("Grok service not available")
+        return self._stream_grok(self._song_arrangement_prompt(request))
+
+    def stream_lesson(self, skill: str, instrument: str, focus: str):
+        if not self.available:
+            raise Exception("Grok service not available")
+        return self._stream_grok(self._lesson_prompt(skill, instrument, focus), max_tokens=4000)
+
+    def _extract_json(self, text: str):
+        return extract_json(text)
 
+    def _song_arrangement_prompt(self, request) -> str:
         instrument = getattr(request, 'instrument', 'Guitar')
         simplify = "Use only easy open chords" if getattr(request, 'simplify', True) else "Include richer voicings"
 
@@ -79,6 +178,7 @@ Return ONLY valid JSON — no markdown:
   "key": "e.g. C Major",
   "instrument": "{instrument}",
   "tuning": "E A D G B E",
+  "capoFret": 0,
   "progressionSummary": ["C", "Am", "F", "G"],
   "tablature": [
     {{
@@ -89,15 +189,18 @@ Return ONLY valid JSON — no markdown:
       ]
     }}
   ],
-  "chordDiagrams": [
-    {{"chord": "C", "frets": [-1,3,2,0,1,0], "fingers": [0,3,2,0,1,0], "capoFret": 0}}
-  ],
   "substitutions": [],
   "practiceTips": ["Practice at 70 BPM", "Focus on clean changes"]
 }}
-Use real chords & lyrics. Return ONLY JSON.
+Use real chords & lyrics, written at concert pitch even with a capo. Return ONLY JSON.
 """
+        return prompt
+
+    async def generate_song_arrangement(self, request):
+        if not self.available:
+            raise Exception("Grok service not available")
 
+        prompt = self._song_arrangement_prompt(request)
         text = await self._call_grok(prompt)
         if not text:
             raise ValueError("Empty response from Grok")
@@ -142,31 +245,38 @@ Return ONLY valid JSON with this structure:
             raise ValueError("Grok did not return valid JSON for backing track")
         return data
 
-    async def generate_rhythm_pattern(self, time_sig: str, level: str):
+    async def generate_rhythm_pattern(self, time_sig: str, level: str, style: str = None):
         if not self.available:
             raise Exception("Grok service not available")
 
-        prompt = f"Generate a {level} {time_sig} drum pattern in 16th notes. Return ONLY JSON: {{'pattern': 'x--x--x--x--x--x-', 'description': 'brief description', 'difficulty': '{level}'}}"
+        style_text = f" in a {style} style" if style else ""
+        prompt = f"""Create a strumming pattern for a {level} player in {time_sig} time{style_text}.
+List one entry per stroke; the durations must add up to exactly one bar.
+Return ONLY JSON:
+{{"name": "Pattern Name", "timeSignature": "{time_sig}", "description": "How to play it",
+ "pattern": [{{"beat": 1, "count": "1", "stroke": "Down", "duration": "quarter"}}, {{"beat": 2, "count": "&", "stroke": "Up", "duration": "eighth"}}]}}"""
         text = await self._call_grok(prompt)
         if not text:
             raise ValueError("Empty response from Grok")
             
         data = self._extract_json(text)
-        if not data or "pattern" not in data:
+        # Same shape as RhythmPatternResult: a list of strokes, not a hit string
+        if not data or not isinstance(data.get("pattern"), list):
             raise ValueError("Grok did not return valid rhythm pattern")
+        data.setdefault("timeSignature", time_sig)
         return data
 
     async def generate_melody(self, key: str, style: str):
         if not self.available:
             raise Exception("Grok service not available")
 
-        prompt = f"Write a short {style} melody in {key} using note names and durations (e.g. C4/4 E4/4 G4/2). Return ONLY JSON: {{'melody': 'C4 E4 G4', 'description': 'brief description', 'style': '{style}'}}"
+        prompt = f"Compose a short melody in the key of {key} in {style} style. Return ONLY JSON: {{\"scale\": \"Scale Used (e.g. Minor Pentatonic)\", \"key\": \"{key}\", \"notes\": [\"Note1\", \"Note2\", \"Note3\"], \"intervals\": [\"Interval1\", \"Interval2\"], \"suggestion\": \"Advice on phrasing this melody\"}}"
         text = await self._call_grok(prompt)
         if not text:
             raise ValueError("Empty response from Grok")
             
         data = self._extract_json(text)
-        if not data or "melody" not in data:
+        if not data or not isinstance(data.get("notes"), list):
             raise ValueError("Grok did not return valid melody")
         return data
 
@@ -174,13 +284,13 @@ Return ONLY valid JSON with this structure:
         if not self.available:
             raise Exception("Grok service not available")
 
-        prompt = f"Give 3 concise improv tips for {query}. Return ONLY valid JSON with 'response', 'scales', 'targetNotes', 'techniques'."
+        prompt = f"Give 3 concise improv tips for {query}. Return ONLY JSON: {{\"style\": \"Identified Style\", \"recommendedScales\": [\"Scale 1\", \"Scale 2\"], \"tips\": [\"Tip 1\", \"Tip 2\", \"Tip 3\"], \"backingTrackSearch\": \"Youtube search query\"}}"
         text = await self._call_grok(prompt)
         if not text:
             raise ValueError("Empty response from Grok")
             
         data = self._extract_json(text)
-        if not data:
+        if not data or not isinstance(data.get("tips"), list):
             raise ValueError("Grok did not return valid improv tips")
         return data
 
@@ -188,7 +298,7 @@ Return ONLY valid JSON with this structure:
         if not self.available:
             raise Exception("Grok service not available")
 
-        prompt = f"Write original lyrics about {topic} in {genre} style, {mood} mood. Verse-Chorus structure. Return ONLY JSON: {{'lyrics': 'full lyrics here', 'title': 'optional title', 'structure': 'verse-chorus'}}"
+        prompt = f"Write original lyrics about {topic} in {genre} style, {mood} mood. Verse-Chorus structure. Return ONLY JSON: {{\"title\": \"Creative Title\", \"structure\": [\"Verse 1\", \"Chorus\", \"Verse 2\"], \"lyrics\": \"Verse 1:\\n[lyrics]\\n\\nChorus:\\n[chorus]\"}}"
         text = await self._call_grok(prompt)
         if not text:
             raise ValueError("Empty response from Grok")
@@ -198,24 +308,21 @@ Return ONLY valid JSON with this structure:
             raise ValueError("Grok did not return valid lyrics")
         return data
 
-    async def get_practice_advice(self, sessions):
+    async def get_practice_advice(self, stats: dict):
         if not self.available:
             raise Exception("Grok service not available")
 
-        prompt = f"Analyze these practice sessions and give personalized advice: {json.dumps(sessions[:3])}. Return ONLY JSON: {{'advice': 'main advice', 'insights': ['insight1', 'insight2'], 'nextGoals': ['goal1', 'goal2']}}"
+        prompt = f"Act as a practice coach. Analyze this summary of a student's practice history (minutes, streaks, trend in minutes per day, breakdowns by instrument/focus/lesson/song) and give personalized advice: {json.dumps(stats)}. Return ONLY JSON: {{\"insight\": \"Observation\", \"recommendation\": \"Next action\", \"focusArea\": \"Technical area to improve\"}}"
         text = await self._call_grok(prompt)
         if not text:
             raise ValueError("Empty response from Grok")
             
         data = self._extract_json(text)
-        if not data or "advice" not in data:
+        if not data or "insight" not in data:
             raise ValueError("Grok did not return valid practice advice")
         return data
 
-    async def generate_lesson(self, skill: str, instrument: str, focus: str):
-        if not self.available:
-            raise Exception("Grok service not available")
-
+    def _lesson_prompt(self, skill: str, instrument: str, focus: str) -> str:
         prompt = f"""
 You are an excellent, patient {instrument} teacher.
 Write a clear, detailed, and encouraging lesson for a {skill.title()} player focusing on {focus}.
@@ -248,7 +355,13 @@ Include tabs/fingerings
 
 Return ONLY the JSON, no other text.
 """
+        return prompt
+
+    async def generate_lesson(self, skill: str, instrument: str, focus: str):
+        if not self.available:
+            raise Exception("Grok service not available")
 
+        prompt = self._lesson_prompt(skill, instrument, focus)
         text = await self._call_grok(prompt, max_tokens=4000)
         if not text:
             raise ValueError("Empty response from Grok")
@@ -0,0 +1,343 @@
+# app/api/jobService.py
+import json
+import uuid
+import asyncio
+import itertools
+from datetime import timedelta, timezone
+from starlette.concurrency import run_in_threadpool
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+from app.config import (
+    AI_JOB_WORKERS,
+    AI_JOB_QUEUE_SIZE,
+    AI_JOB_MAX_ATTEMPTS,
+    AI_JOB_TIMEOUT,
+    AI_JOB_QUEUE_TTL,
+    AI_JOB_RESULT_TTL,
+)
+from app.database import SessionLocal, engine
+from app.models import AIJob, utcnow
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+EXPIRED = "expired"
+TERMINAL_STATES = {SUCCEEDED, FAILED, EXPIRED}
+
+
+class QueueFullError(Exception):
+    pass
+
+
+def retry_delay(attempts: int) -> float:
+    """Exponential backoff before re-queueing a job's next attempt."""
+    return min(60, 2 ** attempts)
+
+
+def _aware(dt):
+    if dt is not None and dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+def _job_to_dict(job: AIJob) -> dict:
+    return {
+        "id": job.id,
+        "type": job.type,
+        "status": job.status,
+        "priority": job.priority,
+        "attempts": job.attempts,
+        "result": json.loads(job.result) if job.result else None,
+        "error": job.error,
+        "createdAt": _aware(job.created_at),
+        "finishedAt": _aware(job.finished_at),
+        "expiresAt": _aware(job.expires_at),
+    }
+
+
+def _classify_failure(exc: Exception):
+    """Returns (retryable, message)."""
+    if isinstance(exc, HTTPException):
+        return exc.status_code >= 500, str(exc.detail)
+    if isinstance(exc, asyncio.TimeoutError):
+        return True, f"Timed out after {AI_JOB_TIMEOUT}s"
+    if isinstance(exc, KeyError):
+        return False, f"Missing field: {exc.args[0]}"
+    if isinstance(exc, (ValidationError, ValueError, TypeError)):
+        return False, str(exc)
+    return True, str(exc)
+
+
+class JobQueue:
+    """Bounded priority queue of AI generations, executed by a local worker
+    pool. Job state and results live in the ai_jobs table so clients can
+    poll from any process; the queue itself is per process."""
+
+    def __init__(self):
+        self.enabled = engine is not None
+        self._queue = asyncio.PriorityQueue(maxsize=AI_JOB_QUEUE_SIZE)
+        self._seq = itertools.count()
+        self._handlers = None
+        self._tasks = []
+        self._retries = set()
+        # Slots held by submits whose row is still being inserted
+        self._reserved = 0
+        self._done_events = {}
+        self._waiters = {}
+        self.submitted = 0
+        self.rejected = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.retried = 0
+        self.expired = 0
+
+    # ---------------------------
+    # Sync DB work (run in the threadpool)
+    # ---------------------------
+
+    def _insert(self, job_id: str, job_type: str, params: dict, priority: int) -> dict:
+        db = SessionLocal()
+        try:
+            job = AIJob(id=job_id, type=job_type, params=json.dumps(params),
+                        status=QUEUED, priority=priority, attempts=0)
+            db.add(job)
+            db.commit()
+            db.refresh(job)
+            return _job_to_dict(job)
+        finally:
+            db.close()
+
+    def _get(self, job_id: str):
+        db = SessionLocal()
+        try:
+            job = db.get(AIJob, job_id)
+            return None if job is None else (_job_to_dict(job), json.loads(job.params))
+        finally:
+            db.close()
+
+    def _update(self, job_id: str, from_status: str = None, **fields) -> bool:
+        """Conditional update; returns False if the job was not in from_status."""
+        db = SessionLocal()
+        try:
+            query = db.query(AIJob).filter(AIJob.id == job_id)
+            if from_status is not None:
+                query = query.filter(AIJob.status == from_status)
+            updated = query.update({**fields, "updated_at": utcnow()}, synchronize_session=False)
+            db.commit()
+            return updated == 1
+        finally:
+            db.close()
+
+    def _recover(self) -> list:
+        """Queued jobs from a previous run, plus running jobs whose worker died."""
+        db = SessionLocal()
+        try:
+            stale_before = utcnow() - timedelta(seconds=AI_JOB_TIMEOUT * 2)
+            (db.query(AIJob)
+             .filter(AIJob.status == RUNNING, AIJob.updated_at < stale_before)
+             .update({"status": QUEUED}, synchronize_session=False))
+            db.commit()
+            rows = (db.query(AIJob.id, AIJob.priority)
+                    .filter(AIJob.status == QUEUED)
+                    .order_by(AIJob.priority.desc(), AIJob.created_at)
+                    .limit(AI_JOB_QUEUE_SIZE)
+                    .all())
+            return [(row.id, row.priority) for row in rows]
+        finally:
+            db.close()
+
+    def _purge(self) -> int:
+        db = SessionLocal()
+        try:
+            deleted = (db.query(AIJob)
+                       .filter(AIJob.expires_at.isnot(None), AIJob.expires_at < utcnow())
+                       .delete(synchronize_session=False))
+            db.commit()
+            return deleted
+        finally:
+            db.close()
+
+    # ---------------------------
+    # Lifecycle
+    # ---------------------------
+
+    async def start(self, handlers: dict):
+        if not self.enabled or self._tasks:
+            return
+        self._handlers = handlers
+        try:
+            for job_id, priority in await run_in_threadpool(self._recover):
+                self._enqueue(job_id, priority)
+        except Exception as e:
+            print(f"⚠ Could not recover queued jobs: {e}")
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(AI_JOB_WORKERS)]
+        self._tasks.append(asyncio.create_task(self._janitor()))
+
+    async def stop(self):
+        tasks = self._tasks + list(self._retries)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = []
+        self._retries.clear()
+
+    # ---------------------------
+    # Public API
+    # ---------------------------
+
+    async def submit(self, job_type: str, params: dict, priority: int) -> dict:
+        # Reserve the slot before the insert so concurrent submits can't all
+        # pass the check and then overflow the queue
+        if self._queue.qsize() + self._reserved >= AI_JOB_QUEUE_SIZE:
+            self.rejected += 1
+            raise QueueFullError()
+        self._reserved += 1
+        try:
+            job = await run_in_threadpool(self._insert, uuid.uuid4().hex, job_type, params, priority)
+        finally:
+            self._reserved -= 1
+        try:
+            self._enqueue(job["id"], priority)
+        except asyncio.QueueFull:
+            # A retry took the slot meanwhile; don't leave an orphan queued row
+            self.rejected += 1
+            await self._finish(job["id"], FAILED, error="Job queue full", from_status=QUEUED)
+            raise QueueFullError()
+        self.submitted += 1
+        return job
+
+    async def get(self, job_id: str):
+        row = await run_in_threadpool(self._get, job_id)
+        return None if row is None else row[0]
+
+    async def wait(self, job_id: str, timeout: float):
+        """Current job state, waiting up to `timeout` for it to finish."""
+        job = await self.get(job_id)
+        if job is None or job["status"] in TERMINAL_STATES:
+            return job
+        event = self._done_events.setdefault(job_id, asyncio.Event())
+        self._waiters[job_id] = self._waiters.get(job_id, 0) + 1
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            # The last waiter to give up drops the event, so jobs that never
+            # finish (or finish in another process) don't leak one
+            self._waiters[job_id] -= 1
+            if not self._waiters[job_id]:
+                del self._waiters[job_id]
+                if self._done_events.get(job_id) is event:
+                    del self._done_events[job_id]
+        return await self.get(job_id)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "queueDepth": self._queue.qsize(),
+            "waiting": len(self._done_events),
+            "capacity": AI_JOB_QUEUE_SIZE,
+            "workers": AI_JOB_WORKERS,
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "retried": self.retried,
+            "expired": self.expired,
+        }
+
+    # ---------------------------
+    # Workers
+    # ---------------------------
+
+    def _enqueue(self, job_id: str, priority: int):
+        # Higher priority first, FIFO within a priority
+        self._queue.put_nowait((-priority, next(self._seq), job_id))
+
+    async def _worker(self):
+        while True:
+            _, _, job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            except Exception as e:
+                print(f"❌ Job {job_id} crashed: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str):
+        row = await run_in_threadpool(self._get, job_id)
+        if row is None:
+            return
+        job, params = row
+        if job["status"] != QUEUED:
+            return
+
+        if utcnow() - job["createdAt"] > timedelta(seconds=AI_JOB_QUEUE_TTL):
+            self.expired += 1
+            await self._finish(job_id, EXPIRED, error="Job expired before it could run", from_status=QUEUED)
+            return
+
+        attempts = job["attempts"] + 1
+        # Claim atomically so a job recovered by two processes only runs once
+        claimed = await run_in_threadpool(
+            self._update, job_id, from_status=QUEUED, status=RUNNING, attempts=attempts
+        )
+        if not claimed:
+            return
+
+        try:
+            result = await asyncio.wait_for(
+                self._handlers[job["type"]](params, None), timeout=AI_JOB_TIMEOUT
+            )
+        except Exception as e:
+            retryable, message = _classify_failure(e)
+            if retryable and attempts < AI_JOB_MAX_ATTEMPTS:
+                self.retried += 1
+                await run_in_threadpool(self._update, job_id, status=QUEUED, error=message)
+                self._schedule_retry(job_id, job["priority"], attempts)
+                return
+            self.failed += 1
+            await self._finish(job_id, FAILED, error=message)
+            return
+
+        self.succeeded += 1
+        await self._finish(job_id, SUCCEEDED, result=json.dumps(result.model_dump()))
+
+    def _schedule_retry(self, job_id: str, priority: int, attempts: int):
+        async def retry():
+            await asyncio.sleep(retry_delay(attempts))
+            try:
+                self._enqueue(job_id, priority)
+            except asyncio.QueueFull:
+                self.failed += 1
+                await self._finish(job_id, FAILED, error="Job queue full on retry", from_status=QUEUED)
+
+        task = asyncio.create_task(retry())
+        self._retries.add(task)
+        task.add_done_callback(self._retries.discard)
+
+    async def _finish(self, job_id: str, status: str, result: str = None,
+                      error: str = None, from_status: str = None):
+        now = utcnow()
+        await run_in_threadpool(
+            self._update, job_id, from_status=from_status, status=status, result=result,
+            error=error, finished_at=now, expires_at=now + timedelta(seconds=AI_JOB_RESULT_TTL)
+        )
+        event = self._done_events.pop(job_id, None)
+        if event is not None:
+            event.set()
+
+    async def _janitor(self):
+        while True:
+            await asyncio.sleep(min(AI_JOB_RESULT_TTL, 600))
+            try:
+                purged = await run_in_threadpool(self._purge)
+                if purged:
+                    print(f"🧹 Purged {purged} expired AI jobs")
+            except Exception as e:
+                print(f"⚠ Job purge failed: {e}")
+
+
+job_queue = JobQueue()
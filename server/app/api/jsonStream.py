@@ -0,0 +1,258 @@
+# app/api/jsonStream.py
+import re
+import json
+
+_STRUCTURAL = re.compile(r'[{}\[\]",:]')
+# Below the top level only nesting and strings matter, not keys
+_NESTED_STRUCTURAL = re.compile(r'[{}\[\]"]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+# Remainder of a complete string literal (unrolled loop: linear, no backtracking)
+_STRING_TAIL = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_HIGH_SURROGATE_TAIL = re.compile(r'(?<!\\)(?:\\\\)*\\u[dD][89abAB][0-9a-fA-F]{2}$')
+
+
+_DECODER = json.JSONDecoder()
+_COMPACT_AFTER = 4096
+
+
+def _next_candidate(text: str, pos: int):
+    """Index of the next '{' whose next non-space character is '"' or '}'
+    (so not "{your}" in prose), -1 if there is none, or None if the text
+    ends before that can be decided."""
+    while True:
+        i = text.find("{", pos)
+        if i < 0:
+            return -1
+        j = i + 1
+        while j < len(text) and text[j] in " \t\r\n":
+            j += 1
+        if j == len(text):
+            return None
+        if text[j] in '"}':
+            return i
+        pos = i + 1
+
+
+class _Frame:
+    __slots__ = ("kind", "key", "start", "expect_key", "parent_key")
+
+    def __init__(self, kind: str, start: int, parent_key):
+        self.kind = kind            # "obj" or "arr"
+        self.start = start
+        self.parent_key = parent_key
+        self.key = None             # current key while inside an object
+        self.expect_key = kind == "obj"
+
+
+class StreamingJSONScanner:
+    """Incrementally scans LLM output for the first top-level JSON object.
+
+    Feed text chunks as they arrive. Completed elements of top-level arrays
+    named in `item_keys` come back as ("item", key, value) events, and the
+    decoded contents of top-level strings named in `text_keys` come back as
+    ("text", key, delta) events while they are still being written.
+    """
+
+    def __init__(self, item_keys=(), text_keys=()):
+        self.item_keys = set(item_keys)
+        self.text_keys = set(text_keys)
+        self._chunks = []
+        self._text = ""     # unscanned tail plus anything still being captured
+        self._offset = 0    # absolute position of self._text[0]
+        self._pos = 0
+        self._stack = []
+        self._start = None
+        self._end = None
+        self._value = None
+        # string state
+        self._in_string = False
+        self._string_start = 0
+        self._string_is_key = False
+        self._string_watched = None
+        self._emit_from = 0
+
+    @property
+    def done(self) -> bool:
+        return self._end is not None
+
+    def feed(self, chunk: str) -> list:
+        events = []
+        if self.done or not chunk:
+            return events
+        self._chunks.append(chunk)
+        self._text += chunk
+        text = self._text
+        n = len(text)
+
+        pos = self._pos
+        stack = self._stack
+        while pos < n:
+            if self._start is None:
+                pos = self._find_start(text, pos)
+                if self._start is None:
+                    break
+                continue
+            if self._in_string:
+                m = _STRING_SPECIAL.search(text, pos)
+                if m is None:
+                    pos = n
+                    break
+                i = m.start()
+                if text[i] == "\\":
+                    width = 6 if i + 1 < n and text[i + 1] == "u" else 2
+                    if i + width > n:
+                        # Escape split across chunks; resume here next feed
+                        pos = i
+                        break
+                    pos = i + width
+                    continue
+                # closing quote
+                if self._string_watched is not None:
+                    self._emit_text(events, i, final=True)
+                if self._string_is_key:
+                    stack[-1].key = json.loads(text[self._string_start:i + 1])
+                self._in_string = False
+                self._string_watched = None
+                pos = i + 1
+                continue
+
+            if len(stack) > 1:
+                m = _NESTED_STRUCTURAL.search(text, pos)
+            else:
+                m = _STRUCTURAL.search(text, pos)
+            if m is None:
+                pos = n
+                break
+            i = m.start()
+            ch = text[i]
+            top = stack[-1]
+            pos = i + 1
+
+            if ch == '"':
+                is_key = len(stack) == 1 and top.expect_key
+                watched = (not is_key and top.kind == "obj" and len(stack) == 1
+                           and top.key in self.text_keys)
+                if not watched:
+                    tail = _STRING_TAIL.match(text, pos)
+                    if tail is not None:
+                        # Whole literal already buffered: skip it in one step
+                        pos = tail.end()
+                        if is_key:
+                            top.key = json.loads(text[i:pos])
+                        continue
+                self._in_string = True
+                self._string_start = i
+                self._string_is_key = is_key
+                self._string_watched = top.key if watched else None
+                self._emit_from = i + 1
+            elif ch == "{" or ch == "[":
+                parent_key = top.key if top.kind == "obj" else top.parent_key
+                stack.append(_Frame("obj" if ch == "{" else "arr", i, parent_key))
+            elif ch == "}" or ch == "]":
+                frame = stack.pop()
+                if not stack:
+                    if self._close(self._offset + i):
+                        break
+                    # Balanced but not JSON (prose, or a malformed object):
+                    # look for the next candidate after it, never inside it
+                    continue
+                parent = stack[-1]
+                if (parent.kind == "arr" and len(stack) == 2
+                        and parent.parent_key in self.item_keys):
+                    events.append(("item", parent.parent_key, json.loads(text[frame.start:i + 1])))
+            elif ch == ":":
+                top.expect_key = False
+            elif ch == ",":
+                if top.kind == "obj":
+                    top.expect_key = True
+
+        if self._in_string and self._string_watched is not None:
+            self._emit_text(events, pos)
+        self._pos = pos
+        self._compact()
+        return events
+
+    def _find_start(self, text: str, pos: int) -> int:
+        """Open a candidate at the next '{' that can start an object;
+        returns where to resume scanning."""
+        i = _next_candidate(text, pos)
+        if i is None:
+            # Can't tell yet; decide once more text arrives
+            return text.rfind("{", pos)
+        if i < 0:
+            return len(text)
+        self._start = self._offset + i
+        self._stack.append(_Frame("obj", i, None))
+        return i + 1
+
+    def _close(self, end: int) -> bool:
+        """The candidate's braces balanced at absolute position `end`; keep
+        it if it decodes, otherwise discard it and keep scanning."""
+        full = "".join(self._chunks)
+        try:
+            self._value, stop = _DECODER.raw_decode(full, self._start)
+        except ValueError:
+            stop = None
+        if stop == end + 1:
+            self._end = end
+            return True
+        self._start = None
+        return False
+
+    def _compact(self):
+        """Drop scanned text that no pending capture still needs, so feeding
+        many small chunks stays linear in the total length."""
+        keep = self._pos
+        if self._in_string:
+            keep = min(keep, self._string_start, self._emit_from)
+        if len(self._stack) > 2:
+            keep = min(keep, self._stack[2].start)
+        if keep < _COMPACT_AFTER:
+            return
+        self._text = self._text[keep:]
+        self._offset += keep
+        self._pos -= keep
+        self._string_start -= keep
+        self._emit_from -= keep
+        for frame in self._stack:
+            frame.start -= keep
+
+    def _emit_text(self, events: list, end: int, final: bool = False):
+        raw = self._text[self._emit_from:end]
+        if not final and _HIGH_SURROGATE_TAIL.search(raw):
+            # Keep the first half of a surrogate pair until its partner arrives
+            end -= 6
+            raw = raw[:-6]
+        if raw:
+            events.append(("text", self._string_watched, json.loads(f'"{raw}"')))
+            self._emit_from = end
+
+    def result(self):
+        """The complete top-level object; raises ValueError if unfinished."""
+        if not self.done:
+            raise ValueError("Stream ended before the JSON object was complete")
+        return self._value
+
+
+def extract_json(text: str):
+    """Return the first top-level JSON object in `text`, or None.
+
+    Same rules as StreamingJSONScanner: prose and code fences around the
+    object are ignored, braces inside strings don't count, and a balanced
+    top-level object that doesn't decode is skipped as a whole rather than
+    searched for inner objects.
+    """
+    if not text:
+        return None
+    # Fast path: the first candidate usually is the object, and the C
+    # decoder is much faster than scanning
+    i = _next_candidate(text, 0)
+    if i is None or i < 0:
+        return None
+    try:
+        return _DECODER.raw_decode(text, i)[0]
+    except ValueError:
+        pass
+    scanner = StreamingJSONScanner()
+    scanner.feed(text)
+    return scanner.result() if scanner.done else None
@@ -0,0 +1,298 @@
+# app/api/practiceAnalytics.py
+from datetime import date, timedelta, timezone
+from sqlalchemy import func, select, delete, update, inspect
+from sqlalchemy.orm import Session
+
+from app.models import PracticeSession, PracticeRollup, Lesson, Song, utcnow
+
+ROLLING_SHORT = 7
+ROLLING_LONG = 30
+TOP_BREAKDOWN = 10
+
+
+# ---------------------------
+# Rollup maintenance
+# ---------------------------
+
+def _rollup_day(created_at) -> date:
+    created_at = created_at or utcnow()
+    if created_at.tzinfo is not None:
+        created_at = created_at.astimezone(timezone.utc)
+    return created_at.date()
+
+
+def _dialect_insert(dialect_name: str):
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    return insert
+
+
+# Columns that decide a session's rollup row and its contribution to it
+_ROLLUP_COLUMNS = ("user_id", "created_at", "lesson_id", "song_id", "duration_minutes")
+
+
+def _session_values(practice_session: PracticeSession) -> dict:
+    return {name: getattr(practice_session, name) for name in _ROLLUP_COLUMNS}
+
+
+def _stored_values(connection, practice_session: PracticeSession):
+    """The rollup columns of a session as the database still has them. Read
+    from the row because attribute history is empty for expired attributes
+    (e.g. any session modified after a commit)."""
+    table = PracticeSession.__table__
+    row = connection.execute(
+        select(*(table.c[name] for name in _ROLLUP_COLUMNS)).where(table.c.id == practice_session.id)
+    ).first()
+    return dict(row._mapping) if row is not None else None
+
+
+def _rollup_key(values: dict) -> dict:
+    return {
+        "user_id": values["user_id"],
+        "day": _rollup_day(values["created_at"]),
+        "lesson_id": values["lesson_id"] or 0,
+        "song_id": values["song_id"] or 0,
+    }
+
+
+def _add_to_rollup(connection, values: dict):
+    if values["user_id"] is None:
+        return
+    minutes = values["duration_minutes"] or 0
+    key = _rollup_key(values)
+    table = PracticeRollup.__table__
+
+    insert = _dialect_insert(connection.dialect.name)
+    if insert is not None:
+        stmt = insert(table).values(**key, minutes=minutes, session_count=1)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(key),
+            set_={
+                "minutes": table.c.minutes + stmt.excluded.minutes,
+                "session_count": table.c.session_count + 1,
+            },
+        )
+        connection.execute(stmt)
+        return
+
+    # Other dialects: update, then insert if the row did not exist yet
+    result = connection.execute(
+        update(table)
+        .where(*(table.c[col] == value for col, value in key.items()))
+        .values(minutes=table.c.minutes + minutes, session_count=table.c.session_count + 1)
+    )
+    if result.rowcount == 0:
+        connection.execute(table.insert().values(**key, minutes=minutes, session_count=1))
+
+
+def _remove_from_rollup(connection, values: dict):
+    if values["user_id"] is None:
+        return
+    key = _rollup_key(values)
+    table = PracticeRollup.__table__
+    where = [table.c[col] == value for col, value in key.items()]
+    connection.execute(
+        update(table)
+        .where(*where)
+        .values(
+            minutes=table.c.minutes - (values["duration_minutes"] or 0),
+            session_count=table.c.session_count - 1,
+        )
+    )
+    # The last session of the row is gone
+    connection.execute(delete(table).where(*where, table.c.session_count <= 0))
+
+
+def upsert_rollup(connection, practice_session: PracticeSession):
+    """Add one new session to its (user, day, lesson, song) rollup row."""
+    _add_to_rollup(connection, _session_values(practice_session))
+
+
+def move_rollup(connection, practice_session: PracticeSession):
+    """Re-count a session about to be updated (before_update): take the stored
+    values out of their rollup row and add the new ones. Updates that touch
+    no rollup column cost nothing."""
+    state = inspect(practice_session)
+    if not any(state.attrs[name].history.has_changes() for name in _ROLLUP_COLUMNS):
+        return
+    before = _stored_values(connection, practice_session)
+    if before is None:
+        return
+    after = {name: state.dict.get(name, before[name]) for name in _ROLLUP_COLUMNS}
+    if before != after:
+        _remove_from_rollup(connection, before)
+        _add_to_rollup(connection, after)
+
+
+def remove_rollup(connection, practice_session: PracticeSession):
+    """Take a session about to be deleted (before_delete) out of its rollup row."""
+    before = _stored_values(connection, practice_session)
+    if before is not None:
+        _remove_from_rollup(connection, before)
+
+
+def _session_day_expr(dialect_name: str):
+    if dialect_name == "sqlite":
+        return func.date(PracticeSession.created_at)
+    if dialect_name == "postgresql":
+        return func.date(func.timezone("UTC", PracticeSession.created_at))
+    return func.date(PracticeSession.created_at)
+
+
+def rebuild_rollups(db: Session, user_id: int = None) -> int:
+    """Recompute rollups from practice_sessions. The ORM events keep them in
+    step with session inserts, updates and deletes; run this after writes
+    that bypass the ORM (raw SQL, bulk update()/delete(), backfills).
+    Returns the number of rollup rows written."""
+    table = PracticeRollup.__table__
+    day = _session_day_expr(db.get_bind().dialect.name)
+    lesson_id = func.coalesce(PracticeSession.lesson_id, 0)
+    song_id = func.coalesce(PracticeSession.song_id, 0)
+
+    source = (
+        select(
+            PracticeSession.user_id,
+            day,
+            lesson_id,
+            song_id,
+            func.coalesce(func.sum(PracticeSession.duration_minutes), 0),
+            func.count(),
+        )
+        .where(PracticeSession.user_id.isnot(None))
+        .group_by(PracticeSession.user_id, day, lesson_id, song_id)
+    )
+    clear = delete(table)
+    if user_id is not None:
+        source = source.where(PracticeSession.user_id == user_id)
+        clear = clear.where(table.c.user_id == user_id)
+
+    db.execute(clear)
+    result = db.execute(
+        table.insert().from_select(
+            ["user_id", "day", "lesson_id", "song_id", "minutes", "session_count"], source
+        )
+    )
+    db.commit()
+    return result.rowcount
+
+
+# ---------------------------
+# Analytics
+# ---------------------------
+
+def _streaks(active_days: list, today: date):
+    """(current, longest) runs of consecutive days in sorted `active_days`.
+    The current streak survives until the end of the day after the last
+    practice."""
+    longest = run = 0
+    previous = None
+    for day in active_days:
+        run = run + 1 if previous is not None and (day - previous).days == 1 else 1
+        longest = max(longest, run)
+        previous = day
+    current = run if previous is not None and (today - previous).days <= 1 else 0
+    return current, longest
+
+
+def _breakdown(db: Session, user_id: int, start: date, today: date, column, model):
+    R = PracticeRollup
+    minutes = func.sum(R.minutes).label("minutes")
+    rows = (
+        db.query(column, model.title, minutes, func.sum(R.session_count))
+        .outerjoin(model, model.id == column)
+        .filter(R.user_id == user_id, R.day >= start, R.day <= today, column != 0)
+        .group_by(column, model.title)
+        .order_by(minutes.desc())
+        .limit(TOP_BREAKDOWN)
+        .all()
+    )
+    return [
+        {"id": item_id, "title": title, "minutes": int(total), "sessions": int(count)}
+        for item_id, title, total, count in rows
+    ]
+
+
+def user_analytics(db: Session, user_id: int, days: int = 30, today: date = None) -> dict:
+    """Dashboard numbers for one user from practice_rollups. Every query is
+    bounded by the date window or by calendar days, never by session count."""
+    R = PracticeRollup
+    today = today or utcnow().date()
+    start = today - timedelta(days=days - 1)
+    history_start = start - timedelta(days=ROLLING_LONG - 1)
+
+    total_minutes, total_sessions = (
+        db.query(func.coalesce(func.sum(R.minutes), 0), func.coalesce(func.sum(R.session_count), 0))
+        .filter(R.user_id == user_id)
+        .one()
+    )
+
+    per_day = {
+        day if isinstance(day, date) else date.fromisoformat(day): (int(m), int(c))
+        for day, m, c in (
+            db.query(R.day, func.sum(R.minutes), func.sum(R.session_count))
+            .filter(R.user_id == user_id, R.day >= history_start, R.day <= today)
+            .group_by(R.day)
+            .all()
+        )
+    }
+
+    active_days = [
+        day if isinstance(day, date) else date.fromisoformat(day)
+        for (day,) in (
+            db.query(R.day)
+            .filter(R.user_id == user_id, R.day <= today)
+            .distinct()
+            .order_by(R.day)
+            .all()
+        )
+    ]
+    current_streak, longest_streak = _streaks(active_days, today)
+
+    # Zero-filled series so rolling averages count rest days
+    span = (today - history_start).days + 1
+    series = [per_day.get(history_start + timedelta(days=i), (0, 0)) for i in range(span)]
+    prefix = [0]
+    for minutes, _ in series:
+        prefix.append(prefix[-1] + minutes)
+
+    daily = []
+    weekly = {}
+    offset = ROLLING_LONG - 1
+    for i in range(offset, span):
+        day = history_start + timedelta(days=i)
+        minutes, sessions = series[i]
+        daily.append({
+            "day": day,
+            "minutes": minutes,
+            "sessions": sessions,
+            "rolling7": round((prefix[i + 1] - prefix[i + 1 - ROLLING_SHORT]) / ROLLING_SHORT, 1),
+            "rolling30": round((prefix[i + 1] - prefix[i + 1 - ROLLING_LONG]) / ROLLING_LONG, 1),
+        })
+        week_start = day - timedelta(days=day.weekday())
+        week = weekly.setdefault(week_start, {"weekStart": week_start, "minutes": 0, "sessions": 0})
+        week["minutes"] += minutes
+        week["sessions"] += sessions
+
+    window_minutes = sum(d["minutes"] for d in daily)
+    window_sessions = sum(d["sessions"] for d in daily)
+
+    return {
+        "userId": user_id,
+        "days": days,
+        "totalMinutes": int(total_minutes),
+        "totalSessions": int(total_sessions),
+        "windowMinutes": window_minutes,
+        "windowSessions": window_sessions,
+        "avgDailyMinutes": round(window_minutes / days, 1),
+        "avgSessionMinutes": round(window_minutes / window_sessions, 1) if window_sessions else 0.0,
+        "currentStreak": current_streak,
+        "longestStreak": longest_streak,
+        "daily": daily,
+        "weekly": list(weekly.values()),
+        "byLesson": _breakdown(db, user_id, start, today, R.lesson_id, Lesson),
+        "bySong": _breakdown(db, user_id, start, today, R.song_id, Song),
+    }
@@ -0,0 +1,168 @@
+# app/api/practiceStats.py
+from datetime import date, datetime, timezone
+
+import numpy as np
+
+# Breakdowns keep the largest groups and fold the rest into "other" so the
+# summary (and the prompt built from it) has a fixed upper size.
+TOP_GROUPS = 5
+TREND_WINDOW_DAYS = 28  # whole weeks
+RECENT_NOTES = 3
+NOTE_CHARS = 120
+
+# Client sessions use {date, duration, focus, ...}; stored PracticeSessions
+# use {created_at, duration_minutes, lesson_id, song_id}.
+_DATE_FIELDS = ("date", "created_at", "createdAt")
+_MINUTE_FIELDS = ("duration", "duration_minutes", "durationMinutes", "minutes")
+_GROUP_FIELDS = {
+    "instrument": ("instrument",),
+    "focus": ("focus",),
+    "lesson": ("lesson", "lessonId", "lesson_id"),
+    "song": ("song", "songId", "song_id"),
+}
+
+
+def _first(session: dict, fields: tuple):
+    for field in fields:
+        value = session.get(field)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def _to_day(value) -> str:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()[:10]
+    return str(value)[:10] if value is not None else "NaT"
+
+
+def _parse_days(values: list) -> np.ndarray:
+    try:
+        return np.array(values, dtype="datetime64[D]")
+    except ValueError:
+        days = []
+        for value in values:
+            try:
+                days.append(np.datetime64(value, "D"))
+            except ValueError:
+                days.append(np.datetime64("NaT"))
+        return np.array(days, dtype="datetime64[D]")
+
+
+def _parse_minutes(values: list) -> np.ndarray:
+    minutes = np.empty(len(values), dtype=np.float64)
+    for i, value in enumerate(values):
+        try:
+            minutes[i] = float(value)
+        except (TypeError, ValueError):
+            minutes[i] = np.nan
+    return minutes
+
+
+def _streaks(active_days: np.ndarray, today: int):
+    """Longest run of consecutive active days, and the run ending today or
+    yesterday. `active_days` is sorted, unique day ordinals."""
+    if active_days.size == 0:
+        return 0, 0
+    breaks = np.flatnonzero(np.diff(active_days) != 1)
+    starts = np.concatenate(([0], breaks + 1))
+    ends = np.concatenate((breaks, [active_days.size - 1]))
+    lengths = ends - starts + 1
+    current = int(lengths[-1]) if today - active_days[-1] <= 1 else 0
+    return int(lengths.max()), current
+
+
+def _breakdown(labels: list, minutes: np.ndarray) -> dict:
+    """Minutes per label, largest first, capped at TOP_GROUPS entries."""
+    keys = np.array([str(label) if label is not None else "" for label in labels])
+    mask = keys != ""
+    if not mask.any():
+        return {}
+    names, inverse = np.unique(keys[mask], return_inverse=True)
+    totals = np.bincount(inverse, weights=minutes[mask])
+    order = np.argsort(totals)[::-1]
+    result = {str(names[i]): round(float(totals[i]), 1) for i in order[:TOP_GROUPS]}
+    if order.size > TOP_GROUPS:
+        result["other"] = round(float(totals[order[TOP_GROUPS:]].sum()), 1)
+    return result
+
+
+def summarize_sessions(sessions: list, today: date = None) -> dict:
+    """Reduce any number of practice sessions to a fixed-size feature summary
+    for the practice-advice prompt."""
+    today = today or datetime.now(timezone.utc).date()
+    sessions = [s for s in sessions or [] if isinstance(s, dict)]
+    if not sessions:
+        return {"sessionCount": 0, "totalMinutes": 0}
+
+    days = _parse_days([_to_day(_first(s, _DATE_FIELDS)) for s in sessions])
+    minutes = _parse_minutes([_first(s, _MINUTE_FIELDS) for s in sessions])
+    valid = ~np.isnan(minutes) & (minutes >= 0)
+    # Future dates (client clock skew) would break streaks and the trend
+    dated = valid & ~np.isnat(days) & (days <= np.datetime64(today, "D"))
+
+    minutes_v = minutes[valid]
+    if minutes_v.size == 0:
+        return {"sessionCount": len(sessions), "totalMinutes": 0}
+
+    today_ord = int(np.datetime64(today, "D").astype(np.int64))
+    ordinals = days[dated].astype(np.int64)
+    day_minutes = minutes[dated]
+
+    summary = {
+        "sessionCount": int(minutes_v.size),
+        "totalMinutes": round(float(minutes_v.sum()), 1),
+        "avgSessionMinutes": round(float(minutes_v.mean()), 1),
+        "medianSessionMinutes": round(float(np.median(minutes_v)), 1),
+        "sessionMinutesVariance": round(float(minutes_v.var()), 1),
+        "longestSessionMinutes": round(float(minutes_v.max()), 1),
+    }
+
+    if ordinals.size:
+        active, per_day = np.unique(ordinals, return_inverse=True)
+        daily_totals = np.bincount(per_day, weights=day_minutes)
+        longest, current = _streaks(active, today_ord)
+        span = int(active[-1] - active[0]) + 1
+
+        # Daily minutes over the trailing window, zero-filled, for the trend
+        window_start = today_ord - TREND_WINDOW_DAYS + 1
+        in_window = (active >= window_start) & (active <= today_ord)
+        window = np.zeros(TREND_WINDOW_DAYS)
+        window[active[in_window] - window_start] = daily_totals[in_window]
+        slope = np.polyfit(np.arange(TREND_WINDOW_DAYS), window, 1)[0] if window.any() else 0.0
+        weekly = window.reshape(-1, 7).sum(axis=1)
+
+        summary.update({
+            "firstSession": str(np.datetime64(int(active[0]), "D")),
+            "lastSession": str(np.datetime64(int(active[-1]), "D")),
+            "daysSinceLastSession": today_ord - int(active[-1]),
+            "activeDays": int(active.size),
+            "activeDayRatio": round(active.size / span, 2),
+            "avgMinutesPerActiveDay": round(float(daily_totals.mean()), 1),
+            "dailyMinutesVariance": round(float(daily_totals.var()), 1),
+            "currentStreakDays": current,
+            "longestStreakDays": longest,
+            "trendMinutesPerDay": round(float(slope), 2),
+            "last4WeeksMinutes": [round(float(w), 1) for w in weekly],
+        })
+
+    valid_sessions = [s for s, ok in zip(sessions, valid) if ok]
+    for name, fields in _GROUP_FIELDS.items():
+        breakdown = _breakdown([_first(s, fields) for s in valid_sessions], minutes_v)
+        if breakdown:
+            summary[f"minutesBy{name.capitalize()}"] = breakdown
+
+    # A few recent free-text notes carry context the numbers can't
+    # (undated sessions sort as oldest)
+    recent = np.argsort(days[valid].astype(np.int64), kind="stable")[::-1]
+    notes = []
+    for i in recent:
+        note = valid_sessions[i].get("notes") or valid_sessions[i].get("feedback")
+        if note:
+            notes.append(str(note)[:NOTE_CHARS])
+            if len(notes) == RECENT_NOTES:
+                break
+    if notes:
+        summary["recentNotes"] = notes
+
+    return summary
@@ -0,0 +1,187 @@
+# app/api/progressionIndex.py
+import json
+from sqlalchemy import select, delete, func, cast, Float, bindparam, tuple_, inspect
+from sqlalchemy.orm import Session
+
+from app.models import ChordProgression, ProgressionNgram, Song
+from app.api.chordTheory import (
+    EncodedProgression, NGRAM, NOTE_NAMES, parse_progression, ngrams, gram_range, contains, code_numeral,
+)
+
+REBUILD_BATCH = 2000
+# Candidates verified per round-trip in contains mode
+CONTAINS_SCAN_BATCH = 500
+
+
+# ---------------------------
+# Encoding and postings maintenance
+# ---------------------------
+
+def _arrangement_key(arrangement: str):
+    if not arrangement:
+        return None
+    try:
+        return json.loads(arrangement).get("key")
+    except (ValueError, AttributeError):
+        return None
+
+
+def encode(progression: str, key: str = None):
+    """EncodedProgression for stored text, or None if no chord parses. A key
+    that doesn't parse (free-form model output) falls back to a guess."""
+    try:
+        return parse_progression(progression, key)
+    except ValueError:
+        return parse_progression(progression)
+
+
+def _encoded_values(progression: str, arrangement: str = None) -> dict:
+    encoded = encode(progression, _arrangement_key(arrangement))
+    if encoded is None:
+        return {"tonic": None, "degrees": None, "ngram_count": None}
+    return {"tonic": encoded.tonic, "degrees": encoded.codes, "ngram_count": len(ngrams(encoded.codes))}
+
+
+def encode_entry(entry: ChordProgression):
+    """Fill tonic/degrees/ngram_count before the row is written."""
+    state = inspect(entry)
+    if state.persistent and not (
+        state.attrs.progression.history.has_changes() or state.attrs.arrangement.history.has_changes()
+    ):
+        return
+    for column, value in _encoded_values(entry.progression, entry.arrangement).items():
+        setattr(entry, column, value)
+
+
+def index_entry(connection, entry: ChordProgression):
+    """Replace the row's n-gram postings after its degrees changed."""
+    history = inspect(entry).attrs.degrees.history
+    if not history.has_changes():
+        return
+    table = ProgressionNgram.__table__
+    if history.deleted:
+        connection.execute(table.delete().where(table.c.progression_id == entry.id))
+    if entry.degrees:
+        connection.execute(table.insert(), [
+            {"gram": gram, "progression_id": entry.id} for gram in ngrams(entry.degrees)
+        ])
+
+
+def rebuild_progression_index(db: Session) -> int:
+    """Re-encode every progression and rewrite all postings (backfills, and
+    loads that bypass the ORM). Returns the number of rows encoded."""
+    CP = ChordProgression
+    table = CP.__table__
+    postings = ProgressionNgram.__table__
+    db.execute(delete(postings))
+    update = (
+        table.update()
+        .where(table.c.id == bindparam("row_id"))
+        .values(tonic=bindparam("tonic"), degrees=bindparam("degrees"), ngram_count=bindparam("ngram_count"))
+    )
+
+    encoded = 0
+    last_id = 0
+    while True:
+        rows = db.execute(
+            select(CP.id, CP.progression, CP.arrangement)
+            .where(CP.id > last_id).order_by(CP.id).limit(REBUILD_BATCH)
+        ).all()
+        if not rows:
+            break
+        values = [{"row_id": row.id, **_encoded_values(row.progression, row.arrangement)} for row in rows]
+        db.execute(update, values)
+        grams = [
+            {"gram": gram, "progression_id": v["row_id"]}
+            for v in values if v["degrees"] for gram in ngrams(v["degrees"])
+        ]
+        if grams:
+            db.execute(postings.insert(), grams)
+        db.commit()
+        encoded += sum(1 for v in values if v["degrees"])
+        last_id = rows[-1].id
+    return encoded
+
+
+# ---------------------------
+# Queries
+# ---------------------------
+
+def _columns():
+    CP = ChordProgression
+    return (CP.id, CP.song_id, CP.progression, CP.tonic, CP.degrees, Song.title, Song.artist)
+
+
+def _match(row, score: float) -> dict:
+    return {
+        "id": row.id,
+        "songId": row.song_id,
+        "songTitle": row.title,
+        "artist": row.artist,
+        "progression": row.progression,
+        "key": NOTE_NAMES[row.tonic],
+        "numerals": [code_numeral(code) for code in row.degrees],
+        "score": round(score, 4),
+    }
+
+
+def find_similar(db: Session, query: EncodedProgression, limit: int) -> list:
+    """Progressions ranked by Jaccard similarity of their chord trigrams to
+    the query loop's. Only rows sharing a trigram are read and scored."""
+    CP, P = ChordProgression, ProgressionNgram
+    grams = ngrams(query.codes)
+    shared = (
+        select(P.progression_id, func.count().label("shared"))
+        .where(P.gram.in_(grams))
+        .group_by(P.progression_id)
+        .subquery()
+    )
+    score = (cast(shared.c.shared, Float) / (len(grams) + CP.ngram_count - shared.c.shared)).label("score")
+    rows = db.execute(
+        select(*_columns(), score)
+        .join(shared, shared.c.progression_id == CP.id)
+        .outerjoin(Song, Song.id == CP.song_id)
+        .order_by(score.desc(), CP.id)
+        .limit(limit)
+    ).all()
+    return [_match(row, row.score) for row in rows]
+
+
+def find_containing(db: Session, fragment: EncodedProgression, limit: int) -> list:
+    """Progressions that play `fragment` contiguously (wrapping around the
+    loop), shortest first. Candidates come from the postings, so rows that
+    lack one of the fragment's trigrams are never read."""
+    CP, P = ChordProgression, ProgressionNgram
+    if len(fragment.codes) >= NGRAM:
+        grams = ngrams(fragment.codes, cyclic=False)
+        candidates = (
+            select(P.progression_id).where(P.gram.in_(grams))
+            .group_by(P.progression_id).having(func.count() == len(grams))
+        )
+    else:
+        low, high = gram_range(fragment.codes)
+        candidates = select(P.progression_id).where(P.gram.between(low, high)).distinct()
+
+    length = func.length(CP.degrees)
+    base = (
+        select(*_columns(), length.label("length"))
+        .outerjoin(Song, Song.id == CP.song_id)
+        .where(CP.id.in_(candidates))
+        .order_by(length, CP.id)
+        .limit(CONTAINS_SCAN_BATCH)
+    )
+    matches = []
+    last = None
+    while len(matches) < limit:
+        stmt = base if last is None else base.where(tuple_(length, CP.id) > tuple_(*last))
+        rows = db.execute(stmt).all()
+        for row in rows:
+            # Shared trigrams don't guarantee they are adjacent
+            if contains(row.degrees, fragment.codes):
+                matches.append(_match(row, len(fragment.codes) / max(row.length, len(fragment.codes))))
+                if len(matches) == limit:
+                    break
+        if len(rows) < CONTAINS_SCAN_BATCH:
+            break
+        last = (rows[-1].length, rows[-1].id)
+    return matches
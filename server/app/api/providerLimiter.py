@@ -0,0 +1,98 @@
+# app/api/providerLimiter.py
+import time
+import asyncio
+from contextlib import asynccontextmanager
+
+from app.config import (
+    GEMINI_MAX_CONCURRENCY,
+    GROK_MAX_CONCURRENCY,
+    GEMINI_RATE_LIMIT_RPM,
+    GROK_RATE_LIMIT_RPM,
+    GEMINI_MAX_QUEUE,
+    GROK_MAX_QUEUE,
+)
+
+
+class ProviderBusyError(Exception):
+    """The provider's wait queue is full; the call was never made."""
+
+
+class ProviderLimiter:
+    """Caps concurrent upstream calls and request rate for one AI provider
+    and tracks queue depth.
+
+    The rate limit is a token bucket refilled at `rate_per_minute`, allowing
+    bursts up to the concurrency limit; 0 disables it. Once `max_queue`
+    callers are waiting, further ones raise ProviderBusyError; 0 never
+    rejects.
+    """
+
+    def __init__(self, name: str, max_concurrency: int, rate_per_minute: float = 0, max_queue: int = 0):
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max_queue
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.rate_per_minute = rate_per_minute
+        self._tokens = float(self.max_concurrency)
+        self._refilled_at = time.monotonic()
+        self.waiting = 0
+        self.in_flight = 0
+        self.peak_waiting = 0
+        self.total_calls = 0
+        self.rejected = 0
+
+    @asynccontextmanager
+    async def slot(self):
+        if self.max_queue and self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise ProviderBusyError(f"{self.name.title()} queue is full ({self.waiting} waiting)")
+        self.waiting += 1
+        if self._semaphore.locked():
+            self.peak_waiting = max(self.peak_waiting, self.waiting)
+        try:
+            await self._take_token()
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        self.total_calls += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    async def _take_token(self):
+        if not self.rate_per_minute:
+            return
+        per_second = self.rate_per_minute / 60.0
+        while True:
+            now = time.monotonic()
+            self._tokens = min(
+                float(self.max_concurrency),
+                self._tokens + (now - self._refilled_at) * per_second
+            )
+            self._refilled_at = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / per_second)
+
+    def snapshot(self) -> dict:
+        return {
+            "maxConcurrency": self.max_concurrency,
+            "ratePerMinute": self.rate_per_minute or None,
+            "inFlight": self.in_flight,
+            "queueDepth": self.waiting,
+            "peakQueueDepth": self.peak_waiting,
+            "maxQueueDepth": self.max_queue or None,
+            "rejected": self.rejected,
+            "totalCalls": self.total_calls,
+        }
+
+
+provider_limiters = {
+    "gemini": ProviderLimiter("gemini", GEMINI_MAX_CONCURRENCY, GEMINI_RATE_LIMIT_RPM, GEMINI_MAX_QUEUE),
+    "grok": ProviderLimiter("grok", GROK_MAX_CONCURRENCY, GROK_RATE_LIMIT_RPM, GROK_MAX_QUEUE),
+}
@@ -0,0 +1,163 @@
+# app/api/responseCache.py
+import json
+import time
+import asyncio
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+
+from app.config import AI_CACHE_TTL, AI_CACHE_MAX_BYTES, AI_CACHE_PATH
+
+
+# Parameters whose case never changes the answer; everything else (topics,
+# prompts, questions) is user text and stays case-sensitive
+CASE_INSENSITIVE_PARAMS = {
+    "instrument", "level", "skill_level", "timeSignature", "genre", "mood", "style", "songQuery",
+}
+# How often expired rows are swept out of the disk store, in seconds
+DISK_PURGE_INTERVAL = 600
+
+
+def _normalize(value, fold_case: bool = False):
+    if isinstance(value, str):
+        value = " ".join(value.split())
+        return value.lower() if fold_case else value
+    if isinstance(value, dict):
+        return {k: _normalize(v, k in CASE_INSENSITIVE_PARAMS) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v, fold_case) for v in value]
+    return value
+
+
+def cache_key(endpoint: str, params: dict) -> str:
+    """Content address for a request: endpoint + normalized parameters."""
+    canonical = json.dumps(
+        {"endpoint": endpoint, "params": _normalize(params)},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class _DiskStore:
+    """Tiny sqlite-backed key/value store so cached answers survive restarts."""
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS ai_cache "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+        self._purged_at = 0.0
+        self.purge()
+
+    def purge(self) -> int:
+        """Delete every expired row; returns how many were removed."""
+        with self._lock:
+            deleted = self._conn.execute("DELETE FROM ai_cache WHERE expires_at < ?", (time.time(),)).rowcount
+            self._conn.commit()
+            self._purged_at = time.monotonic()
+            return deleted
+
+    def get(self, key: str):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM ai_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] < time.time():
+                self._conn.execute("DELETE FROM ai_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            return row[0], row[1]
+
+    def set(self, key: str, value: str, expires_at: float):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ai_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires_at),
+            )
+            self._conn.commit()
+        # Rows that are never read again would otherwise stay forever
+        if time.monotonic() - self._purged_at >= DISK_PURGE_INTERVAL:
+            self.purge()
+
+
+class ResponseCache:
+    """In-memory LRU with TTL and a byte cap, optionally backed by disk."""
+
+    def __init__(self, ttl: float, max_bytes: int, disk_path: str = None):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (expires_at, size, value)
+        self._bytes = 0
+        self._disk = _DiskStore(disk_path) if disk_path else None
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+
+    def _store(self, key: str, encoded: str, expires_at: float):
+        size = len(encoded.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        self._drop(key)
+        self._entries[key] = (expires_at, size, encoded)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.evictions += 1
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    async def get(self, key: str):
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] >= time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return json.loads(entry[2])
+            self._drop(key)
+
+        if self._disk is not None:
+            row = await asyncio.to_thread(self._disk.get, key)
+            if row is not None:
+                encoded, expires_at = row
+                self._store(key, encoded, expires_at)
+                self.hits += 1
+                self.disk_hits += 1
+                return json.loads(encoded)
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: dict):
+        encoded = json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+        expires_at = time.time() + self.ttl
+        self._store(key, encoded, expires_at)
+        if self._disk is not None:
+            await asyncio.to_thread(self._disk.set, key, encoded, expires_at)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "diskHits": self.disk_hits,
+            "hitRate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "evictions": self.evictions,
+            "persistent": self._disk is not None,
+        }
+
+
+response_cache = ResponseCache(AI_CACHE_TTL, AI_CACHE_MAX_BYTES, AI_CACHE_PATH or None)
@@ -0,0 +1,91 @@
+# app/api/rhythmPatterns.py
+from typing import Optional
+
+# Strum grids, one character per slot: D down, U up, - let ring (or a
+# missed stroke). A grid covers one bar in eighths or sixteenths; the
+# slot size follows from its length.
+RHYTHM_PATTERNS = {
+    ("4/4", "beginner"): ("Quarter-Note Downstrums", "D-D-D-D-",
+                          "Four even down strums, one on each beat. Count \"1 2 3 4\" out loud and keep your wrist loose."),
+    ("4/4", "intermediate"): ("Folk-Pop Strum", "D-DU-UDU",
+                              "Down, down-up, up-down-up. Keep the hand moving down and up on every eighth note and miss the strings on beat 3."),
+    ("4/4", "advanced"): ("Syncopated Sixteenth Strum", "D--U--D-D-DU-UDU",
+                          "Sixteenth-note pendulum: the hand never stops, striking only where marked. Accent the up-strum before beat 2 for the push."),
+    ("3/4", "beginner"): ("Waltz Downstrums", "D-D-D-",
+                          "Three down strums per bar. Lean a little on beat 1 so the waltz feel comes through."),
+    ("3/4", "intermediate"): ("Waltz Strum", "D-DUDU",
+                              "Down on 1, then down-up on beats 2 and 3. Keep beat 1 slightly louder."),
+    ("3/4", "advanced"): ("Sixteenth Waltz", "D-DUD-DU-UDU",
+                          "A sixteenth-note pendulum in three: down on each beat with ghosted up-strums between. Keep the accent on beat 1."),
+    ("2/4", "beginner"): ("March Downstrums", "D-D-",
+                          "Two down strums per bar, steady as a march."),
+    ("2/4", "intermediate"): ("Polka Strum", "D-DU",
+                              "Down on 1, down-up on 2. Bright and bouncy."),
+    ("2/4", "advanced"): ("Sixteenth Two-Step", "D-DUD-DU",
+                          "Sixteenth-note down-up fills after each beat. Keep the hand moving on every sixteenth."),
+    ("6/8", "beginner"): ("Compound Downstrums", "D--D--",
+                          "Two strums per bar, on counts 1 and 4. Feel the bar as two big beats."),
+    ("6/8", "intermediate"): ("6/8 Ballad Strum", "DUDDUD",
+                              "Down-up-down, down-up-down. Accent counts 1 and 4."),
+    ("6/8", "advanced"): ("Rolling 6/8 Strum", "D-DUD-D-DUDU",
+                          "Sixteenth-note fills in each group of three. Keep accents on counts 1 and 4."),
+    ("12/8", "beginner"): ("Slow Blues Downstrums", "D--D--D--D--",
+                           "Four strums per bar, one on each big beat. Feel the triplet pulse underneath."),
+    ("12/8", "intermediate"): ("Shuffle Strum", "D-UD-UD-UD-U",
+                               "Long down, short up on every beat, giving the shuffle swing."),
+}
+LEVEL_ALIASES = {"beginner": "beginner", "easy": "beginner", "novice": "beginner",
+                 "intermediate": "intermediate", "medium": "intermediate",
+                 "advanced": "advanced", "expert": "advanced", "hard": "advanced"}
+# Styles the generic strums fit; anything else goes to the model
+GENERIC_STYLES = {"", "strum", "strumming", "standard", "basic", "pop", "folk", "acoustic"}
+_DURATIONS = {1: "sixteenth", 2: "eighth", 3: "dotted eighth", 4: "quarter",
+              6: "dotted quarter", 8: "half", 12: "dotted half", 16: "whole"}
+_STROKES = {"D": "Down", "U": "Up"}
+
+
+def _counts(slot: int, beat_unit: int) -> tuple:
+    """(beat number, count name) of a sixteenth position: 1, e, &, a."""
+    beat, within = divmod(slot, beat_unit)
+    if within == 0:
+        return beat + 1, str(beat + 1)
+    return beat + 1, {4: ["", "e", "&", "a"], 2: ["", "&"]}[beat_unit][within]
+
+
+def expand_grid(grid: str, time_sig: str) -> list:
+    """Pattern entries for a strum grid: one per stroke, with the duration it
+    rings for. Durations add up to exactly one bar."""
+    beats, unit = (int(part) for part in time_sig.split("/"))
+    bar = beats * 16 // unit
+    slot = bar // len(grid)
+    beat_unit = 16 // unit
+    hits = [i for i, char in enumerate(grid) if char in _STROKES]
+    pattern = []
+    for hit, next_hit in zip(hits, hits[1:] + [len(grid)]):
+        beat, count = _counts(hit * slot, beat_unit)
+        pattern.append({
+            "beat": beat,
+            "count": count,
+            "stroke": _STROKES[grid[hit]],
+            "duration": _DURATIONS[(next_hit - hit) * slot],
+        })
+    return pattern
+
+
+def rule_based_rhythm(time_sig: str, level: str, style: Optional[str] = None) -> Optional[dict]:
+    """RhythmPatternResult dict for common meters and levels, or None when
+    the request needs the model (unusual meter, level or style)."""
+    level = LEVEL_ALIASES.get((level or "").strip().lower())
+    if (style or "").strip().lower() not in GENERIC_STYLES:
+        return None
+    time_sig = (time_sig or "").replace(" ", "")
+    entry = RHYTHM_PATTERNS.get((time_sig, level))
+    if entry is None:
+        return None
+    name, grid, description = entry
+    return {
+        "name": name,
+        "timeSignature": time_sig,
+        "description": f"{description} Grid: {grid}",
+        "pattern": expand_grid(grid, time_sig),
+    }
@@ -0,0 +1,57 @@
+# app/api/singleFlight.py
+import asyncio
+
+
+class _Call:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one upstream call.
+
+    The upstream call runs as its own task so one caller disconnecting does
+    not cancel it for the others; it is cancelled only when every caller
+    waiting on it has gone away.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self.callers = 0
+        self.upstream_calls = 0
+
+    async def do(self, key: str, func):
+        self.callers += 1
+        call = self._calls.get(key)
+        if call is None:
+            self.upstream_calls += 1
+            call = _Call(asyncio.create_task(func()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _task: self._forget(key, call))
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                call.task.cancel()
+
+    def _forget(self, key: str, call: _Call):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        if not call.task.cancelled():
+            # Mark the exception as retrieved when every waiter already left
+            call.task.exception()
+
+    def stats(self) -> dict:
+        return {
+            "callers": self.callers,
+            "upstreamCalls": self.upstream_calls,
+            "fanInRatio": round(self.callers / self.upstream_calls, 3) if self.upstream_calls else 0.0,
+            "inFlight": len(self._calls),
+        }
+
+
+inflight_requests = SingleFlight()
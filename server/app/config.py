@@ -13,3 +13,112 @@ FRONTEND_ORIGINS = [
 ]
 
 DEFAULT_CHORD_KEY = "C"
+
+# Key for the catalog/user admin routers (/songs, /lessons, /instruments,
+# /users, /practice), sent as the X-API-Key header. Empty keeps those routes closed.
+ADMIN_API_KEY = os.getenv("ADMIN_API_KEY", "")
+
+# --- AI provider execution ---
+# "async" uses the SDK's native coroutine API, "executor" runs the blocking
+# client on a dedicated thread pool sized to the concurrency limit.
+GEMINI_EXECUTION_MODE = os.getenv("GEMINI_EXECUTION_MODE", "async")
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "8"))
+GROK_MAX_CONCURRENCY = int(os.getenv("GROK_MAX_CONCURRENCY", "8"))
+# Requests per minute per provider across all callers; 0 means unlimited
+GEMINI_RATE_LIMIT_RPM = float(os.getenv("GEMINI_RATE_LIMIT_RPM", "0"))
+GROK_RATE_LIMIT_RPM = float(os.getenv("GROK_RATE_LIMIT_RPM", "0"))
+# Callers allowed to queue for a provider slot before new ones are turned
+# away (and fail over); 0 means unbounded
+GEMINI_MAX_QUEUE = int(os.getenv("GEMINI_MAX_QUEUE", "0"))
+GROK_MAX_QUEUE = int(os.getenv("GROK_MAX_QUEUE", "0"))
+GEMINI_PROBE_INTERVAL = float(os.getenv("GEMINI_PROBE_INTERVAL", "300"))
+GEMINI_PROBE_TIMEOUT = float(os.getenv("GEMINI_PROBE_TIMEOUT", "10"))
+
+GROK_HTTP2 = os.getenv("GROK_HTTP2", "false").lower() in ("1", "true", "yes")
+GROK_TIMEOUT = float(os.getenv("GROK_TIMEOUT", "60"))
+GROK_MAX_CONNECTIONS = int(os.getenv("GROK_MAX_CONNECTIONS", "20"))
+GROK_MAX_KEEPALIVE = int(os.getenv("GROK_MAX_KEEPALIVE", "10"))
+GROK_BACKOFF_BASE = float(os.getenv("GROK_BACKOFF_BASE", "0.5"))
+GROK_BACKOFF_MAX = float(os.getenv("GROK_BACKOFF_MAX", "8"))
+
+# --- AI dispatch ---
+# If Gemini hasn't answered within an endpoint's budget (seconds), Grok is
+# fired in parallel and the first valid response wins.
+AI_HEDGE_ENABLED = os.getenv("AI_HEDGE_ENABLED", "true").lower() in ("1", "true", "yes")
+_DEFAULT_HEDGE_BUDGETS = {
+    "chords": 12.0,
+    "backing-track": 8.0,
+    "rhythm": 5.0,
+    "melody": 5.0,
+    "improv": 5.0,
+    "lyrics": 8.0,
+    "practice-advice": 6.0,
+    "lesson": 15.0,
+}
+AI_HEDGE_BUDGETS = {
+    endpoint: float(os.getenv(f"AI_HEDGE_BUDGET_{endpoint.upper().replace('-', '_')}", default))
+    for endpoint, default in _DEFAULT_HEDGE_BUDGETS.items()
+}
+
+# Per-provider circuit breaker: trip when the error rate over the last
+# AI_BREAKER_WINDOW calls reaches the threshold, retry after the cool-down.
+AI_BREAKER_ERROR_THRESHOLD = float(os.getenv("AI_BREAKER_ERROR_THRESHOLD", "0.5"))
+AI_BREAKER_WINDOW = int(os.getenv("AI_BREAKER_WINDOW", "20"))
+AI_BREAKER_MIN_REQUESTS = int(os.getenv("AI_BREAKER_MIN_REQUESTS", "5"))
+AI_BREAKER_COOLDOWN = float(os.getenv("AI_BREAKER_COOLDOWN", "30"))
+
+# --- AI response cache ---
+AI_CACHE_TTL = float(os.getenv("AI_CACHE_TTL", "86400"))
+AI_CACHE_MAX_BYTES = int(os.getenv("AI_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+# Path to a sqlite file for a cache that survives restarts; empty keeps it in memory only
+AI_CACHE_PATH = os.getenv("AI_CACHE_PATH", "")
+AI_CACHE_DISABLED_ENDPOINTS = {
+    e.strip() for e in os.getenv("AI_CACHE_DISABLED_ENDPOINTS", "lyrics").split(",") if e.strip()
+}
+
+# --- Song arrangement catalog ---
+CATALOG_ENABLED = bool(DATABASE_URL) and os.getenv("CATALOG_ENABLED", "true").lower() in ("1", "true", "yes")
+# Bump when the arrangement prompt/schema changes so older entries get regenerated
+CATALOG_VERSION = int(os.getenv("CATALOG_VERSION", "1"))
+CATALOG_MAX_AGE_DAYS = float(os.getenv("CATALOG_MAX_AGE_DAYS", "90"))
+
+# --- Batch endpoint ---
+AI_BATCH_MAX_JOBS = int(os.getenv("AI_BATCH_MAX_JOBS", "16"))
+
+# --- Asynchronous AI jobs ---
+AI_JOB_WORKERS = int(os.getenv("AI_JOB_WORKERS", "4"))
+AI_JOB_QUEUE_SIZE = int(os.getenv("AI_JOB_QUEUE_SIZE", "200"))
+AI_JOB_MAX_ATTEMPTS = int(os.getenv("AI_JOB_MAX_ATTEMPTS", "3"))
+AI_JOB_TIMEOUT = float(os.getenv("AI_JOB_TIMEOUT", "300"))
+# Queued jobs not started within this many seconds expire unrun
+AI_JOB_QUEUE_TTL = float(os.getenv("AI_JOB_QUEUE_TTL", "900"))
+# Finished jobs (and their results) are purged after this many seconds
+AI_JOB_RESULT_TTL = float(os.getenv("AI_JOB_RESULT_TTL", "86400"))
+
+# --- Database ---
+# SQL statement logging (very noisy; for local debugging only)
+DB_ECHO = os.getenv("DB_ECHO", "false").lower() in ("1", "true", "yes")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# Connections older than this many seconds are replaced (server-side idle timeouts)
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+# --- Bulk ingest ---
+BULK_BATCH_SIZE = int(os.getenv("BULK_BATCH_SIZE", "1000"))
+BULK_MAX_ROWS = int(os.getenv("BULK_MAX_ROWS", "100000"))
+
+# --- Catalog search ---
+# "auto" uses pg_trgm/full-text indexes on PostgreSQL when the pg_trgm
+# extension is installed and an in-process index otherwise; "memory"
+# forces the in-process index
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "auto").lower()
+# Share of the query's trigrams a row must contain to count as a fuzzy match
+SEARCH_FUZZY_THRESHOLD = float(os.getenv("SEARCH_FUZZY_THRESHOLD", "0.5"))
+# The in-process index is rebuilt in the background when rows are
+# added/removed, or after this many seconds
+SEARCH_INDEX_TTL = float(os.getenv("SEARCH_INDEX_TTL", "300"))
+# How long (seconds) the row count/max id check is trusted before a search
+# re-runs it; writes through the API invalidate the index immediately
+SEARCH_SIGNATURE_TTL = float(os.getenv("SEARCH_SIGNATURE_TTL", "5"))
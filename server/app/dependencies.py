@@ -0,0 +1,104 @@
+# app/dependencies.py
+import json
+import base64
+import binascii
+import hmac
+from dataclasses import dataclass
+from typing import Optional
+from fastapi import Header, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import ADMIN_API_KEY
+from app.database import AsyncSessionLocal
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+# Dependency to get an async DB session (shared by all routers)
+async def get_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Guards the admin routers; there are no user accounts to authenticate yet
+def require_admin_key(x_api_key: Optional[str] = Header(None)):
+    if not ADMIN_API_KEY:
+        raise HTTPException(status_code=403, detail="Admin API is disabled (ADMIN_API_KEY not set)")
+    if not x_api_key or not hmac.compare_digest(x_api_key, ADMIN_API_KEY):
+        raise HTTPException(status_code=401, detail="Invalid or missing API key")
+
+
+# ---------------------------
+# Keyset pagination
+# ---------------------------
+
+@dataclass
+class PageParams:
+    cursor: Optional[str]
+    limit: int
+    fields: Optional[str]
+
+
+def page_params(
+    cursor: Optional[str] = Query(None, description="nextCursor from the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return"),
+) -> PageParams:
+    return PageParams(cursor=cursor, limit=limit, fields=fields)
+
+
+def encode_cursor(last_id: int) -> str:
+    raw = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        last_id = json.loads(raw)["id"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(last_id, int):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return last_id
+
+
+def _projection(model, fields: Optional[str], allowed: tuple):
+    if not fields:
+        names = list(allowed)
+    else:
+        names = [name.strip() for name in fields.split(",") if name.strip()]
+        unknown = [name for name in names if name not in allowed]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(allowed)}"
+            )
+    # The cursor is built from id, so it is always selected
+    if "id" not in names:
+        names.insert(0, "id")
+    return names, [getattr(model, name) for name in names]
+
+
+async def paginate(db: AsyncSession, model, page: PageParams, allowed_fields: tuple, filters=()) -> dict:
+    """One page of `model` rows ordered by primary key.
+
+    Seeks past the cursor with `id > last_id ... LIMIT n` instead of OFFSET,
+    so every page costs the same index range scan however deep it is, and
+    only the projected columns are loaded (no ORM objects). Only columns
+    in `allowed_fields` can be returned.
+    """
+    names, columns = _projection(model, page.fields, allowed_fields)
+    stmt = select(*columns).where(*filters).order_by(model.id).limit(page.limit + 1)
+    if page.cursor:
+        stmt = stmt.where(model.id > decode_cursor(page.cursor))
+
+    rows = (await db.execute(stmt)).all()
+    has_more = len(rows) > page.limit
+    rows = rows[:page.limit]
+    return {
+        "items": [dict(zip(names, row)) for row in rows],
+        "nextCursor": encode_cursor(rows[-1].id) if has_more else None,
+        "limit": page.limit,
+    }
@@ -1,6 +1,20 @@
-from fastapi import FastAPI
+import asyncio
+
+from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import ai
+from starlette.concurrency import run_in_threadpool
+from app.routers import ai, practice, songs, lessons, instruments, users, progressions, arrangements
+from app.api.providerLimiter import provider_limiters
+from app.api.circuitBreaker import provider_breakers
+from app.api.responseCache import response_cache
+from app.api.singleFlight import inflight_requests
+from app.api.catalogService import song_catalog
+from app.api.jobService import job_queue
+from app.api.chordVoicings import warm_voicing_table
+from app.api.geminiService import gemini_music_service
+from app.api.grokService import grok_service
+from app.database import async_engine
+from app.dependencies import require_admin_key
 
 app = FastAPI()
 
@@ -23,15 +37,46 @@ app.add_middleware(
 
 
 app.include_router(ai.router)
+# Catalog, user and practice data: requires the X-API-Key header
+admin = [Depends(require_admin_key)]
+app.include_router(practice.router, prefix="/practice", tags=["practice"], dependencies=admin)
+app.include_router(songs.router, prefix="/songs", tags=["songs"], dependencies=admin)
+app.include_router(lessons.router, prefix="/lessons", tags=["lessons"], dependencies=admin)
+app.include_router(instruments.router, prefix="/instruments", tags=["instruments"], dependencies=admin)
+app.include_router(users.router, prefix="/users", tags=["users"], dependencies=admin)
+app.include_router(progressions.router, prefix="/progressions", tags=["progressions"])
+app.include_router(arrangements.router, prefix="/arrangements", tags=["arrangements"])
+
+async def warm_voicings():
+    """Fill the chord voicing table off the startup path; diagrams are
+    searched on demand until it's ready."""
+    try:
+        shapes = await run_in_threadpool(warm_voicing_table)
+    except Exception as e:
+        print(f"❌ Chord voicing warm-up failed: {e}")
+        return
+    print(f"🎸 Chord voicing table ready ({shapes} shapes)")
 
 # --- YOUR PRINT STATEMENTS ---
 @app.on_event("startup")
 async def startup_event():
     print("🚀 FastAPI app is starting up...")
+    await grok_service.open()
+    gemini_music_service.start_readiness_probe()
+    await job_queue.start(ai.job_handlers)
+    app.state.voicing_warmup = asyncio.create_task(warm_voicings())
 
 @app.on_event("shutdown")
 async def shutdown_event():
     print("🛑 FastAPI app is shutting down...")
+    warmup = getattr(app.state, "voicing_warmup", None)
+    if warmup is not None:
+        warmup.cancel()
+    await job_queue.stop()
+    await gemini_music_service.stop_readiness_probe()
+    await grok_service.close()
+    if async_engine is not None:
+        await async_engine.dispose()
 
 @app.get("/")
 async def root():
@@ -39,7 +84,26 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "message": "API is running successfully"}
+    return {
+        "status": "healthy",
+        "message": "API is running successfully",
+        "providers": {
+            "gemini": {
+                **gemini_music_service.status(),
+                "concurrency": provider_limiters["gemini"].snapshot(),
+                "circuit": provider_breakers["gemini"].snapshot(),
+            },
+            "grok": {
+                "available": grok_service.available,
+                "concurrency": provider_limiters["grok"].snapshot(),
+                "circuit": provider_breakers["grok"].snapshot(),
+            },
+        },
+        "cache": response_cache.stats(),
+        "singleFlight": inflight_requests.stats(),
+        "catalog": song_catalog.stats(),
+        "jobs": job_queue.stats(),
+    }
 
 @app.get("/test-cors")
 async def test_cors():
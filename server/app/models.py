@@ -1,5 +1,5 @@
 # app/models.py
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Table, DateTime
+from sqlalchemy import Column, Integer, SmallInteger, String, Text, LargeBinary, ForeignKey, Table, DateTime, Date, UniqueConstraint, Index, event
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from app.database import Base
@@ -15,8 +15,8 @@ user_instruments_table = Table(
     "user_instruments",
     Base.metadata,
     Column("id", Integer, primary_key=True, index=True),
-    Column("user_id", Integer, ForeignKey("users.id")),
-    Column("instrument_id", Integer, ForeignKey("instruments.id")),
+    Column("user_id", Integer, ForeignKey("users.id"), index=True),
+    Column("instrument_id", Integer, ForeignKey("instruments.id"), index=True),
 )
 
 # ---------------------------
@@ -47,7 +47,7 @@ class Instrument(Base):
     __tablename__ = "instruments"
 
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String, nullable=False)
+    name = Column(String, unique=True, nullable=False)
     type = Column(String)
 
     users = relationship("User", secondary=user_instruments_table, back_populates="instruments")
@@ -60,6 +60,12 @@ class Instrument(Base):
 # ---------------------------
 class Lesson(Base):
     __tablename__ = "lessons"
+    # Filtered list endpoints seek on (filter, id)
+    __table_args__ = (
+        UniqueConstraint("title", "instrument_id", name="uq_lessons_title_instrument"),
+        Index("ix_lessons_instrument_id_id", "instrument_id", "id"),
+        Index("ix_lessons_difficulty_id", "difficulty", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
@@ -78,44 +84,105 @@ class Lesson(Base):
 # ---------------------------
 class Song(Base):
     __tablename__ = "songs"
+    __table_args__ = (
+        Index("ix_songs_genre_id", "genre", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
     artist = Column(String)
     genre = Column(String)
+    # Normalized "title artist" used to find catalog entries
+    lookup_key = Column(String, unique=True, index=True)
     created_at = Column(DateTime(timezone=True), default=utcnow)
 
     chord_progressions = relationship("ChordProgression", back_populates="song")
     practice_sessions = relationship("PracticeSession", back_populates="song")
     user_songs = relationship("UserSong", back_populates="song")
+    aliases = relationship("SongAlias", back_populates="song")
+
+# ---------------------------
+# Song Aliases (normalized search queries that resolved to a song)
+# ---------------------------
+class SongAlias(Base):
+    __tablename__ = "song_aliases"
+
+    id = Column(Integer, primary_key=True, index=True)
+    alias = Column(String, unique=True, index=True, nullable=False)
+    song_id = Column(Integer, ForeignKey("songs.id"), nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True), default=utcnow)
+
+    song = relationship("Song", back_populates="aliases")
 
 # ---------------------------
 # Chord Progressions
 # ---------------------------
 class ChordProgression(Base):
     __tablename__ = "chord_progressions"
+    # Per-user history is read newest first
+    __table_args__ = (
+        Index("ix_chord_progressions_user_id_created_at", "user_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
-    song_id = Column(Integer, ForeignKey("songs.id"), nullable=True)
-    instrument_id = Column(Integer, ForeignKey("instruments.id"))
+    song_id = Column(Integer, ForeignKey("songs.id"), nullable=True, index=True)
+    instrument_id = Column(Integer, ForeignKey("instruments.id"), index=True)
     progression = Column(Text)
+    # `progression` encoded by app.api.chordTheory: one byte per chord,
+    # relative to the (relative major) tonic pitch class
+    tonic = Column(SmallInteger)
+    degrees = Column(LargeBinary)
+    ngram_count = Column(Integer)
     skill_level = Column(String)
+    # Catalog entries: full FullSongArrangement JSON for an instrument/simplify variant
+    arrangement = Column(Text)
+    variant = Column(String, index=True)
+    version = Column(Integer)
+    refreshed_at = Column(DateTime(timezone=True))
     created_at = Column(DateTime(timezone=True), default=utcnow)
 
     user = relationship("User", back_populates="chord_progressions")
     song = relationship("Song", back_populates="chord_progressions")
     instrument = relationship("Instrument", back_populates="chord_progressions")
 
+
+@event.listens_for(ChordProgression, "before_insert")
+@event.listens_for(ChordProgression, "before_update")
+def _encode_chord_progression(mapper, connection, target):
+    from app.api.progressionIndex import encode_entry
+    encode_entry(target)
+
+
+@event.listens_for(ChordProgression, "after_insert")
+@event.listens_for(ChordProgression, "after_update")
+def _index_chord_progression(mapper, connection, target):
+    # Postings are written in the same transaction as the row
+    from app.api.progressionIndex import index_entry
+    index_entry(connection, target)
+
+# ---------------------------
+# Progression n-grams (inverted index: packed chord trigram -> progression)
+# ---------------------------
+class ProgressionNgram(Base):
+    __tablename__ = "progression_ngrams"
+
+    gram = Column(Integer, primary_key=True)
+    progression_id = Column(Integer, ForeignKey("chord_progressions.id", ondelete="CASCADE"),
+                            primary_key=True, index=True)
+
 # ---------------------------
 # Melodies
 # ---------------------------
 class Melody(Base):
     __tablename__ = "melodies"
+    __table_args__ = (
+        Index("ix_melodies_user_id_created_at", "user_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
-    instrument_id = Column(Integer, ForeignKey("instruments.id"))
+    instrument_id = Column(Integer, ForeignKey("instruments.id"), index=True)
     melody_data = Column(Text)
     created_at = Column(DateTime(timezone=True), default=utcnow)
 
@@ -127,11 +194,14 @@ class Melody(Base):
 # ---------------------------
 class PracticeSession(Base):
     __tablename__ = "practice_sessions"
+    __table_args__ = (
+        Index("ix_practice_sessions_user_id_created_at", "user_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
-    lesson_id = Column(Integer, ForeignKey("lessons.id"), nullable=True)
-    song_id = Column(Integer, ForeignKey("songs.id"), nullable=True)
+    lesson_id = Column(Integer, ForeignKey("lessons.id"), nullable=True, index=True)
+    song_id = Column(Integer, ForeignKey("songs.id"), nullable=True, index=True)
     duration_minutes = Column(Integer)
     feedback = Column(Text)
     created_at = Column(DateTime(timezone=True), default=utcnow)
@@ -140,15 +210,57 @@ class PracticeSession(Base):
     lesson = relationship("Lesson", back_populates="practice_sessions")
     song = relationship("Song", back_populates="practice_sessions")
 
+# ---------------------------
+# Practice Rollups (per user, UTC day, lesson and song)
+# ---------------------------
+class PracticeRollup(Base):
+    __tablename__ = "practice_rollups"
+    # lesson_id/song_id use 0 for "none" so the unique key can be upserted
+    # on every dialect (NULLs never conflict)
+    __table_args__ = (
+        UniqueConstraint("user_id", "day", "lesson_id", "song_id", name="uq_practice_rollups_key"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    day = Column(Date, nullable=False)
+    lesson_id = Column(Integer, nullable=False, default=0)
+    song_id = Column(Integer, nullable=False, default=0)
+    minutes = Column(Integer, nullable=False, default=0)
+    session_count = Column(Integer, nullable=False, default=0)
+
+
+# Same transaction as the session write, so the rollups never drift.
+# Bulk query.update()/delete() skip these; see rebuild_rollups.
+@event.listens_for(PracticeSession, "after_insert")
+def _update_practice_rollup(mapper, connection, target):
+    from app.api.practiceAnalytics import upsert_rollup
+    upsert_rollup(connection, target)
+
+
+@event.listens_for(PracticeSession, "before_update")
+def _move_practice_rollup(mapper, connection, target):
+    from app.api.practiceAnalytics import move_rollup
+    move_rollup(connection, target)
+
+
+@event.listens_for(PracticeSession, "before_delete")
+def _remove_practice_rollup(mapper, connection, target):
+    from app.api.practiceAnalytics import remove_rollup
+    remove_rollup(connection, target)
+
 # ---------------------------
 # User Songs
 # ---------------------------
 class UserSong(Base):
     __tablename__ = "user_songs"
+    __table_args__ = (
+        Index("ix_user_songs_user_id_created_at", "user_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
-    song_id = Column(Integer, ForeignKey("songs.id"))
+    song_id = Column(Integer, ForeignKey("songs.id"), index=True)
     created_at = Column(DateTime(timezone=True), default=utcnow)
 
     user = relationship("User", back_populates="user_songs")
@@ -161,10 +273,29 @@ class UserSettings(Base):
     __tablename__ = "user_settings"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
     tuning_reference = Column(String)
     preferred_metronome_tempo = Column(Integer)
     created_at = Column(DateTime(timezone=True), default=utcnow)
     updated_at = Column(DateTime(timezone=True), default=utcnow, onupdate=utcnow)
 
     user = relationship("User", back_populates="settings")
+
+# ---------------------------
+# AI Jobs (asynchronous generations)
+# ---------------------------
+class AIJob(Base):
+    __tablename__ = "ai_jobs"
+
+    id = Column(String(32), primary_key=True)
+    type = Column(String, nullable=False)
+    params = Column(Text, nullable=False)
+    status = Column(String, nullable=False, index=True)
+    priority = Column(Integer, nullable=False, default=5)
+    attempts = Column(Integer, nullable=False, default=0)
+    result = Column(Text)
+    error = Column(Text)
+    created_at = Column(DateTime(timezone=True), default=utcnow)
+    updated_at = Column(DateTime(timezone=True), default=utcnow, onupdate=utcnow)
+    finished_at = Column(DateTime(timezone=True))
+    expires_at = Column(DateTime(timezone=True), index=True)
@@ -1,7 +1,30 @@
 # server/app/routers/ai.py
-from fastapi import APIRouter, HTTPException
+import json
+import time
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Header, Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel, ValidationError
+from app.config import (
+    AI_HEDGE_ENABLED,
+    AI_HEDGE_BUDGETS,
+    AI_CACHE_DISABLED_ENDPOINTS,
+    AI_BATCH_MAX_JOBS,
+)
 from app.api.grokService import grok_service
 from app.api.geminiService import gemini_music_service
+from app.api.circuitBreaker import provider_breakers
+from app.api.providerLimiter import ProviderBusyError
+from app.api.responseCache import response_cache, cache_key
+from app.api.singleFlight import inflight_requests
+from app.api.catalogService import song_catalog
+from app.api.jsonStream import StreamingJSONScanner
+from app.api.practiceStats import summarize_sessions
+from app.api.chordVoicings import chord_diagrams
+from app.api.rhythmPatterns import rule_based_rhythm
+from app.api.jobService import job_queue, QueueFullError, TERMINAL_STATES
 from app.schemas import (
     ChordProgressionRequest,
     FullSongArrangement,
@@ -12,49 +35,366 @@ from app.schemas import (
     LyricsResult,
     PracticeAdviceResult,
     LessonResult,
+    BatchRequest,
+    BatchResult,
+    BatchItemResult,
+    BatchError,
+    JobSubmitRequest,
+    JobStatus,
 )
 
 router = APIRouter(prefix="/ai")
 
+# Which provider answered each endpoint and how long it took; used to tune
+# AI_HEDGE_BUDGETS.
+dispatch_stats = {}
+
+
+def _endpoint_stats(endpoint: str) -> dict:
+    return dispatch_stats.setdefault(endpoint, {
+        "requests": 0,
+        "hedged": 0,
+        "failures": 0,
+        # Replies that didn't parse or validate, per provider
+        "invalid": {"gemini": 0, "grok": 0},
+        "wins": {"gemini": 0, "grok": 0},
+        "totalLatency": {"gemini": 0.0, "grok": 0.0},
+    })
+
+
+def _record_invalid(endpoint: str, provider: str, error: Exception):
+    if isinstance(error, ValueError):
+        _endpoint_stats(endpoint)["invalid"][provider] += 1
+
+
+def _record_dispatch(endpoint: str, provider: str, elapsed: float, hedged: bool):
+    stats = _endpoint_stats(endpoint)
+    stats["requests"] += 1
+    if hedged:
+        stats["hedged"] += 1
+    if provider is None:
+        stats["failures"] += 1
+        return
+    stats["wins"][provider] += 1
+    stats["totalLatency"][provider] += elapsed
+
+
+def _validate(result_model, data):
+    if isinstance(data, result_model):
+        return data
+    if isinstance(data, BaseModel):
+        data = data.model_dump()
+    return result_model.model_validate(data)
+
+
+async def _call_provider(name, func, result_model, *args):
+    """Only transport/HTTP/timeout errors count against the provider's
+    circuit. A reply that doesn't parse or validate is an endpoint problem
+    (the provider answered), so it mustn't cut off its other endpoints."""
+    breaker = provider_breakers[name]
+    print(f"→ Trying {name.title()}...")
+    called_at = time.monotonic()
+    try:
+        data = await func(*args)
+    except asyncio.CancelledError:
+        breaker.release(called_at)
+        raise
+    except (ValueError, ProviderBusyError):
+        # Raised by the services for empty/unparseable replies, or when the
+        # call was shed before reaching the provider
+        breaker.release(called_at)
+        raise
+    except Exception:
+        breaker.record_failure(called_at)
+        raise
+    breaker.record_success(called_at)
+    return name, _validate(result_model, data)
+
+
+async def _try_gemini_first(endpoint, result_model, gemini_func, grok_func, *args):
+    """Gemini first; if it hasn't answered within the endpoint's hedge budget
+    (or fails), race Grok against it and keep the first valid response.
+    Providers whose circuit is open are skipped entirely."""
+    started = time.monotonic()
+    budget = AI_HEDGE_BUDGETS.get(endpoint) if AI_HEDGE_ENABLED else None
+    pending = set()
+    hedged = False
 
-async def _try_gemini_first(gemini_func, grok_func, *args):
-    if gemini_music_service.available:
-        try:
-            print("→ Trying Gemini...")
-            return await gemini_func(*args)
-        except Exception as ge:
-            print(f"⚠ Gemini failed: {ge}")
-
-    print("→ Switching to Grok...")
     try:
-        return await grok_func(*args)
-    except Exception as e:
-        print(f"❌ Grok also failed: {e}")
-        raise HTTPException(status_code=503, detail="All AI systems are currently unavailable")
+        if gemini_music_service.available and provider_breakers["gemini"].allow():
+            gemini_task = asyncio.create_task(
+                _call_provider("gemini", gemini_func, result_model, *args),
+                name="gemini"
+            )
+            pending.add(gemini_task)
+            done, pending = await asyncio.wait(pending, timeout=budget)
+            if gemini_task in done:
+                if gemini_task.exception() is None:
+                    _record_dispatch(endpoint, "gemini", time.monotonic() - started, hedged)
+                    return gemini_task.result()[1]
+                _record_invalid(endpoint, "gemini", gemini_task.exception())
+                print(f"⚠ Gemini failed: {gemini_task.exception()}")
+            else:
+                hedged = True
+                print(f"⏱ Gemini exceeded {budget}s budget for /{endpoint} — hedging with Grok")
+
+        if provider_breakers["grok"].allow():
+            if not hedged:
+                print("→ Switching to Grok...")
+            pending.add(asyncio.create_task(
+                _call_provider("grok", grok_func, result_model, *args),
+                name="grok"
+            ))
+
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    provider, result = task.result()
+                    _record_dispatch(endpoint, provider, time.monotonic() - started, hedged)
+                    return result
+                _record_invalid(endpoint, task.get_name(), task.exception())
+                print(f"❌ {task.get_name().title()} failed: {task.exception()}")
+    finally:
+        for task in pending:
+            task.cancel()
+
+    _record_dispatch(endpoint, None, time.monotonic() - started, hedged)
+    raise HTTPException(status_code=503, detail="All AI systems are currently unavailable")
+
+
+async def _cached_dispatch(endpoint, result_model, params, cache_control,
+                           gemini_func, grok_func, *args, after_fetch=None):
+    """Serve from the response cache when possible, otherwise dispatch and
+    store. `Cache-Control: no-cache` skips the lookup but refreshes the entry.
+    Identical requests already in flight share a single upstream call, and
+    `after_fetch` runs once per upstream result."""
+    cacheable = endpoint not in AI_CACHE_DISABLED_ENDPOINTS
+    key = cache_key(endpoint, params)
+
+    if cacheable and "no-cache" not in (cache_control or "").lower():
+        cached = await response_cache.get(key)
+        if cached is not None:
+            return result_model.model_validate(cached)
+
+    async def fetch():
+        result = await _try_gemini_first(endpoint, result_model, gemini_func, grok_func, *args)
+        if cacheable:
+            await response_cache.set(key, result.model_dump())
+        if after_fetch is not None:
+            await after_fetch(result)
+        return result
+
+    return await inflight_requests.do(key, fetch)
+
+
+# ---------------- STREAMING ---------------- #
+
+# Top-level fields surfaced as they complete: arrays emit one event per
+# element, strings emit their text as it is written.
+_STREAM_ITEMS = {"tablature": "section"}
+_STREAM_TEXT = {"lesson": "chunk"}
+
+
+def _stream_format(http_request: Optional[Request], stream: Optional[str]):
+    if stream in ("sse", "ndjson"):
+        return stream
+    if http_request is None:
+        return None
+    accept = http_request.headers.get("accept", "")
+    if "text/event-stream" in accept:
+        return "sse"
+    if "application/x-ndjson" in accept:
+        return "ndjson"
+    return None
+
+
+def _encode_event(fmt: str, event: str, data) -> str:
+    if fmt == "sse":
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+    return json.dumps({"event": event, "data": data}) + "\n"
+
+
+def _stream_generation(fmt, endpoint, result_model, params, cache_control,
+                       providers, cached=None, after_fetch=None, prepare=None):
+    """Stream partial content from the first provider that can serve it,
+    ending with a `result` event carrying the validated object. `prepare`
+    adds locally computed fields to the result (after it is cached).
+
+    `providers` is a list of (name, open_stream) where open_stream() returns
+    an async iterator of raw text chunks. If a provider fails after emitting
+    partial content, a `reset` event tells the client to discard it before
+    the next provider starts."""
+    cacheable = endpoint not in AI_CACHE_DISABLED_ENDPOINTS
+    key = cache_key(endpoint, params)
+
+    async def events():
+        nonlocal cached
+        if cached is None and cacheable and "no-cache" not in (cache_control or "").lower():
+            cached = await response_cache.get(key)
+        if cached is not None:
+            yield _encode_event(fmt, "result", prepare(cached) if prepare else cached)
+            return
+
+        started = time.monotonic()
+        for name, open_stream in providers:
+            if name == "gemini" and not gemini_music_service.available:
+                continue
+            breaker = provider_breakers[name]
+            if not breaker.allow():
+                continue
+
+            print(f"→ Streaming from {name.title()}...")
+            called_at = time.monotonic()
+            yield _encode_event(fmt, "start", {"provider": name})
+            scanner = StreamingJSONScanner(item_keys=_STREAM_ITEMS, text_keys=_STREAM_TEXT)
+            emitted = False
+            try:
+                async for chunk in open_stream():
+                    for kind, field, value in scanner.feed(chunk):
+                        if kind == "item":
+                            yield _encode_event(fmt, _STREAM_ITEMS[field], value)
+                        else:
+                            yield _encode_event(fmt, _STREAM_TEXT[field], {"text": value})
+                        emitted = True
+                result = _validate(result_model, scanner.result())
+            except asyncio.CancelledError:
+                breaker.release(called_at)
+                raise
+            except Exception as e:
+                # As in _call_provider: a malformed reply isn't a provider outage
+                if isinstance(e, ValueError):
+                    breaker.release(called_at)
+                    _record_invalid(endpoint, name, e)
+                elif isinstance(e, ProviderBusyError):
+                    breaker.release(called_at)
+                else:
+                    breaker.record_failure(called_at)
+                print(f"⚠ {name.title()} stream failed: {e}")
+                if emitted:
+                    yield _encode_event(fmt, "reset", {"provider": name, "reason": str(e)})
+                continue
+
+            breaker.record_success(called_at)
+            _record_dispatch(endpoint, name, time.monotonic() - started, False)
+            if cacheable:
+                await response_cache.set(key, result.model_dump())
+            if after_fetch is not None:
+                await after_fetch(result)
+            data = result.model_dump()
+            yield _encode_event(fmt, "result", prepare(data) if prepare else data)
+            return
+
+        _record_dispatch(endpoint, None, time.monotonic() - started, False)
+        yield _encode_event(fmt, "error", {
+            "status": 503,
+            "detail": "All AI systems are currently unavailable",
+        })
+
+    return _event_stream_response(fmt, events())
+
+
+def _event_stream_response(fmt: str, events) -> StreamingResponse:
+    media_type = "text/event-stream" if fmt == "sse" else "application/x-ndjson"
+    return StreamingResponse(
+        events,
+        media_type=media_type,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/stats")
+async def get_dispatch_stats():
+    return dispatch_stats
 
 
 # ---------------- ROUTES ---------------- #
 
+def _with_chord_diagrams(arrangement: dict, instrument: str) -> dict:
+    """Diagrams come from the local voicing table, not the model."""
+    arrangement["chordDiagrams"] = chord_diagrams(
+        arrangement.get("progressionSummary"), instrument,
+        arrangement.get("tuning"), arrangement.get("capoFret") or 0,
+    )
+    return arrangement
+
+
 @router.post("/chords", response_model=FullSongArrangement)
-async def generate_song_arrangement(request: ChordProgressionRequest):
+async def generate_song_arrangement(
+    request: ChordProgressionRequest,
+    http_request: Request,
+    stream: Optional[str] = None,
+    cache_control: Optional[str] = Header(None),
+):
+    fmt = _stream_format(http_request, stream)
+
     async def gemini_call(req):
         return await gemini_music_service.generateSongArrangement(req)
 
-    return await _try_gemini_first(
-        gemini_call,
-        grok_service.generate_song_arrangement,
-        request
-    )
+    async def store_in_catalog(result):
+        await song_catalog.save(request, result.model_dump())
+
+    async def dispatch(cc):
+        return await _cached_dispatch(
+            "chords",
+            FullSongArrangement,
+            request.model_dump(),
+            cc,
+            gemini_call,
+            grok_service.generate_song_arrangement,
+            request,
+            after_fetch=store_in_catalog
+        )
+
+    def stream_response(cached=None):
+        return _stream_generation(
+            fmt,
+            "chords",
+            FullSongArrangement,
+            request.model_dump(),
+            cache_control,
+            [
+                ("gemini", lambda: gemini_music_service.stream_song_arrangement(request)),
+                ("grok", lambda: grok_service.stream_song_arrangement(request)),
+            ],
+            cached=cached,
+            after_fetch=store_in_catalog,
+            prepare=lambda data: _with_chord_diagrams(data, request.instrument)
+        )
+
+    def with_diagrams(arrangement: FullSongArrangement) -> FullSongArrangement:
+        return FullSongArrangement.model_validate(
+            _with_chord_diagrams(arrangement.model_dump(), request.instrument)
+        )
+
+    if "no-cache" not in (cache_control or "").lower():
+        entry = await song_catalog.lookup(request)
+        if entry is not None:
+            arrangement, stale = entry
+            if stale:
+                song_catalog.schedule_refresh(request, lambda: dispatch("no-cache"))
+            arrangement = FullSongArrangement.model_validate(arrangement)
+            if fmt:
+                return stream_response(cached=arrangement.model_dump())
+            return with_diagrams(arrangement)
+
+    if fmt:
+        return stream_response()
+    return with_diagrams(await dispatch(cache_control))
 
 
 @router.post("/backing-track", response_model=BackingTrackResult)
-async def generate_backing_track(data: dict):
+async def generate_backing_track(data: dict, cache_control: Optional[str] = Header(None)):
     prompt = data["prompt"]
 
     async def gemini_call(p):
         return await gemini_music_service.generate_backing_track(p)
 
-    return await _try_gemini_first(
+    return await _cached_dispatch(
+        "backing-track",
+        BackingTrackResult,
+        {"prompt": prompt},
+        cache_control,
         gemini_call,
         grok_service.generate_backing_track,
         prompt
@@ -62,22 +402,42 @@ async def generate_backing_track(data: dict):
 
 
 @router.post("/rhythm", response_model=RhythmPatternResult)
-async def generate_rhythm(data: dict):
+async def generate_rhythm(data: dict, cache_control: Optional[str] = Header(None)):
     time_sig = data["timeSignature"]
     level = data["level"]
-
-    async def gemini_call(ts, lvl):
-        return await gemini_music_service.generate_rhythm_pattern(ts, lvl)
-
-    return await _try_gemini_first(
+    style = data.get("style")
+    # "auto": local patterns first, the model only for what they don't cover;
+    # "rules" never calls a model, "ai" always does
+    generator = data.get("generator", "auto")
+    if generator not in ("auto", "rules", "ai"):
+        raise HTTPException(status_code=400, detail="generator must be auto, rules or ai")
+
+    if generator != "ai":
+        local = rule_based_rhythm(time_sig, level, style)
+        if local is not None:
+            return RhythmPatternResult.model_validate(local)
+        if generator == "rules":
+            raise HTTPException(status_code=400, detail=f"No built-in pattern for {level} {time_sig}")
+
+    async def gemini_call(ts, lvl, st):
+        return await gemini_music_service.generate_rhythm_pattern(ts, lvl, st)
+
+    params = {"timeSignature": time_sig, "level": level}
+    if style:
+        params["style"] = style
+    return await _cached_dispatch(
+        "rhythm",
+        RhythmPatternResult,
+        params,
+        cache_control,
         gemini_call,
         grok_service.generate_rhythm_pattern,
-        time_sig, level
+        time_sig, level, style
     )
 
 
 @router.post("/melody", response_model=MelodySuggestionResult)
-async def generate_melody(data: dict):
+async def generate_melody(data: dict, cache_control: Optional[str] = Header(None)):
     key = data["key"]
     style = data["style"]
 
@@ -85,7 +445,11 @@ async def generate_melody(data: dict):
         result = await gemini_music_service.generate_melody(k, s)
         return MelodySuggestionResult(**result)
 
-    return await _try_gemini_first(
+    return await _cached_dispatch(
+        "melody",
+        MelodySuggestionResult,
+        {"key": key, "style": style},
+        cache_control,
         gemini_call,
         grok_service.generate_melody,
         key, style
@@ -93,14 +457,18 @@ async def generate_melody(data: dict):
 
 
 @router.post("/improv", response_model=ImprovTipsResult)
-async def get_improv_tips(data: dict):
+async def get_improv_tips(data: dict, cache_control: Optional[str] = Header(None)):
     query = data["query"]
 
     async def gemini_call(q):
         result = await gemini_music_service.generate_improv_tips(q)
         return ImprovTipsResult(**result)
 
-    return await _try_gemini_first(
+    return await _cached_dispatch(
+        "improv",
+        ImprovTipsResult,
+        {"query": query},
+        cache_control,
         gemini_call,
         grok_service.generate_improv_tips,
         query
@@ -108,7 +476,7 @@ async def get_improv_tips(data: dict):
 
 
 @router.post("/lyrics", response_model=LyricsResult)
-async def generate_lyrics(data: dict):
+async def generate_lyrics(data: dict, cache_control: Optional[str] = Header(None)):
     topic = data["topic"]
     genre = data["genre"]
     mood = data["mood"]
@@ -117,7 +485,11 @@ async def generate_lyrics(data: dict):
         result = await gemini_music_service.generate_lyrics(t, g, m)
         return LyricsResult(**result)
 
-    return await _try_gemini_first(
+    return await _cached_dispatch(
+        "lyrics",
+        LyricsResult,
+        {"topic": topic, "genre": genre, "mood": mood},
+        cache_control,
         gemini_call,
         grok_service.generate_lyrics,
         topic, genre, mood
@@ -125,32 +497,189 @@ async def generate_lyrics(data: dict):
 
 
 @router.post("/practice-advice", response_model=PracticeAdviceResult)
-async def get_practice_advice(data: dict):
-    sessions = data["sessions"]
+async def get_practice_advice(data: dict, cache_control: Optional[str] = Header(None)):
+    # Prompts (and cache keys) use a fixed-size summary, not the raw history
+    stats = await run_in_threadpool(summarize_sessions, data["sessions"])
 
     async def gemini_call(s):
         result = await gemini_music_service.get_practice_advice(s)
         return PracticeAdviceResult(**result)
 
-    return await _try_gemini_first(
+    return await _cached_dispatch(
+        "practice-advice",
+        PracticeAdviceResult,
+        {"stats": stats},
+        cache_control,
         gemini_call,
         grok_service.get_practice_advice,
-        sessions
+        stats
     )
 
 
 @router.post("/lesson", response_model=LessonResult)
-async def generate_lesson(data: dict):
+async def generate_lesson(
+    data: dict,
+    http_request: Request,
+    stream: Optional[str] = None,
+    cache_control: Optional[str] = Header(None),
+):
     skill = data["skill_level"]
     instrument = data["instrument"]
     focus = data["focus"]
 
+    fmt = _stream_format(http_request, stream)
+    if fmt:
+        return _stream_generation(
+            fmt,
+            "lesson",
+            LessonResult,
+            {"skill_level": skill, "instrument": instrument, "focus": focus},
+            cache_control,
+            [
+                ("gemini", lambda: gemini_music_service.stream_lesson(skill, instrument, focus)),
+                ("grok", lambda: grok_service.stream_lesson(skill, instrument, focus)),
+            ]
+        )
+
     async def gemini_call(sk, inst, f):
         result = await gemini_music_service.generate_lesson(sk, inst, f)
         return LessonResult(**result)
 
-    return await _try_gemini_first(
+    return await _cached_dispatch(
+        "lesson",
+        LessonResult,
+        {"skill_level": skill, "instrument": instrument, "focus": focus},
+        cache_control,
         gemini_call,
         grok_service.generate_lesson,
         skill, instrument, focus
     )
+
+
+# ---------------- BATCH ---------------- #
+
+# Each job type takes the same params as its single endpoint's JSON body.
+# Shared by /ai/batch and the asynchronous job workers.
+job_handlers = {
+    "chords": lambda params, cc: generate_song_arrangement(
+        ChordProgressionRequest(**params), None, None, cc
+    ),
+    "backing-track": generate_backing_track,
+    "rhythm": generate_rhythm,
+    "melody": generate_melody,
+    "improv": get_improv_tips,
+    "lyrics": generate_lyrics,
+    "practice-advice": get_practice_advice,
+    "lesson": lambda params, cc: generate_lesson(params, None, None, cc),
+}
+
+
+async def _run_batch_job(index, job, cache_control) -> BatchItemResult:
+    item = {"id": job.id or str(index), "type": job.type}
+    handler = job_handlers.get(job.type)
+    if handler is None:
+        error = BatchError(status=422, detail=f"Unknown job type: {job.type}")
+        return BatchItemResult(**item, ok=False, error=error)
+    try:
+        result = await handler(job.params, cache_control)
+        return BatchItemResult(**item, ok=True, result=result.model_dump())
+    except HTTPException as e:
+        error = BatchError(status=e.status_code, detail=e.detail)
+    except KeyError as e:
+        error = BatchError(status=422, detail=f"Missing field: {e.args[0]}")
+    except ValidationError as e:
+        error = BatchError(status=422, detail=e.errors(include_url=False, include_context=False))
+    except Exception as e:
+        error = BatchError(status=500, detail=str(e))
+    return BatchItemResult(**item, ok=False, error=error)
+
+
+@router.post("/batch", response_model=BatchResult)
+async def run_batch(
+    batch: BatchRequest,
+    http_request: Request,
+    stream: Optional[str] = None,
+    cache_control: Optional[str] = Header(None),
+):
+    """Run several AI jobs concurrently. Upstream calls are still scheduled
+    through each provider's concurrency and rate limits."""
+    if len(batch.jobs) > AI_BATCH_MAX_JOBS:
+        raise HTTPException(status_code=413, detail=f"A batch may contain at most {AI_BATCH_MAX_JOBS} jobs")
+
+    fmt = _stream_format(http_request, stream)
+    if not fmt:
+        results = await asyncio.gather(*(
+            _run_batch_job(i, job, cache_control) for i, job in enumerate(batch.jobs)
+        ))
+        return BatchResult(results=results)
+
+    async def events():
+        tasks = [
+            asyncio.create_task(_run_batch_job(i, job, cache_control))
+            for i, job in enumerate(batch.jobs)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                item = await next_done
+                yield _encode_event(fmt, "item", item.model_dump())
+            yield _encode_event(fmt, "done", {"count": len(tasks)})
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    return _event_stream_response(fmt, events())
+
+
+# ---------------- ASYNC JOBS ---------------- #
+
+@router.post("/jobs", status_code=202, response_model=JobStatus)
+async def submit_job(job: JobSubmitRequest, response: Response):
+    """Queue a long-running generation; poll GET /ai/jobs/{id} or stream
+    GET /ai/jobs/{id}/events for the result."""
+    if not job_queue.enabled:
+        raise HTTPException(status_code=503, detail="Async jobs require a configured database")
+    try:
+        status = await job_queue.submit(job.type, job.params, job.priority)
+    except QueueFullError:
+        raise HTTPException(
+            status_code=429,
+            detail="Job queue is full, retry later",
+            headers={"Retry-After": "30"}
+        )
+    response.headers["Location"] = f"/ai/jobs/{status['id']}"
+    return status
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str):
+    if not job_queue.enabled:
+        raise HTTPException(status_code=503, detail="Async jobs require a configured database")
+    status = await job_queue.get(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return status
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job(job_id: str, http_request: Request, stream: Optional[str] = None):
+    """Completion stream: a `status` event on every change, ending with the
+    final job state."""
+    status = await get_job(job_id)
+    fmt = _stream_format(http_request, stream) or "sse"
+
+    async def events():
+        last = None
+        current = status
+        while True:
+            payload = JobStatus(**current).model_dump(mode="json")
+            if payload["status"] != last or payload["status"] in TERMINAL_STATES:
+                yield _encode_event(fmt, "status", payload)
+                last = payload["status"]
+            if payload["status"] in TERMINAL_STATES:
+                return
+            current = await job_queue.wait(job_id, timeout=15)
+            if current is None:
+                yield _encode_event(fmt, "error", {"status": 404, "detail": "Job not found"})
+                return
+
+    return _event_stream_response(fmt, events())
@@ -0,0 +1,24 @@
+import json
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dependencies import get_db
+from app.models import ChordProgression
+from app.schemas import FullSongArrangement, TransposeRequest
+from app.api.arrangementTranspose import transpose_arrangement
+
+router = APIRouter()
+
+# Change key and/or capo of an arrangement locally, without another /ai/chords call
+@router.post("/transpose", response_model=FullSongArrangement)
+async def transpose(request: TransposeRequest, db: AsyncSession = Depends(get_db)):
+    if request.arrangement is not None:
+        arrangement = request.arrangement.model_dump()
+    else:
+        entry = await db.get(ChordProgression, request.catalogId)
+        if entry is None or not entry.arrangement:
+            raise HTTPException(status_code=404, detail="Arrangement not found")
+        arrangement = FullSongArrangement.model_validate(json.loads(entry.arrangement)).model_dump()
+    try:
+        return transpose_arrangement(arrangement, request.key, request.capoFret)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -1,27 +1,50 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Query
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dependencies import get_db, page_params, PageParams, paginate
+from app.api.bulkIngest import BulkSpec, bulk_upsert, read_rows
 from app.models import Instrument
+from app.schemas import InstrumentCreate, BulkResult
 
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+INSTRUMENT_FIELDS = ("id", "name", "type")
 
-# List all instruments
+# List instruments (keyset-paginated)
 @router.get("/")
-def list_instruments(db: Session = Depends(get_db)):
-    return db.query(Instrument).all()
+async def list_instruments(
+    type: Optional[str] = None,
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_db),
+):
+    filters = [Instrument.type == type] if type is not None else []
+    return await paginate(db, Instrument, page, INSTRUMENT_FIELDS, filters)
 
 # Create instrument
 @router.post("/")
-def create_instrument(name: str, type: str = None, db: Session = Depends(get_db)):
+async def create_instrument(name: str, type: str = None, db: AsyncSession = Depends(get_db)):
     instrument = Instrument(name=name, type=type)
     db.add(instrument)
-    db.commit()
-    db.refresh(instrument)
+    try:
+        await db.commit()
+    except IntegrityError:
+        raise HTTPException(status_code=409, detail="Instrument already exists")
+    await db.refresh(instrument)
     return instrument
+
+# Instruments are matched on name
+INSTRUMENTS_BULK = BulkSpec(
+    model=Instrument,
+    schema=InstrumentCreate,
+    key_columns=("name",),
+)
+
+# Bulk create/update from a JSON array or an NDJSON stream
+@router.post("/bulk", response_model=BulkResult)
+async def bulk_instruments(
+    request: Request,
+    on_conflict: Literal["update", "skip"] = Query("update"),
+    db: AsyncSession = Depends(get_db),
+):
+    return await bulk_upsert(db, INSTRUMENTS_BULK, read_rows(request), on_conflict)
@@ -1,27 +1,109 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.database import SessionLocal
-from app.models import Lesson
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Query
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload, raiseload
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dependencies import get_db, page_params, PageParams, paginate
+from app.api.bulkIngest import BulkSpec, bulk_upsert, read_rows
+from app.api.catalogSearch import SearchSpec, catalog_search
+from app.models import Lesson, Instrument
+from app.schemas import LessonDetail, LessonCreate, BulkResult
 
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+LESSON_FIELDS = ("id", "title", "lesson_type", "instrument_id", "difficulty", "content", "created_at", "updated_at")
 
-# List all lessons
+# List lessons (keyset-paginated)
 @router.get("/")
-def list_lessons(db: Session = Depends(get_db)):
-    return db.query(Lesson).all()
+async def list_lessons(
+    instrument_id: Optional[int] = None,
+    difficulty: Optional[str] = None,
+    lesson_type: Optional[str] = None,
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_db),
+):
+    filters = []
+    if instrument_id is not None:
+        filters.append(Lesson.instrument_id == instrument_id)
+    if difficulty is not None:
+        filters.append(Lesson.difficulty == difficulty)
+    if lesson_type is not None:
+        filters.append(Lesson.lesson_type == lesson_type)
+    return await paginate(db, Lesson, page, LESSON_FIELDS, filters)
+
+LESSONS_SEARCH = SearchSpec(
+    model=Lesson,
+    fields=("id", "title", "lesson_type", "instrument_id", "difficulty"),
+    fuzzy_columns=("title",),
+    text_columns=("title", "content"),
+    ts_config="english",
+)
+
+# Ranked search: typo-tolerant on title, full-text over title and content
+# (declared before /{lesson_id} so "search" isn't taken for an id)
+@router.get("/search")
+async def search_lessons(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+):
+    return await catalog_search.search(db, LESSONS_SEARCH, q, limit)
+
+# Title autocomplete
+@router.get("/autocomplete")
+async def autocomplete_lessons(
+    prefix: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_db),
+):
+    return await catalog_search.complete(db, LESSONS_SEARCH, prefix, limit)
+
+# Lesson with its instrument (many-to-one, joined into the same query)
+@router.get("/{lesson_id}", response_model=LessonDetail)
+async def get_lesson(lesson_id: int, db: AsyncSession = Depends(get_db)):
+    result = await db.execute(
+        select(Lesson)
+        .options(joinedload(Lesson.instrument), raiseload("*"))
+        .where(Lesson.id == lesson_id)
+    )
+    lesson = result.scalar_one_or_none()
+    if lesson is None:
+        raise HTTPException(status_code=404, detail="Lesson not found")
+    return LessonDetail.model_validate(lesson)
 
 # Create lesson
 @router.post("/")
-def create_lesson(title: str, lesson_type: str, instrument_id: int, difficulty: str = None, content: str = None, db: Session = Depends(get_db)):
+async def create_lesson(title: str, lesson_type: str, instrument_id: int, difficulty: str = None, content: str = None, db: AsyncSession = Depends(get_db)):
+    # Checked up front so a bad reference is a 404, not a duplicate (409)
+    if await db.get(Instrument, instrument_id) is None:
+        raise HTTPException(status_code=404, detail="Instrument not found")
     lesson = Lesson(title=title, lesson_type=lesson_type, instrument_id=instrument_id, difficulty=difficulty, content=content)
     db.add(lesson)
-    db.commit()
-    db.refresh(lesson)
+    try:
+        await db.commit()
+    except IntegrityError:
+        raise HTTPException(status_code=409, detail="Lesson already exists")
+    catalog_search.invalidate(LESSONS_SEARCH)
+    await db.refresh(lesson)
     return lesson
+
+# Lessons are matched on (title, instrument_id)
+LESSONS_BULK = BulkSpec(
+    model=Lesson,
+    schema=LessonCreate,
+    key_columns=("title", "instrument_id"),
+    references={"instrument_id": Instrument},
+)
+
+# Bulk create/update from a JSON array or an NDJSON stream
+@router.post("/bulk", response_model=BulkResult)
+async def bulk_lessons(
+    request: Request,
+    on_conflict: Literal["update", "skip"] = Query("update"),
+    db: AsyncSession = Depends(get_db),
+):
+    result = await bulk_upsert(db, LESSONS_BULK, read_rows(request), on_conflict)
+    if result["inserted"] or result["updated"]:
+        catalog_search.invalidate(LESSONS_SEARCH)
+    return result
@@ -0,0 +1,38 @@
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dependencies import get_db
+from app.models import PracticeSession, User, Lesson, Song
+from app.schemas import PracticeSessionCreate, PracticeSessionOut, PracticeAnalytics
+from app.api.practiceAnalytics import user_analytics
+
+router = APIRouter()
+
+# Log a practice session (its daily rollup is updated in the same transaction)
+@router.post("/sessions", response_model=PracticeSessionOut, status_code=201)
+async def log_session(data: PracticeSessionCreate, db: AsyncSession = Depends(get_db)):
+    # Checked up front so a bad reference is a 404, not an IntegrityError
+    for model, row_id, name in ((User, data.user_id, "User"), (Lesson, data.lesson_id, "Lesson"),
+                                (Song, data.song_id, "Song")):
+        if row_id is not None and await db.get(model, row_id) is None:
+            raise HTTPException(status_code=404, detail=f"{name} not found")
+    session = PracticeSession(**data.model_dump())
+    db.add(session)
+    await db.commit()
+    await db.refresh(session)
+    return session
+
+# Minutes, streaks, breakdowns and rolling averages over the last `days` days
+@router.get("/users/{user_id}/analytics", response_model=PracticeAnalytics)
+async def practice_analytics(
+    user_id: int,
+    days: int = Query(30, ge=1, le=365),
+    today: Optional[date] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    if await db.get(User, user_id) is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    # The aggregation code is shared with sync callers; run it on the
+    # session's connection without blocking the event loop
+    return await db.run_sync(user_analytics, user_id, days=days, today=today)
@@ -0,0 +1,42 @@
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dependencies import get_db
+from app.schemas import ParsedProgression, ProgressionSearchResult
+from app.api.chordTheory import parse_progression
+from app.api.progressionIndex import find_similar, find_containing
+
+router = APIRouter()
+
+
+def _parse(q: str, key: Optional[str]):
+    try:
+        encoded = parse_progression(q, key, strict=True)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if encoded is None:
+        raise HTTPException(status_code=400, detail="No chords in progression")
+    return encoded
+
+
+def _parsed(encoded) -> dict:
+    return {"key": encoded.key, "numerals": encoded.numerals(), "degrees": list(encoded.codes)}
+
+# Chord names ("C G Am F") or numerals ("I-V-vi-IV") -> key-relative numerals
+@router.get("/parse", response_model=ParsedProgression)
+async def parse(q: str = Query(..., max_length=500), key: Optional[str] = None):
+    return _parsed(_parse(q, key))
+
+# Stored progressions similar to (or containing) a progression, best first
+@router.get("/search", response_model=ProgressionSearchResult)
+async def search_progressions(
+    q: str = Query(..., max_length=500),
+    key: Optional[str] = None,
+    mode: Literal["similar", "contains"] = "similar",
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+):
+    encoded = _parse(q, key)
+    finder = find_similar if mode == "similar" else find_containing
+    items = await db.run_sync(finder, encoded, limit)
+    return {"query": _parsed(encoded), "mode": mode, "items": items}
@@ -1,27 +1,91 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Query
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dependencies import get_db, page_params, PageParams, paginate
+from app.api.bulkIngest import BulkSpec, bulk_upsert, read_rows
 from app.models import Song
+from app.schemas import SongCreate, BulkResult
+from app.api.catalogService import normalize_lookup_key
+from app.api.catalogSearch import SearchSpec, catalog_search
 
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+SONG_FIELDS = ("id", "title", "artist", "genre", "created_at")
+
+
+def song_lookup_key(title: str, artist: str = None) -> str:
+    return normalize_lookup_key(f"{title} {artist or ''}")
 
-# List all songs
+# List songs (keyset-paginated)
 @router.get("/")
-def list_songs(db: Session = Depends(get_db)):
-    return db.query(Song).all()
+async def list_songs(
+    genre: Optional[str] = None,
+    artist: Optional[str] = None,
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_db),
+):
+    filters = []
+    if genre is not None:
+        filters.append(Song.genre == genre)
+    if artist is not None:
+        filters.append(Song.artist == artist)
+    return await paginate(db, Song, page, SONG_FIELDS, filters)
+
+SONGS_SEARCH = SearchSpec(
+    model=Song,
+    fields=("id", "title", "artist", "genre"),
+    fuzzy_columns=("title", "artist", "genre"),
+    text_columns=("title", "artist", "genre"),
+)
+
+# Typo-tolerant ranked search over title, artist and genre
+@router.get("/search")
+async def search_songs(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+):
+    return await catalog_search.search(db, SONGS_SEARCH, q, limit)
+
+# Title autocomplete
+@router.get("/autocomplete")
+async def autocomplete_songs(
+    prefix: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_db),
+):
+    return await catalog_search.complete(db, SONGS_SEARCH, prefix, limit)
 
 # Create song
 @router.post("/")
-def create_song(title: str, artist: str = None, genre: str = None, db: Session = Depends(get_db)):
-    song = Song(title=title, artist=artist, genre=genre)
+async def create_song(title: str, artist: str = None, genre: str = None, db: AsyncSession = Depends(get_db)):
+    song = Song(title=title, artist=artist, genre=genre, lookup_key=song_lookup_key(title, artist))
     db.add(song)
-    db.commit()
-    db.refresh(song)
+    try:
+        await db.commit()
+    except IntegrityError:
+        raise HTTPException(status_code=409, detail="Song already exists")
+    catalog_search.invalidate(SONGS_SEARCH)
+    await db.refresh(song)
     return song
+
+# Songs are matched on their normalized "title artist" lookup_key
+SONGS_BULK = BulkSpec(
+    model=Song,
+    schema=SongCreate,
+    key_columns=("lookup_key",),
+    derive=lambda values: {"lookup_key": song_lookup_key(values["title"], values["artist"])},
+)
+
+# Bulk create/update from a JSON array or an NDJSON stream
+@router.post("/bulk", response_model=BulkResult)
+async def bulk_songs(
+    request: Request,
+    on_conflict: Literal["update", "skip"] = Query("update"),
+    db: AsyncSession = Depends(get_db),
+):
+    result = await bulk_upsert(db, SONGS_BULK, read_rows(request), on_conflict)
+    if result["inserted"] or result["updated"]:
+        catalog_search.invalidate(SONGS_SEARCH)
+    return result
@@ -1,28 +1,63 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.database import SessionLocal
-from app.models import User
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload, selectinload, load_only, raiseload
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dependencies import get_db, page_params, PageParams, paginate
+from app.models import User, UserSong, ChordProgression
+from app.schemas import UserProfile
 
 router = APIRouter()
 
-# Dependency to get DB session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+# Never includes password
+USER_FIELDS = ("id", "name", "email", "skill_level", "created_at", "updated_at")
 
-# Get all users
+# List users (keyset-paginated)
 @router.get("/")
-def list_users(db: Session = Depends(get_db)):
-    return db.query(User).all()
+async def list_users(
+    skill_level: Optional[str] = None,
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_db),
+):
+    filters = [User.skill_level == skill_level] if skill_level is not None else []
+    return await paginate(db, User, page, USER_FIELDS, filters)
+
+# Each relationship the profile serializes is loaded up front: the
+# one-to-one settings row joins into the main query, collections come from
+# one SELECT ... IN per relationship. Anything else raises instead of
+# lazy-loading, so the query count is fixed however many rows a user has.
+PROFILE_LOAD_OPTIONS = (
+    joinedload(User.settings),
+    selectinload(User.instruments),
+    selectinload(User.chord_progressions).load_only(
+        ChordProgression.id,
+        ChordProgression.song_id,
+        ChordProgression.instrument_id,
+        ChordProgression.progression,
+        ChordProgression.skill_level,
+        ChordProgression.created_at,
+    ),
+    selectinload(User.melodies),
+    selectinload(User.user_songs).joinedload(UserSong.song),
+    raiseload("*"),
+)
+
+# User profile with instruments, settings and saved content
+@router.get("/{user_id}", response_model=UserProfile)
+async def get_user_profile(user_id: int, db: AsyncSession = Depends(get_db)):
+    result = await db.execute(
+        select(User).options(*PROFILE_LOAD_OPTIONS).where(User.id == user_id)
+    )
+    user = result.unique().scalar_one_or_none()
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return UserProfile.model_validate(user)
 
 # Create user
 @router.post("/")
-def create_user(name: str, email: str, skill_level: str = None, db: Session = Depends(get_db)):
+async def create_user(name: str, email: str, skill_level: str = None, db: AsyncSession = Depends(get_db)):
     user = User(name=name, email=email, skill_level=skill_level, password="changeme")
     db.add(user)
-    db.commit()
-    db.refresh(user)
-    return user
+    await db.commit()
+    await db.refresh(user)
+    return {field: getattr(user, field) for field in USER_FIELDS}
@@ -1,6 +1,7 @@
 # server/app/schemas.py
-from pydantic import BaseModel, Field
-from typing import List, Optional, Union, Literal
+from pydantic import BaseModel, Field, field_validator, model_validator
+from datetime import date, datetime
+from typing import Any, List, Optional, Union, Literal
 
 # --- Tablature ---
 class TabLine(BaseModel):
@@ -16,9 +17,20 @@ FretValue = Union[int, Literal["X"]]
 
 class ChordDiagram(BaseModel):
     chord: str
+    # Lowest string first, counted from the capo; MIDI note numbers for Piano
     frets: List[FretValue]
+    # 0 open, None muted (or the left-hand bass note on Piano)
     fingers: List[Optional[int]]
     capoFret: int = 0
+    notes: List[str] = Field(default_factory=list)
+
+    @field_validator("frets", mode="before")
+    @classmethod
+    def _muted_strings(cls, frets):
+        # Older cached/catalog entries (and some models) write muted strings as -1 or "x"
+        if not isinstance(frets, list):
+            return frets
+        return ["X" if f == "x" or (isinstance(f, int) and f < 0) else f for f in frets]
 
 # --- Core ---
 class Substitution(BaseModel):
@@ -46,6 +58,21 @@ class FullSongArrangement(BaseModel):
     substitutions: List[Substitution] = Field(default_factory=list)
     practiceTips: List[str] = Field(default_factory=list)
 
+class TransposeRequest(BaseModel):
+    # Exactly one source: an arrangement, or a song catalog entry's id
+    arrangement: Optional[FullSongArrangement] = None
+    catalogId: Optional[int] = None
+    key: Optional[str] = None
+    capoFret: Optional[int] = Field(None, ge=0, le=9)
+
+    @model_validator(mode="after")
+    def _source_and_target(self):
+        if (self.arrangement is None) == (self.catalogId is None):
+            raise ValueError("Give either arrangement or catalogId")
+        if self.key is None and self.capoFret is None:
+            raise ValueError("Give a target key or capoFret")
+        return self
+
 # --- Backing Track ---
 class BackingTrackStep(BaseModel):
     beat: int
@@ -105,3 +132,225 @@ class LessonResult(BaseModel):
     lesson: str
     duration: str
     goals: List[str]
+
+# --- Batch ---
+AIJobType = Literal[
+    "chords", "backing-track", "rhythm", "melody",
+    "improv", "lyrics", "practice-advice", "lesson",
+]
+
+class BatchJob(BaseModel):
+    id: Optional[str] = None
+    type: AIJobType
+    params: dict
+
+class BatchRequest(BaseModel):
+    jobs: List[BatchJob]
+
+class BatchError(BaseModel):
+    status: int
+    detail: Any
+
+class BatchItemResult(BaseModel):
+    id: Optional[str] = None
+    type: str
+    ok: bool
+    result: Optional[dict] = None
+    error: Optional[BatchError] = None
+
+class BatchResult(BaseModel):
+    results: List[BatchItemResult]
+
+# --- Async Jobs ---
+class JobSubmitRequest(BaseModel):
+    type: AIJobType
+    params: dict
+    priority: int = Field(5, ge=0, le=9)
+
+class JobStatus(BaseModel):
+    id: str
+    type: str
+    status: Literal["queued", "running", "succeeded", "failed", "expired"]
+    priority: int
+    attempts: int
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    createdAt: Optional[datetime] = None
+    finishedAt: Optional[datetime] = None
+    expiresAt: Optional[datetime] = None
+
+# --- Practice Analytics ---
+class PracticeSessionCreate(BaseModel):
+    user_id: int
+    duration_minutes: int = Field(..., ge=0)
+    lesson_id: Optional[int] = None
+    song_id: Optional[int] = None
+    feedback: Optional[str] = None
+
+class PracticeSessionOut(PracticeSessionCreate):
+    id: int
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
+
+class DailyPractice(BaseModel):
+    day: date
+    minutes: int
+    sessions: int
+    rolling7: float
+    rolling30: float
+
+class WeeklyPractice(BaseModel):
+    weekStart: date
+    minutes: int
+    sessions: int
+
+class PracticeBreakdownItem(BaseModel):
+    id: int
+    title: Optional[str] = None
+    minutes: int
+    sessions: int
+
+class PracticeAnalytics(BaseModel):
+    userId: int
+    days: int
+    totalMinutes: int
+    totalSessions: int
+    windowMinutes: int
+    windowSessions: int
+    avgDailyMinutes: float
+    avgSessionMinutes: float
+    currentStreak: int
+    longestStreak: int
+    daily: List[DailyPractice]
+    weekly: List[WeeklyPractice]
+    byLesson: List[PracticeBreakdownItem]
+    bySong: List[PracticeBreakdownItem]
+
+# --- Users & Lessons (DB read models) ---
+class InstrumentOut(BaseModel):
+    id: int
+    name: str
+    type: Optional[str] = None
+
+    model_config = {"from_attributes": True}
+
+class SongSummary(BaseModel):
+    id: int
+    title: str
+    artist: Optional[str] = None
+    genre: Optional[str] = None
+
+    model_config = {"from_attributes": True}
+
+class UserSettingsOut(BaseModel):
+    tuning_reference: Optional[str] = None
+    preferred_metronome_tempo: Optional[int] = None
+    updated_at: Optional[datetime] = None
+
+    model_config = {"from_attributes": True}
+
+class ChordProgressionSummary(BaseModel):
+    id: int
+    song_id: Optional[int] = None
+    instrument_id: Optional[int] = None
+    progression: Optional[str] = None
+    skill_level: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+    model_config = {"from_attributes": True}
+
+class MelodyOut(BaseModel):
+    id: int
+    instrument_id: Optional[int] = None
+    melody_data: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+    model_config = {"from_attributes": True}
+
+class UserSongOut(BaseModel):
+    id: int
+    song: SongSummary
+    created_at: Optional[datetime] = None
+
+    model_config = {"from_attributes": True}
+
+class UserProfile(BaseModel):
+    id: int
+    name: str
+    email: str
+    skill_level: Optional[str] = None
+    created_at: Optional[datetime] = None
+    settings: Optional[UserSettingsOut] = None
+    instruments: List[InstrumentOut] = Field(default_factory=list)
+    chord_progressions: List[ChordProgressionSummary] = Field(default_factory=list)
+    melodies: List[MelodyOut] = Field(default_factory=list)
+    user_songs: List[UserSongOut] = Field(default_factory=list)
+
+    model_config = {"from_attributes": True}
+
+class LessonDetail(BaseModel):
+    id: int
+    title: str
+    lesson_type: Optional[str] = None
+    difficulty: Optional[str] = None
+    content: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    instrument: Optional[InstrumentOut] = None
+
+    model_config = {"from_attributes": True}
+
+# --- Bulk ingest ---
+class SongCreate(BaseModel):
+    title: str = Field(..., min_length=1)
+    artist: Optional[str] = None
+    genre: Optional[str] = None
+
+class LessonCreate(BaseModel):
+    title: str = Field(..., min_length=1)
+    lesson_type: str
+    instrument_id: int
+    difficulty: Optional[str] = None
+    content: Optional[str] = None
+
+class InstrumentCreate(BaseModel):
+    name: str = Field(..., min_length=1)
+    type: Optional[str] = None
+
+class BulkRowStatus(BaseModel):
+    index: int
+    status: Literal["inserted", "updated", "skipped", "error"]
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+class BulkResult(BaseModel):
+    inserted: int
+    updated: int
+    skipped: int
+    failed: int
+    # An NDJSON body went past BULK_MAX_ROWS: rows up to the limit were
+    # loaded (see results) and the rest were not read
+    truncated: bool = False
+    results: List[BulkRowStatus]
+
+# --- Chord progression index ---
+class ParsedProgression(BaseModel):
+    key: str
+    numerals: List[str]
+    degrees: List[int]
+
+class ProgressionMatch(BaseModel):
+    id: int
+    songId: Optional[int] = None
+    songTitle: Optional[str] = None
+    artist: Optional[str] = None
+    progression: Optional[str] = None
+    key: str
+    numerals: List[str]
+    score: float
+
+class ProgressionSearchResult(BaseModel):
+    query: ParsedProgression
+    mode: Literal["similar", "contains"]
+    items: List[ProgressionMatch]
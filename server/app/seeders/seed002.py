@@ -0,0 +1,325 @@
+# app/seeders/seed002.py
+"""Synthetic load-test data on top of seed001's catalog.
+
+Generates users, lessons, songs, chord progressions, melodies, practice
+sessions and user songs at configurable volume from a fixed random seed,
+so every run with the same arguments produces the same data (timestamps
+are relative to the time of the run). Popularity and activity are
+power-law distributed. A few songs, lessons and users account for most of
+the traffic, as in production.
+
+Rows are generated and written in chunks: COPY on PostgreSQL, batched
+executemany elsewhere.
+
+    python -m app.seeders.seed002 --preset medium --seed 42
+    python -m app.seeders.seed002 --preset large --practice-sessions 10000000
+"""
+import io
+import csv
+import time
+import argparse
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+from sqlalchemy import select, func, text
+
+from app.database import SessionLocal, engine, Base
+from app.models import (
+    User, Instrument, Lesson, Song, ChordProgression,
+    Melody, PracticeSession, UserSong, UserSettings, user_instruments_table,
+)
+from app.api.catalogService import normalize_lookup_key
+from app.api.practiceAnalytics import rebuild_rollups
+from app.api.progressionIndex import rebuild_progression_index
+
+CHUNK_SIZE = 20_000
+
+PRESETS = {
+    "small": dict(users=1_000, songs=2_000, lessons=300, chord_progressions=5_000,
+                  melodies=2_000, practice_sessions=50_000, user_songs=10_000),
+    "medium": dict(users=20_000, songs=50_000, lessons=2_000, chord_progressions=100_000,
+                   melodies=40_000, practice_sessions=1_000_000, user_songs=200_000),
+    "large": dict(users=200_000, songs=500_000, lessons=10_000, chord_progressions=1_000_000,
+                  melodies=400_000, practice_sessions=10_000_000, user_songs=2_000_000),
+}
+
+# Vocabulary shared with seed001
+INSTRUMENTS = [("Piano", "Keyboard"), ("Guitar", "String"), ("Drums", "Percussion"),
+               ("Ukulele", "String"), ("Bass", "String"), ("Violin", "String")]
+SKILL_LEVELS = ["Beginner", "Intermediate", "Advanced"]
+SKILL_WEIGHTS = [0.55, 0.35, 0.10]
+LESSON_TYPES = ["Theory", "Practice", "Technique", "Song"]
+GENRES = ["Pop", "Rock", "Jazz", "Blues", "Folk", "Country", "R&B", "Metal", "Classical", "Reggae"]
+GENRE_WEIGHTS = [0.28, 0.24, 0.08, 0.07, 0.08, 0.07, 0.08, 0.04, 0.03, 0.03]
+WORDS = ["love", "night", "river", "fire", "heart", "road", "summer", "rain", "blue", "home",
+         "dream", "light", "wild", "gold", "moon", "city", "dance", "shadow", "stone", "sky"]
+PROGRESSIONS = ["C G Am F", "G D Em C", "Am F C G", "D A Bm G", "E B C#m A",
+                "C Am F G", "Dm G C Am", "A D E A", "Em C G D", "F C Dm Bb"]
+NOTES = ["C", "D", "E", "F", "G", "A", "B"]
+FEEDBACK = [None, None, "Good progress!", "Needs improvement on chords", "Timing is tighter",
+            "Struggled with the bridge", "Clean changes at 80 BPM"]
+
+
+def zipf_weights(rng, n: int, exponent: float) -> np.ndarray:
+    """Power-law weights over n items, with ranks shuffled so popularity
+    does not correlate with id."""
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    rng.shuffle(weights)
+    return weights / weights.sum()
+
+
+class TableWriter:
+    """Streams row chunks into a table inside one transaction."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.copy = conn.dialect.name == "postgresql"
+
+    def write(self, table, columns: list, chunk: list):
+        if not chunk:
+            return
+        if self.copy:
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows(
+                [None if v is None else (v.isoformat() if isinstance(v, datetime) else v) for v in row]
+                for row in chunk
+            )
+            buffer.seek(0)
+            cursor = self.conn.connection.cursor()
+            try:
+                cursor.copy_expert(
+                    f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer
+                )
+            finally:
+                cursor.close()
+        else:
+            self.conn.execute(table.insert(), [dict(zip(columns, row)) for row in chunk])
+
+
+class SyntheticSeeder:
+    def __init__(self, seed: int, counts: dict, history_days: int):
+        self.rng = np.random.default_rng(seed)
+        self.counts = counts
+        self.history_days = history_days
+        self.now = datetime.now(timezone.utc).replace(microsecond=0)
+
+    # ---------------------------
+    # Helpers
+    # ---------------------------
+
+    def _next_id(self, conn, model) -> int:
+        return (conn.execute(select(func.coalesce(func.max(model.id), 0))).scalar() or 0) + 1
+
+    def _timestamps(self, size: int, recency: float = 2.0) -> list:
+        # recency > 1 skews towards the present
+        seconds = (self.rng.random(size) ** recency * self.history_days * 86400).astype(np.int64)
+        return [self.now - timedelta(seconds=int(s)) for s in seconds]
+
+    def _stream(self, writer, label: str, table, columns: list, total: int, make_chunk):
+        started = time.perf_counter()
+        for offset in range(0, total, CHUNK_SIZE):
+            size = min(CHUNK_SIZE, total - offset)
+            writer.write(table, columns, make_chunk(offset, size))
+        elapsed = time.perf_counter() - started
+        print(f"✅ {label}: {total:,} rows in {elapsed:.1f}s ({total / max(elapsed, 1e-9):,.0f} rows/s)")
+
+    # ---------------------------
+    # Entities
+    # ---------------------------
+
+    def instruments(self, conn) -> np.ndarray:
+        existing = {name for (name,) in conn.execute(select(Instrument.name))}
+        missing = [{"name": n, "type": t} for n, t in INSTRUMENTS if n not in existing]
+        if missing:
+            conn.execute(Instrument.__table__.insert(), missing)
+        return np.array(conn.execute(select(Instrument.id).order_by(Instrument.id)).scalars().all())
+
+    def users(self, writer, conn, instrument_ids):
+        n = self.counts["users"]
+        first = self._next_id(conn, User)
+        rng = self.rng
+
+        def chunk(offset, size):
+            ids = np.arange(first + offset, first + offset + size)
+            skills = rng.choice(SKILL_LEVELS, size=size, p=SKILL_WEIGHTS)
+            created = self._timestamps(size, recency=1.0)
+            return [(int(i), f"User {i}", f"user{i}@loadtest.example", "changeme", str(s), c, c)
+                    for i, s, c in zip(ids, skills, created)]
+
+        self._stream(writer, "Users", User.__table__,
+                     ["id", "name", "email", "password", "skill_level", "created_at", "updated_at"], n, chunk)
+
+        def settings_chunk(offset, size):
+            tempos = np.clip(rng.normal(100, 20, size), 40, 220).astype(int)
+            tunings = rng.choice(["A440", "A442", "A432"], size=size, p=[0.9, 0.07, 0.03])
+            return [(first + offset + i, str(t), int(b), self.now, self.now)
+                    for i, (t, b) in enumerate(zip(tunings, tempos))]
+
+        self._stream(writer, "User settings", UserSettings.__table__,
+                     ["user_id", "tuning_reference", "preferred_metronome_tempo", "created_at", "updated_at"],
+                     n, settings_chunk)
+
+        def instruments_chunk(offset, size):
+            per_user = rng.choice([1, 2, 3], size=size, p=[0.6, 0.3, 0.1])
+            rows = []
+            for i, k in enumerate(per_user):
+                for instrument_id in rng.choice(instrument_ids, size=k, replace=False):
+                    rows.append((first + offset + i, int(instrument_id)))
+            return rows
+
+        self._stream(writer, "User instruments", user_instruments_table,
+                     ["user_id", "instrument_id"], n, instruments_chunk)
+        return np.arange(first, first + n)
+
+    def lessons(self, writer, conn, instrument_ids):
+        n = self.counts["lessons"]
+        first = self._next_id(conn, Lesson)
+        rng = self.rng
+
+        def chunk(offset, size):
+            ids = np.arange(first + offset, first + offset + size)
+            instruments = rng.choice(instrument_ids, size=size)
+            kinds = rng.choice(LESSON_TYPES, size=size)
+            levels = rng.choice(SKILL_LEVELS, size=size, p=SKILL_WEIGHTS)
+            created = self._timestamps(size, recency=1.0)
+            return [(int(i), f"{k} lesson {i}", str(k), int(inst), str(lvl), f"Synthetic {k.lower()} lesson", c, c)
+                    for i, inst, k, lvl, c in zip(ids, instruments, kinds, levels, created)]
+
+        self._stream(writer, "Lessons", Lesson.__table__,
+                     ["id", "title", "lesson_type", "instrument_id", "difficulty", "content",
+                      "created_at", "updated_at"], n, chunk)
+        return np.arange(first, first + n)
+
+    def songs(self, writer, conn):
+        n = self.counts["songs"]
+        first = self._next_id(conn, Song)
+        rng = self.rng
+        artists = max(1, n // 12)
+
+        def chunk(offset, size):
+            ids = np.arange(first + offset, first + offset + size)
+            words = rng.choice(WORDS, size=(size, 2))
+            artist_ids = rng.zipf(1.6, size) % artists
+            genres = rng.choice(GENRES, size=size, p=GENRE_WEIGHTS)
+            created = self._timestamps(size, recency=1.0)
+            rows = []
+            for i, (w1, w2), a, g, c in zip(ids, words, artist_ids, genres, created):
+                title = f"{w1.title()} {w2.title()} {i}"
+                artist = f"Artist {a}"
+                rows.append((int(i), title, artist, str(g), normalize_lookup_key(f"{title} {artist}"), c))
+            return rows
+
+        self._stream(writer, "Songs", Song.__table__,
+                     ["id", "title", "artist", "genre", "lookup_key", "created_at"], n, chunk)
+        return np.arange(first, first + n)
+
+    def activity(self, user_ids, song_ids, lesson_ids, writer, instrument_ids):
+        rng = self.rng
+        user_p = zipf_weights(rng, len(user_ids), 1.1)
+        song_p = zipf_weights(rng, len(song_ids), 1.2)
+        lesson_p = zipf_weights(rng, len(lesson_ids), 1.0)
+
+        def progressions_chunk(offset, size):
+            users = rng.choice(user_ids, size=size, p=user_p)
+            songs = rng.choice(song_ids, size=size, p=song_p)
+            instruments = rng.choice(instrument_ids, size=size)
+            progressions = rng.choice(PROGRESSIONS, size=size)
+            levels = rng.choice(SKILL_LEVELS, size=size, p=SKILL_WEIGHTS)
+            created = self._timestamps(size)
+            return [(int(u), int(s), int(i), str(p), str(lvl), c)
+                    for u, s, i, p, lvl, c in zip(users, songs, instruments, progressions, levels, created)]
+
+        self._stream(writer, "Chord progressions", ChordProgression.__table__,
+                     ["user_id", "song_id", "instrument_id", "progression", "skill_level", "created_at"],
+                     self.counts["chord_progressions"], progressions_chunk)
+
+        def melodies_chunk(offset, size):
+            users = rng.choice(user_ids, size=size, p=user_p)
+            instruments = rng.choice(instrument_ids, size=size)
+            notes = rng.choice(NOTES, size=(size, 8))
+            created = self._timestamps(size)
+            return [(int(u), int(i), " ".join(n), c) for u, i, n, c in zip(users, instruments, notes, created)]
+
+        self._stream(writer, "Melodies", Melody.__table__,
+                     ["user_id", "instrument_id", "melody_data", "created_at"],
+                     self.counts["melodies"], melodies_chunk)
+
+        def sessions_chunk(offset, size):
+            users = rng.choice(user_ids, size=size, p=user_p)
+            on_lesson = rng.random(size) < 0.45
+            lessons = rng.choice(lesson_ids, size=size, p=lesson_p)
+            songs = rng.choice(song_ids, size=size, p=song_p)
+            minutes = np.clip(rng.lognormal(np.log(25), 0.6, size), 5, 180).astype(int)
+            feedback = rng.choice(len(FEEDBACK), size=size)
+            created = self._timestamps(size)
+            return [(int(u), int(l) if is_lesson else None, None if is_lesson else int(s), int(m), FEEDBACK[f], c)
+                    for u, is_lesson, l, s, m, f, c in zip(users, on_lesson, lessons, songs, minutes, feedback, created)]
+
+        self._stream(writer, "Practice sessions", PracticeSession.__table__,
+                     ["user_id", "lesson_id", "song_id", "duration_minutes", "feedback", "created_at"],
+                     self.counts["practice_sessions"], sessions_chunk)
+
+        def user_songs_chunk(offset, size):
+            users = rng.choice(user_ids, size=size, p=user_p)
+            songs = rng.choice(song_ids, size=size, p=song_p)
+            created = self._timestamps(size)
+            return [(int(u), int(s), c) for u, s, c in zip(users, songs, created)]
+
+        self._stream(writer, "User songs", UserSong.__table__,
+                     ["user_id", "song_id", "created_at"], self.counts["user_songs"], user_songs_chunk)
+
+    # ---------------------------
+    # Run
+    # ---------------------------
+
+    def run(self):
+        Base.metadata.create_all(bind=engine)
+        started = time.perf_counter()
+        with engine.begin() as conn:
+            writer = TableWriter(conn)
+            instrument_ids = self.instruments(conn)
+            user_ids = self.users(writer, conn, instrument_ids)
+            lesson_ids = self.lessons(writer, conn, instrument_ids)
+            song_ids = self.songs(writer, conn)
+            self.activity(user_ids, song_ids, lesson_ids, writer, instrument_ids)
+
+            if conn.dialect.name == "postgresql":
+                # Explicit ids were written; move the sequences past them
+                for table in ("users", "lessons", "songs"):
+                    conn.execute(text(
+                        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT MAX(id) FROM {table}))"
+                    ))
+
+        # COPY/executemany bypass the ORM hooks that maintain rollups and
+        # the progression index
+        db = SessionLocal()
+        try:
+            rollups = rebuild_rollups(db)
+            print(f"✅ Practice rollups rebuilt ({rollups:,} rows)")
+            encoded = rebuild_progression_index(db)
+            print(f"✅ Chord progressions indexed ({encoded:,} rows)")
+        finally:
+            db.close()
+        print(f"🎉 Synthetic seeding complete in {time.perf_counter() - started:.1f}s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic load-test data")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="small")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--history-days", type=int, default=730)
+    for name in PRESETS["small"]:
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, dest=name,
+                            help=f"override the preset's {name.replace('_', ' ')} count")
+    args = parser.parse_args(argv)
+
+    counts = dict(PRESETS[args.preset])
+    counts.update({name: getattr(args, name) for name in counts if getattr(args, name) is not None})
+    if engine is None:
+        raise SystemExit("❌ DATABASE_URL is not set")
+    print(f"🌱 Seeding {args.preset} preset with seed {args.seed}: {counts}")
+    SyntheticSeeder(args.seed, counts, args.history_days).run()
+
+
+if __name__ == "__main__":
+    main()
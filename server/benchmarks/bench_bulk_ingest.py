@@ -0,0 +1,55 @@
+# benchmarks/bench_bulk_ingest.py
+"""Benchmark: POST /songs/bulk throughput (rows/sec) for NDJSON bodies, both
+fresh inserts and an update pass over the same rows, end to end through
+the app (parsing, validation, batched upserts, commits).
+
+Uses a throwaway SQLite database. Run from the server directory:
+    python -m benchmarks.bench_bulk_ingest [max_rows]
+"""
+import os
+import sys
+import json
+import tempfile
+import time
+
+# Must be configured before app.database builds its engines
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+os.environ["ADMIN_API_KEY"] = "bench"
+
+from fastapi.testclient import TestClient
+
+from app.database import Base, engine
+from app.main import app
+
+GENRES = ["rock", "pop", "folk", "jazz", "blues"]
+
+
+def ndjson(count: int, genre_offset: int = 0) -> bytes:
+    return "\n".join(
+        json.dumps({"title": f"Song {i}", "artist": f"Artist {i % 997}", "genre": GENRES[(i + genre_offset) % 5]})
+        for i in range(count)
+    ).encode()
+
+
+def post(client: TestClient, body: bytes) -> float:
+    started = time.perf_counter()
+    response = client.post("/songs/bulk", content=body, headers={"Content-Type": "application/x-ndjson"})
+    elapsed = time.perf_counter() - started
+    assert response.status_code == 200 and not response.json()["failed"], response.text[:200]
+    return elapsed
+
+
+def main():
+    max_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    client = TestClient(app, headers={"X-API-Key": "bench"})
+    print(f"{'rows':>8} {'insert rows/s':>14} {'update rows/s':>14}")
+    for count in (n for n in (1_000, 10_000, 100_000) if n <= max_rows):
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        inserted = post(client, ndjson(count))
+        updated = post(client, ndjson(count, genre_offset=1))
+        print(f"{count:>8} {count / inserted:>14,.0f} {count / updated:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
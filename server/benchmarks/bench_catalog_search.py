@@ -0,0 +1,61 @@
+# benchmarks/bench_catalog_search.py
+"""Benchmark: in-process catalog search index (the SQLite / no-pg_trgm
+fallback) as the songs table grows. Rows are synthetic and never touch a
+database. Run from the server directory:
+    python -m benchmarks.bench_catalog_search [max_rows]
+"""
+import sys
+import time
+import random
+import timeit
+
+from app.models import Song
+from app.api.catalogSearch import MemoryIndex, SearchSpec, SEARCH_FUZZY_THRESHOLD
+
+SPEC = SearchSpec(
+    model=Song,
+    fields=("id", "title", "artist", "genre"),
+    fuzzy_columns=("title", "artist", "genre"),
+    text_columns=("title", "artist", "genre"),
+)
+SYLLABLES = ["ka", "lo", "mi", "ra", "sen", "tu", "vor", "el", "dan", "qui", "bel", "ston", "ar", "io", "wen"]
+GENRES = ["rock", "pop", "folk", "jazz", "blues", "country", "metal", "soul", "reggae", "classical"]
+QUERIES = ["wonderwal oasis", "halleluja", "kalo mira", "jazz", "ston", "leonard cohen"]
+
+
+def word(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+
+def make_rows(count: int, rng: random.Random) -> list:
+    rows = [
+        (i, " ".join(word(rng) for _ in range(rng.randint(1, 4))).title(),
+         f"{word(rng)} {word(rng)}".title(), rng.choice(GENRES))
+        for i in range(1, count + 1)
+    ]
+    rows[count // 2] = (count // 2 + 1, "Wonderwall", "Oasis", "britpop")
+    rows[count // 3] = (count // 3 + 1, "Hallelujah", "Leonard Cohen", "folk")
+    return rows
+
+
+def best_of(func_, repeat: int = 5) -> float:
+    return min(timeit.repeat(func_, number=1, repeat=repeat)) * 1000
+
+
+def main():
+    max_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(7)
+    print(f"{'rows':>10} {'build s':>8} {'worst search ms':>16} {'complete ms':>12}")
+    for count in (n for n in (10_000, 100_000, 1_000_000) if n <= max_rows):
+        rows = make_rows(count, rng)
+        started = time.perf_counter()
+        index = MemoryIndex(SPEC, rows, (count, count))
+        build = time.perf_counter() - started
+        search_ms = max(best_of(lambda: index.search(q, 20, SEARCH_FUZZY_THRESHOLD)) for q in QUERIES)
+        complete_ms = best_of(lambda: index.complete("ka", 10))
+        assert index.search("wonderwal oasis", 20, SEARCH_FUZZY_THRESHOLD)[0][0][1] == "Wonderwall"
+        print(f"{count:>10} {build:>8.1f} {search_ms:>16.2f} {complete_ms:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
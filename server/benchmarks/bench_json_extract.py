@@ -0,0 +1,114 @@
+# benchmarks/bench_json_extract.py
+"""Micro-benchmark: shared JSON extractor vs the regexes it replaced.
+
+Run from the server directory:
+    python -m benchmarks.bench_json_extract
+"""
+import re
+import json
+import random
+import timeit
+
+from app.api.jsonStream import extract_json, StreamingJSONScanner
+
+_GROK_REGEX = re.compile(r"\{(?:[^{}]|(?:\{[^{}]*\}))*\}", re.DOTALL)
+_GEMINI_REGEX = re.compile(r"\{.*\}", re.DOTALL)
+
+
+def legacy_grok_extract(text):
+    match = _GROK_REGEX.search(text)
+    if not match:
+        return None
+    try:
+        return json.loads(match.group(0))
+    except json.JSONDecodeError:
+        return None
+
+
+def legacy_gemini_extract(text):
+    match = _GEMINI_REGEX.search(text)
+    if not match:
+        return None
+    try:
+        return json.loads(match.group(0))
+    except json.JSONDecodeError:
+        return None
+
+
+def make_arrangement(sections: int, rng: random.Random) -> dict:
+    chords = ["C", "G", "Am", "F", "Em7", "Dsus4", "A7sus4", "Bb"]
+    words = "fly me to the moon and let me play among the stars { brace } \"quoted\"".split()
+    return {
+        "songTitle": "Benchmark Song",
+        "artist": "The Testers",
+        "key": "C Major",
+        "instrument": "Guitar",
+        "tuning": "E A D G B E",
+        "progressionSummary": chords[:4],
+        "tablature": [
+            {
+                "section": f"Verse {i + 1}",
+                "lines": [
+                    line
+                    for _ in range(4)
+                    for line in (
+                        {"lyrics": "   ".join(rng.choice(chords) for _ in range(4)), "isChordLine": True},
+                        {"lyrics": " ".join(rng.choice(words) for _ in range(10)), "isChordLine": False},
+                    )
+                ],
+            }
+            for i in range(sections)
+        ],
+        "chordDiagrams": [
+            {"chord": "C", "frets": ["X", 3, 2, 0, 1, 0], "fingers": [None, 3, 2, 0, 1, 0], "capoFret": 0}
+        ],
+        "substitutions": [],
+        "practiceTips": ["Practice at 70 BPM", "Focus on clean changes"],
+    }
+
+
+def wrap_like_llm(payload: dict) -> str:
+    return (
+        "Sure! Here is the song sheet you asked for:\n```json\n"
+        + json.dumps(payload, indent=2)
+        + "\n```\nLet me know if you want {another} version."
+    )
+
+
+def bench(label, func, text, number, expected=None):
+    seconds = timeit.timeit(lambda: func(text), number=number) / number
+    result = func(text)
+    status = "no match" if result is None else ("correct" if result == expected else "WRONG OBJECT")
+    print(f"  {label:<22} {seconds * 1e6:>10.1f} µs/op   {status}")
+
+
+def main():
+    rng = random.Random(7)
+    for sections in (4, 16, 64):
+        payload = make_arrangement(sections, rng)
+        text = wrap_like_llm(payload)
+        print(f"\nFullSongArrangement, {sections} sections ({len(text) / 1024:.1f} KB)")
+        bench("extract_json", extract_json, text, 200, payload)
+        bench("legacy grok regex", legacy_grok_extract, text, 200, payload)
+        bench("legacy gemini regex", legacy_gemini_extract, text, 200, payload)
+        assert extract_json(text) == payload
+
+        chunks = [text[i:i + 64] for i in range(0, len(text), 64)]
+
+        def streamed(_):
+            scanner = StreamingJSONScanner(item_keys={"tablature"})
+            for chunk in chunks:
+                scanner.feed(chunk)
+            return scanner.result()
+
+        bench("streamed (64B chunks)", streamed, None, 200, payload)
+
+    # Unbalanced braces make the nested-alternation regex backtrack heavily
+    text = "{" + "{ x " * 2000 + "}"
+    print(f"\nPathological unbalanced input ({len(text) / 1024:.1f} KB)")
+    bench("extract_json", extract_json, text, 20)
+    bench("legacy grok regex", legacy_grok_extract, text, 20)
+
+
+if __name__ == "__main__":
+    main()
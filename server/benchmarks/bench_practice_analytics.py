@@ -0,0 +1,101 @@
+# benchmarks/bench_practice_analytics.py
+"""Benchmark: practice analytics from practice_rollups vs aggregating raw
+practice_sessions, as one user's history grows.
+
+Uses a throwaway SQLite database. Run from the server directory:
+    python -m benchmarks.bench_practice_analytics [max_sessions]
+"""
+import os
+import sys
+import random
+import tempfile
+import timeit
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import User, Lesson, Song, Instrument, PracticeSession
+from app.api.practiceAnalytics import user_analytics, rebuild_rollups
+
+TODAY = date(2026, 10, 17)
+HISTORY_DAYS = 3 * 365
+
+
+def raw_analytics(db, user_id: int, days: int = 30):
+    """What clients had to do before: aggregate the raw sessions."""
+    start = datetime.combine(TODAY - timedelta(days=days + 29), datetime.min.time())
+    day = func.date(PracticeSession.created_at)
+    daily = (db.query(day, func.sum(PracticeSession.duration_minutes), func.count())
+             .filter(PracticeSession.user_id == user_id, PracticeSession.created_at >= start)
+             .group_by(day).all())
+    all_days = (db.query(day).filter(PracticeSession.user_id == user_id)
+                .distinct().order_by(day).all())
+    totals = (db.query(func.sum(PracticeSession.duration_minutes), func.count())
+              .filter(PracticeSession.user_id == user_id).one())
+    return daily, all_days, totals
+
+
+def populate(db, user_id: int, sessions: int, rng: random.Random):
+    rows = []
+    for _ in range(sessions):
+        created = datetime.combine(TODAY, datetime.min.time(), tzinfo=timezone.utc) - timedelta(
+            minutes=rng.randint(0, HISTORY_DAYS * 24 * 60))
+        lesson = rng.random() < 0.5
+        rows.append({
+            "user_id": user_id,
+            "lesson_id": rng.randint(1, 20) if lesson else None,
+            "song_id": None if lesson else rng.randint(1, 20),
+            "duration_minutes": rng.randint(5, 90),
+            "created_at": created,
+        })
+    # Core executemany bypasses the ORM insert hook, so rebuild afterwards
+    db.execute(PracticeSession.__table__.insert(), rows)
+    db.commit()
+    rebuild_rollups(db, user_id)
+
+
+def best_of(func_, repeat: int = 5) -> float:
+    return min(timeit.repeat(func_, number=1, repeat=repeat)) * 1000
+
+
+def main():
+    max_sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    path = os.path.join(tempfile.mkdtemp(), "bench_practice.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    rng = random.Random(7)
+
+    db = Session()
+    instrument = Instrument(name="Guitar", type="String")
+    db.add(instrument)
+    db.add_all(Lesson(title=f"Lesson {i}", lesson_type="video", instrument=instrument) for i in range(1, 21))
+    db.add_all(Song(title=f"Song {i}", artist="Various") for i in range(1, 21))
+    db.commit()
+
+    print(f"{'sessions':>10} {'rollup rows':>12} {'rollups ms':>11} {'raw ms':>9}")
+    sizes = [n for n in (1_000, 10_000, 100_000, 300_000, 1_000_000) if n <= max_sessions]
+    for user_id, sessions in enumerate(sizes, start=1):
+        db.add(User(id=user_id, name=f"user{user_id}", email=f"u{user_id}@example.com", password="x"))
+        db.commit()
+        populate(db, user_id, sessions, rng)
+        rollup_rows = db.execute(
+            func.count().select().select_from(Base.metadata.tables["practice_rollups"])
+            .where(Base.metadata.tables["practice_rollups"].c.user_id == user_id)
+        ).scalar()
+        rollup_ms = best_of(lambda: user_analytics(db, user_id, days=30, today=TODAY))
+        raw_ms = best_of(lambda: raw_analytics(db, user_id), repeat=3)
+        print(f"{sessions:>10} {rollup_rows:>12} {rollup_ms:>11.2f} {raw_ms:>9.2f}")
+
+    # Cost the insert hook adds to logging one session through the ORM
+    def log_one():
+        db.add(PracticeSession(user_id=1, lesson_id=1, duration_minutes=10))
+        db.commit()
+    print(f"\nORM session insert incl. rollup upsert: {best_of(log_one, repeat=50):.2f} ms")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# benchmarks/bench_progression_index.py
+"""Benchmark: chord progression similarity/contains queries through the
+n-gram postings as the table grows. A fixed number of rows match the
+query, so latency should stay flat while the table grows.
+
+Uses a throwaway SQLite database. Run from the server directory:
+    python -m benchmarks.bench_progression_index [max_rows]
+"""
+import os
+import sys
+import random
+import tempfile
+import timeit
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import ChordProgression
+from app.api.chordTheory import EncodedProgression, parse_progression
+from app.api.progressionIndex import rebuild_progression_index, find_similar, find_containing
+
+ROOTS = ["C", "Db", "D", "Eb", "E", "F", "F#", "G", "Ab", "A", "Bb", "B"]
+SUFFIXES = ["", "m", "7", "m7", "maj7", "dim", "sus4", "aug"]
+MATCHING_ROWS = 50
+RARE = "C Ebaug F#dim Bbsus4 Dbmaj7"
+
+
+def random_progression(rng: random.Random) -> str:
+    return " ".join(rng.choice(ROOTS) + rng.choice(SUFFIXES) for _ in range(rng.randint(3, 8)))
+
+
+def best_of(func_, repeat: int = 5) -> float:
+    return min(timeit.repeat(func_, number=1, repeat=repeat)) * 1000
+
+
+def main():
+    max_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    path = os.path.join(tempfile.mkdtemp(), "bench_progressions.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    rng = random.Random(7)
+    # Same key guess as the stored rows
+    query = parse_progression(RARE)
+    fragment = EncodedProgression(query.tonic, query.codes[1:4])
+
+    db.execute(ChordProgression.__table__.insert(), [{"progression": RARE}] * MATCHING_ROWS)
+    total = MATCHING_ROWS
+    print(f"{'rows':>10} {'similar ms':>11} {'contains ms':>12} {'matches':>8}")
+    for size in (n for n in (10_000, 100_000, 300_000, 1_000_000) if n <= max_rows):
+        # Core executemany bypasses the ORM hooks; rebuild afterwards
+        db.execute(ChordProgression.__table__.insert(),
+                   [{"progression": random_progression(rng)} for _ in range(size - total)])
+        db.commit()
+        total = size
+        rebuild_progression_index(db)
+        similar_ms = best_of(lambda: find_similar(db, query, 20))
+        contains_ms = best_of(lambda: find_containing(db, fragment, 20))
+        matches = len(find_containing(db, fragment, 100))
+        print(f"{size:>10} {similar_ms:>11.2f} {contains_ms:>12.2f} {matches:>8}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# benchmarks/bench_transpose.py
+"""Benchmark: /arrangements/transpose work per song (no HTTP), for a
+typical 4-section arrangement moved through all 12 keys and capo
+positions. Run from the server directory:
+    python -m benchmarks.bench_transpose [songs]
+"""
+import sys
+import timeit
+
+from app.schemas import FullSongArrangement
+from app.api.arrangementTranspose import transpose_arrangement
+from app.api.chordVoicings import warm_voicing_table
+
+CHORD_LINE = "G       D/F#      Em7       Cadd9    (G)  |  Am7  D7sus4"
+LYRIC_LINE = "Some words under the chords that line up with every change"
+ARRANGEMENT = FullSongArrangement.model_validate({
+    "songTitle": "Bench", "artist": "Bench", "key": "G", "instrument": "Guitar",
+    "progressionSummary": ["G", "D/F#", "Em7", "Cadd9", "Am7", "D7sus4"],
+    "tablature": [
+        {"section": name, "lines": [
+            {"lyrics": text, "isChordLine": i % 2 == 0}
+            for i, text in enumerate([CHORD_LINE, LYRIC_LINE] * 4)
+        ]}
+        for name in ("Intro", "Verse", "Chorus", "Bridge")
+    ],
+    "substitutions": [{"originalChord": "Em7", "substitutedChord": "G6", "theory": "Relative"}],
+}).model_dump()
+KEYS = ["C", "Db", "D", "Eb", "E", "F", "F#", "G", "Ab", "A", "Bb", "B"]
+
+
+def main():
+    songs = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    warm_voicing_table()
+    jobs = [(KEYS[i % 12], i % 8) for i in range(songs)]
+
+    def run():
+        for key, capo in jobs:
+            FullSongArrangement.model_validate(transpose_arrangement(ARRANGEMENT, key, capo))
+
+    run()  # fill the voicing/transposition caches
+    seconds = min(timeit.repeat(run, number=1, repeat=3))
+    print(f"{songs} songs: {seconds * 1e6 / songs:.1f} µs per song (including response validation)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Song arrangement catalog
+
+Revision ID: 4c9d2e7a1f30
+Revises: b1fea29b11e8
+Create Date: 2026-10-17 09:12:44.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c9d2e7a1f30'
+down_revision: Union[str, Sequence[str], None] = 'b1fea29b11e8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('songs', sa.Column('lookup_key', sa.String(), nullable=True))
+    op.create_index(op.f('ix_songs_lookup_key'), 'songs', ['lookup_key'], unique=True)
+
+    op.create_table('song_aliases',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('alias', sa.String(), nullable=False),
+    sa.Column('song_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['song_id'], ['songs.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_song_aliases_id'), 'song_aliases', ['id'], unique=False)
+    op.create_index(op.f('ix_song_aliases_alias'), 'song_aliases', ['alias'], unique=True)
+
+    op.add_column('chord_progressions', sa.Column('arrangement', sa.Text(), nullable=True))
+    op.add_column('chord_progressions', sa.Column('variant', sa.String(), nullable=True))
+    op.add_column('chord_progressions', sa.Column('version', sa.Integer(), nullable=True))
+    op.add_column('chord_progressions', sa.Column('refreshed_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index(op.f('ix_chord_progressions_variant'), 'chord_progressions', ['variant'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_chord_progressions_variant'), table_name='chord_progressions')
+    op.drop_column('chord_progressions', 'refreshed_at')
+    op.drop_column('chord_progressions', 'version')
+    op.drop_column('chord_progressions', 'variant')
+    op.drop_column('chord_progressions', 'arrangement')
+
+    op.drop_index(op.f('ix_song_aliases_alias'), table_name='song_aliases')
+    op.drop_index(op.f('ix_song_aliases_id'), table_name='song_aliases')
+    op.drop_table('song_aliases')
+
+    op.drop_index(op.f('ix_songs_lookup_key'), table_name='songs')
+    op.drop_column('songs', 'lookup_key')
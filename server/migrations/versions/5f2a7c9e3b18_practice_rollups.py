@@ -0,0 +1,55 @@
+"""practice rollups
+
+Revision ID: 5f2a7c9e3b18
+Revises: 8e1b5a3c6d47
+Create Date: 2026-10-17 14:05:47.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f2a7c9e3b18'
+down_revision: Union[str, Sequence[str], None] = '8e1b5a3c6d47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('practice_rollups',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('lesson_id', sa.Integer(), nullable=False),
+    sa.Column('song_id', sa.Integer(), nullable=False),
+    sa.Column('minutes', sa.Integer(), nullable=False),
+    sa.Column('session_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'day', 'lesson_id', 'song_id', name='uq_practice_rollups_key')
+    )
+    op.create_index(op.f('ix_practice_rollups_id'), 'practice_rollups', ['id'], unique=False)
+
+    # Backfill from existing sessions (UTC days)
+    if op.get_bind().dialect.name == 'postgresql':
+        day = "date(timezone('UTC', created_at))"
+    else:
+        day = "date(created_at)"
+    op.execute(f"""
+        INSERT INTO practice_rollups (user_id, day, lesson_id, song_id, minutes, session_count)
+        SELECT user_id, {day}, COALESCE(lesson_id, 0), COALESCE(song_id, 0),
+               COALESCE(SUM(duration_minutes), 0), COUNT(*)
+        FROM practice_sessions
+        WHERE user_id IS NOT NULL
+        GROUP BY user_id, {day}, COALESCE(lesson_id, 0), COALESCE(song_id, 0)
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_practice_rollups_id'), table_name='practice_rollups')
+    op.drop_table('practice_rollups')
@@ -0,0 +1,32 @@
+"""list filter indexes
+
+Revision ID: 9a4d6b2e8c51
+Revises: 5f2a7c9e3b18
+Create Date: 2026-10-17 15:22:10.604391
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4d6b2e8c51'
+down_revision: Union[str, Sequence[str], None] = '5f2a7c9e3b18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_songs_genre_id', 'songs', ['genre', 'id'], unique=False)
+    op.create_index('ix_lessons_instrument_id_id', 'lessons', ['instrument_id', 'id'], unique=False)
+    op.create_index('ix_lessons_difficulty_id', 'lessons', ['difficulty', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_lessons_difficulty_id', table_name='lessons')
+    op.drop_index('ix_lessons_instrument_id_id', table_name='lessons')
+    op.drop_index('ix_songs_genre_id', table_name='songs')
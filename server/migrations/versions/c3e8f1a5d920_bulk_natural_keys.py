@@ -0,0 +1,113 @@
+"""bulk ingest natural keys
+
+Revision ID: c3e8f1a5d920
+Revises: 9a4d6b2e8c51
+Create Date: 2026-10-17 16:48:33.902145
+
+"""
+import re
+import unicodedata
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e8f1a5d920'
+down_revision: Union[str, Sequence[str], None] = '9a4d6b2e8c51'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _lookup_key(text: str) -> str:
+    """Frozen copy of catalogService.normalize_lookup_key as of this
+    revision: 'Wonderwall – Oasis!' -> 'wonderwall oasis'"""
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return " ".join(re.sub(r"[^\w]+", " ", text.lower()).split())
+
+
+def _duplicates(bind, table: str, columns: str, where: str = "") -> list:
+    """(kept id, duplicate id) pairs for rows sharing `columns`; the
+    oldest row (lowest id) is kept."""
+    rows = bind.execute(sa.text(
+        f"SELECT id, {columns} FROM {table} {where} ORDER BY id"
+    )).all()
+    first, pairs = {}, []
+    for row in rows:
+        key = tuple(row[1:])
+        if key in first:
+            pairs.append((first[key], row[0]))
+        else:
+            first[key] = row[0]
+    return pairs
+
+
+def _merge_instruments(bind):
+    for keep, dup in _duplicates(bind, "instruments", "name"):
+        for table in ("lessons", "chord_progressions", "melodies", "user_instruments"):
+            bind.execute(sa.text(f"UPDATE {table} SET instrument_id = :keep WHERE instrument_id = :dup"),
+                         {"keep": keep, "dup": dup})
+        bind.execute(sa.text("DELETE FROM instruments WHERE id = :dup"), {"dup": dup})
+    # Users who had picked both copies
+    for keep, dup in _duplicates(bind, "user_instruments", "user_id, instrument_id"):
+        bind.execute(sa.text("DELETE FROM user_instruments WHERE id = :dup"), {"dup": dup})
+
+
+def _merge_lessons(bind):
+    for keep, dup in _duplicates(bind, "lessons", "title, instrument_id", "WHERE instrument_id IS NOT NULL"):
+        bind.execute(sa.text("UPDATE practice_sessions SET lesson_id = :keep WHERE lesson_id = :dup"),
+                     {"keep": keep, "dup": dup})
+        # Rollups key on lesson_id: fold the duplicate's into the kept lesson's
+        rollups = bind.execute(sa.text(
+            "SELECT id, user_id, day, song_id, minutes, session_count FROM practice_rollups WHERE lesson_id = :dup"
+        ), {"dup": dup}).all()
+        for rollup_id, user_id, day, song_id, minutes, sessions in rollups:
+            target = bind.execute(sa.text(
+                "SELECT id FROM practice_rollups WHERE user_id = :user AND day = :day "
+                "AND lesson_id = :keep AND song_id = :song"
+            ), {"user": user_id, "day": day, "keep": keep, "song": song_id}).scalar()
+            if target is None:
+                bind.execute(sa.text("UPDATE practice_rollups SET lesson_id = :keep WHERE id = :id"),
+                             {"keep": keep, "id": rollup_id})
+                continue
+            bind.execute(sa.text(
+                "UPDATE practice_rollups SET minutes = minutes + :minutes, "
+                "session_count = session_count + :sessions WHERE id = :id"
+            ), {"minutes": minutes, "sessions": sessions, "id": target})
+            bind.execute(sa.text("DELETE FROM practice_rollups WHERE id = :id"), {"id": rollup_id})
+        bind.execute(sa.text("DELETE FROM lessons WHERE id = :dup"), {"dup": dup})
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Merge existing duplicates first, or the unique constraints can't be
+    # created. Instruments go first: merging them can make lessons collide.
+    bind = op.get_bind()
+    _merge_instruments(bind)
+    _merge_lessons(bind)
+
+    with op.batch_alter_table('instruments') as batch_op:
+        batch_op.create_unique_constraint('uq_instruments_name', ['name'])
+    with op.batch_alter_table('lessons') as batch_op:
+        batch_op.create_unique_constraint('uq_lessons_title_instrument', ['title', 'instrument_id'])
+
+    # Songs created one at a time never had a lookup_key; backfill them so
+    # bulk upserts match (a song whose key is already taken stays NULL)
+    taken = {key for (key,) in bind.execute(sa.text("SELECT lookup_key FROM songs WHERE lookup_key IS NOT NULL"))}
+    rows = bind.execute(sa.text("SELECT id, title, artist FROM songs WHERE lookup_key IS NULL ORDER BY id")).all()
+    for song_id, title, artist in rows:
+        key = _lookup_key(f"{title} {artist or ''}")
+        if key in taken:
+            continue
+        taken.add(key)
+        bind.execute(sa.text("UPDATE songs SET lookup_key = :key WHERE id = :id"), {"key": key, "id": song_id})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('lessons') as batch_op:
+        batch_op.drop_constraint('uq_lessons_title_instrument', type_='unique')
+    with op.batch_alter_table('instruments') as batch_op:
+        batch_op.drop_constraint('uq_instruments_name', type_='unique')
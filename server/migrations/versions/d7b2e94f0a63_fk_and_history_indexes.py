@@ -0,0 +1,60 @@
+"""foreign key and history indexes
+
+Revision ID: d7b2e94f0a63
+Revises: c3e8f1a5d920
+Create Date: 2026-10-17 18:10:52.447310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7b2e94f0a63'
+down_revision: Union[str, Sequence[str], None] = 'c3e8f1a5d920'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, columns): (user_id, created_at) serves both "rows for a user" and
+# "a user's history, newest first", so user_id needs no separate index there
+INDEXES = [
+    ('practice_sessions', ['user_id', 'created_at']),
+    ('practice_sessions', ['lesson_id']),
+    ('practice_sessions', ['song_id']),
+    ('chord_progressions', ['user_id', 'created_at']),
+    ('chord_progressions', ['song_id']),
+    ('chord_progressions', ['instrument_id']),
+    ('melodies', ['user_id', 'created_at']),
+    ('melodies', ['instrument_id']),
+    ('user_songs', ['user_id', 'created_at']),
+    ('user_songs', ['song_id']),
+    ('user_instruments', ['user_id']),
+    ('user_instruments', ['instrument_id']),
+    ('user_settings', ['user_id']),
+    ('song_aliases', ['song_id']),
+]
+
+
+def _name(table: str, columns: list) -> str:
+    return f"ix_{table}_{'_'.join(columns)}"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY on PostgreSQL so large tables stay writable; it cannot
+    # run inside a transaction
+    with op.get_context().autocommit_block():
+        for table, columns in INDEXES:
+            op.create_index(_name(table, columns), table, columns, unique=False,
+                            postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for table, columns in reversed(INDEXES):
+            op.drop_index(_name(table, columns), table_name=table,
+                          postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,55 @@
+"""catalog search indexes
+
+Revision ID: e5a1c8f3b276
+Revises: d7b2e94f0a63
+Create Date: 2026-10-17 19:02:14.381925
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a1c8f3b276'
+down_revision: Union[str, Sequence[str], None] = 'd7b2e94f0a63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SONG_DOCUMENT = "coalesce(title, '') || ' ' || coalesce(artist, '') || ' ' || coalesce(genre, '')"
+LESSON_TITLE = "coalesce(title, '')"
+LESSON_DOCUMENT = "coalesce(title, '') || ' ' || coalesce(content, '')"
+
+# (name, table, method, expression). The expressions must match the ones
+# app/api/catalogSearch.py queries with, or the planner can't use them.
+INDEXES = [
+    ('ix_songs_search_trgm', 'songs', 'gin', f"({SONG_DOCUMENT}) gin_trgm_ops"),
+    ('ix_songs_search_fts', 'songs', 'gin', f"to_tsvector('simple', {SONG_DOCUMENT})"),
+    ('ix_songs_title_prefix', 'songs', 'btree', '(lower(title) COLLATE "C")'),
+    ('ix_lessons_search_trgm', 'lessons', 'gin', f"({LESSON_TITLE}) gin_trgm_ops"),
+    ('ix_lessons_search_fts', 'lessons', 'gin', f"to_tsvector('english', {LESSON_DOCUMENT})"),
+    ('ix_lessons_title_prefix', 'lessons', 'btree', '(lower(title) COLLATE "C")'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Other databases search with the in-process index instead
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    with op.get_context().autocommit_block():
+        for name, table, method, expression in INDEXES:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} USING {method} ({expression})")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    with op.get_context().autocommit_block():
+        for name, _, _, _ in reversed(INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+    # pg_trgm is left installed; other objects may depend on it
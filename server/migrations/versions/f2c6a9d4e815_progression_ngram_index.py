@@ -0,0 +1,205 @@
+"""progression n-gram index
+
+Revision ID: f2c6a9d4e815
+Revises: e5a1c8f3b276
+Create Date: 2026-10-17 20:14:37.552081
+
+"""
+import json
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c6a9d4e815'
+down_revision: Union[str, Sequence[str], None] = 'e5a1c8f3b276'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH = 2000
+
+# Frozen copy of chordTheory's encoding as of this revision: the stored
+# bytes and grams must not change if the live parser does.
+MAJOR, MINOR, DIMINISHED, AUGMENTED, SUSPENDED, DOMINANT = range(6)
+_FOLDED = {DOMINANT: MAJOR, SUSPENDED: MAJOR}
+NGRAM = 3
+_NATURALS = {"C": 0, "D": 2, "E": 4, "F": 5, "G": 7, "A": 9, "B": 11}
+_ACCIDENTALS = {"": 0, "#": 1, "♯": 1, "b": -1, "♭": -1}
+_NUMERALS = {"I": 0, "II": 2, "III": 4, "IV": 5, "V": 7, "VI": 9, "VII": 11}
+_DIATONIC = {0 * 8 + MAJOR, 2 * 8 + MINOR, 4 * 8 + MINOR, 5 * 8 + MAJOR,
+             7 * 8 + MAJOR, 9 * 8 + MINOR, 11 * 8 + DIMINISHED}
+_KEY_PREFERENCE = [0, 7, 5, 2, 10, 9, 3, 4, 8, 11, 1, 6]
+_SUFFIX = r"(?:maj|min|mi|m|M|dim|aug|sus|add|no|alt|ø|°|o|\+|-|Δ|\d|b|#|♯|♭|\(|\))*"
+_NUMERAL = r"VII|VI|V|IV|III|II|I|vii|vi|v|iv|iii|ii|i"
+_CHORD_RE = re.compile(rf"^([A-G])([#♯b♭]?)({_SUFFIX})(?:/([A-G][#♯b♭]?))?$")
+_NUMERAL_RE = re.compile(rf"^([#♯b♭]?)({_NUMERAL})({_SUFFIX})(?:/[#♯b♭]?(?:{_NUMERAL}))?$")
+_KEY_RE = re.compile(r"^([A-G])([#♯b♭]?)\s*(m|min|minor|maj|major)?$", re.IGNORECASE)
+_SPLIT_RE = re.compile(r"->|[\s,|–—→>()\[\]]+|-(?=[A-G#♯b♭IViv])")
+
+
+def _pitch_class(name: str) -> int:
+    return (_NATURALS[name[0].upper()] + _ACCIDENTALS[name[1:]]) % 12
+
+
+def _parse_key(key: str) -> int:
+    match = _KEY_RE.match(re.sub(r"\(.*?\)", "", key or "").strip())
+    if not match:
+        raise ValueError(f"Unrecognized key: {key}")
+    letter, accidental, mode = match.groups()
+    tonic = _pitch_class(letter + accidental)
+    minor = bool(mode) and (mode == "m" or mode.lower().startswith("min"))
+    return (tonic + 3) % 12 if minor else tonic
+
+
+def _quality(suffix: str, upper: bool = True) -> int:
+    if suffix.startswith(("maj", "M", "Δ")):
+        return MAJOR if upper else MINOR
+    lowered = suffix.lower()
+    if lowered.startswith(("dim", "°", "o", "ø")) or "m7b5" in lowered:
+        return DIMINISHED
+    if lowered.startswith(("aug", "+")):
+        return AUGMENTED
+    if suffix.startswith(("m", "min", "-")):
+        return MINOR
+    if lowered.startswith("sus"):
+        return SUSPENDED
+    if re.match(r"^(7|9|11|13)", suffix):
+        return DOMINANT if upper else MINOR
+    return MAJOR if upper else MINOR
+
+
+def _parse_chord(symbol: str):
+    match = _CHORD_RE.match(symbol)
+    if not match:
+        return None
+    letter, accidental, suffix, _ = match.groups()
+    return _pitch_class(letter + accidental), _quality(suffix)
+
+
+def _parse_numeral(symbol: str):
+    match = _NUMERAL_RE.match(symbol)
+    if not match:
+        return None
+    accidental, numeral, suffix = match.groups()
+    degree = (_NUMERALS[numeral.upper()] + _ACCIDENTALS[accidental]) % 12
+    if suffix.startswith(("°", "o", "dim", "ø")):
+        return degree, DIMINISHED
+    if suffix.startswith(("+", "aug")):
+        return degree, AUGMENTED
+    return degree, _quality(suffix, numeral.isupper())
+
+
+def _guess_tonic(chords: list) -> int:
+    def score(tonic: int):
+        codes = [((root - tonic) % 12) * 8 + _FOLDED.get(quality, quality) for root, quality in chords]
+        fit = sum(code in _DIATONIC for code in codes)
+        fit += 0.5 * (codes[0] in (MAJOR, 9 * 8 + MINOR)) + 0.5 * (codes[-1] in (MAJOR, 9 * 8 + MINOR))
+        return fit, -_KEY_PREFERENCE.index(tonic)
+    return max(range(12), key=score)
+
+
+def _encode_progression(text: str, key=None):
+    """(tonic, codes) for `text`, skipping unrecognized tokens; None when
+    nothing parses."""
+    tonic = _parse_key(key) if key else None
+    chords, numerals = [], []
+    for token in _SPLIT_RE.split(text or ""):
+        if not token:
+            continue
+        chord = _parse_chord(token)
+        if chord is not None:
+            chords.append((len(chords) + len(numerals), chord))
+            continue
+        numeral = _parse_numeral(token)
+        if numeral is not None:
+            numerals.append((len(chords) + len(numerals), numeral))
+    if not chords and not numerals:
+        return None
+    if tonic is None:
+        tonic = _guess_tonic([chord for _, chord in chords]) if chords else 0
+    codes = [None] * (len(chords) + len(numerals))
+    for position, (root, quality) in chords:
+        codes[position] = ((root - tonic) % 12) * 8 + quality
+    for position, (degree, quality) in numerals:
+        codes[position] = degree * 8 + quality
+    return tonic, bytes(codes)
+
+
+def _ngrams(codes: bytes) -> set:
+    """Packed cyclic NGRAM windows over the folded codes."""
+    folded = bytes((code & ~7) | _FOLDED.get(code & 7, code & 7) for code in codes)
+    if not folded:
+        return set()
+    looped = folded * (NGRAM // len(folded) + 2)
+    grams = set()
+    for i in range(len(folded)):
+        value = 0
+        for code in looped[i:i + NGRAM]:
+            value = (value << 8) | code
+        grams.add(value)
+    return grams
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('chord_progressions', sa.Column('tonic', sa.SmallInteger(), nullable=True))
+    op.add_column('chord_progressions', sa.Column('degrees', sa.LargeBinary(), nullable=True))
+    op.add_column('chord_progressions', sa.Column('ngram_count', sa.Integer(), nullable=True))
+    op.create_table('progression_ngrams',
+    sa.Column('gram', sa.Integer(), nullable=False),
+    sa.Column('progression_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['progression_id'], ['chord_progressions.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('gram', 'progression_id')
+    )
+    op.create_index(op.f('ix_progression_ngrams_progression_id'), 'progression_ngrams', ['progression_id'], unique=False)
+
+    # Encode existing progressions and build their postings
+    def encode(progression, arrangement):
+        key = None
+        if arrangement:
+            try:
+                key = json.loads(arrangement).get("key")
+            except (ValueError, AttributeError):
+                pass
+        try:
+            return _encode_progression(progression, key)
+        except ValueError:
+            return _encode_progression(progression)
+
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(sa.text(
+            "SELECT id, progression, arrangement FROM chord_progressions WHERE id > :last ORDER BY id LIMIT :batch"
+        ), {"last": last_id, "batch": BATCH}).all()
+        if not rows:
+            break
+        updates, postings = [], []
+        for row_id, progression, arrangement in rows:
+            encoded = encode(progression, arrangement)
+            if encoded is None:
+                continue
+            tonic, codes = encoded
+            grams = _ngrams(codes)
+            updates.append({"id": row_id, "tonic": tonic, "degrees": codes, "count": len(grams)})
+            postings.extend({"gram": gram, "id": row_id} for gram in grams)
+        if updates:
+            bind.execute(sa.text(
+                "UPDATE chord_progressions SET tonic = :tonic, degrees = :degrees, ngram_count = :count WHERE id = :id"
+            ).bindparams(sa.bindparam("degrees", type_=sa.LargeBinary())), updates)
+        if postings:
+            bind.execute(sa.text("INSERT INTO progression_ngrams (gram, progression_id) VALUES (:gram, :id)"), postings)
+        last_id = rows[-1][0]
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_progression_ngrams_progression_id'), table_name='progression_ngrams')
+    op.drop_table('progression_ngrams')
+    with op.batch_alter_table('chord_progressions') as batch_op:
+        batch_op.drop_column('ngram_count')
+        batch_op.drop_column('degrees')
+        batch_op.drop_column('tonic')
@@ -0,0 +1,71 @@
+# tests/conftest.py
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+
+# Tests run against a throwaway SQLite database; it must be configured
+# before app.database builds its engines.
+_DB_DIR = tempfile.mkdtemp(prefix="ai-music-store-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DB_DIR, 'test.db')}"
+os.environ["ADMIN_API_KEY"] = "test-admin-key"
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.database import Base, engine, async_engine, SessionLocal
+from app.main import app
+
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def client(db):
+    return TestClient(app, headers={"X-API-Key": os.environ["ADMIN_API_KEY"]})
+
+
+class QueryCounter:
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+@pytest.fixture
+def count_queries():
+    """Context manager counting SQL statements the app sends, e.g.
+
+        with count_queries(max_queries=3) as counter:
+            client.get(...)
+    """
+    @contextmanager
+    def counting(max_queries: int = None):
+        counter = QueryCounter()
+        target = async_engine.sync_engine
+        event.listen(target, "before_cursor_execute", counter)
+        try:
+            yield counter
+        finally:
+            event.remove(target, "before_cursor_execute", counter)
+        if max_queries is not None:
+            assert counter.count <= max_queries, (
+                f"{counter.count} queries (max {max_queries}):\n" + "\n".join(counter.statements)
+            )
+
+    return counting
@@ -0,0 +1,44 @@
+# tests/test_ai_dispatch.py
+import pytest
+
+from app.api.circuitBreaker import CircuitBreaker, CLOSED, OPEN, provider_breakers
+from app.api.geminiService import gemini_music_service
+from app.api.grokService import grok_service
+from app.routers.ai import dispatch_stats
+
+
+@pytest.fixture
+def grok_only(monkeypatch):
+    """Gemini off, Grok on, with a fresh Grok circuit."""
+    breaker = CircuitBreaker("grok", error_threshold=0.5, window=10, min_requests=3, cooldown=60)
+    monkeypatch.setitem(provider_breakers, "grok", breaker)
+    monkeypatch.setattr(gemini_music_service, "available", False)
+    monkeypatch.setattr(grok_service, "available", True)
+    return breaker
+
+
+def test_invalid_replies_do_not_trip_the_provider_circuit(client, grok_only, monkeypatch):
+    async def wrong_shape(key, style):
+        return {"melody": "C4 E4 G4", "description": "old shape"}
+    monkeypatch.setattr(grok_service, "generate_melody", wrong_shape)
+    invalid_before = dispatch_stats.get("melody", {}).get("invalid", {}).get("grok", 0)
+
+    for i in range(5):
+        response = client.post("/ai/melody", json={"key": f"C{i}", "style": "jazz"},
+                               headers={"Cache-Control": "no-cache"})
+        assert response.status_code == 503
+
+    assert grok_only.state == CLOSED
+    assert grok_only.snapshot()["windowSize"] == 5
+    assert dispatch_stats["melody"]["invalid"]["grok"] == invalid_before + 5
+
+
+def test_transport_errors_trip_the_provider_circuit(client, grok_only, monkeypatch):
+    async def unreachable(key, style):
+        raise ConnectionError("connection reset")
+    monkeypatch.setattr(grok_service, "generate_melody", unreachable)
+
+    for i in range(3):
+        client.post("/ai/melody", json={"key": f"D{i}", "style": "jazz"}, headers={"Cache-Control": "no-cache"})
+
+    assert grok_only.state == OPEN
@@ -0,0 +1,111 @@
+# tests/test_batch.py
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+from app.routers import ai
+
+
+class Reply(BaseModel):
+    value: str
+
+
+def handler(value, delay=0.0):
+    async def run(params, cache_control):
+        await asyncio.sleep(delay)
+        return Reply(value=f"{value}:{params.get('n', '')}")
+    return run
+
+
+@pytest.fixture
+def handlers(monkeypatch):
+    async def missing_field(params, cache_control):
+        return Reply(value=params["key"])
+
+    async def rate_limited(params, cache_control):
+        raise HTTPException(status_code=429, detail="slow down")
+
+    async def broken(params, cache_control):
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(ai.job_handlers, "rhythm", handler("rhythm", 0.2))
+    monkeypatch.setitem(ai.job_handlers, "melody", handler("melody", 0.0))
+    monkeypatch.setitem(ai.job_handlers, "lyrics", missing_field)
+    monkeypatch.setitem(ai.job_handlers, "improv", rate_limited)
+    monkeypatch.setitem(ai.job_handlers, "lesson", broken)
+
+
+def test_items_map_to_results_and_errors(client, handlers):
+    response = client.post("/ai/batch", json={"jobs": [
+        {"id": "a", "type": "rhythm", "params": {"n": 1}},
+        {"type": "melody", "params": {"n": 2}},
+        {"type": "lyrics", "params": {}},
+        {"type": "improv", "params": {}},
+        {"type": "lesson", "params": {}},
+    ]})
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [(r["id"], r["type"], r["ok"]) for r in results] == [
+        ("a", "rhythm", True), ("1", "melody", True), ("2", "lyrics", False),
+        ("3", "improv", False), ("4", "lesson", False),
+    ]
+    assert results[0]["result"] == {"value": "rhythm:1"} and results[0]["error"] is None
+    assert results[2]["error"] == {"status": 422, "detail": "Missing field: key"}
+    assert results[3]["error"] == {"status": 429, "detail": "slow down"}
+    assert results[4]["error"] == {"status": 500, "detail": "boom"}
+
+
+def test_unknown_job_types(client, handlers):
+    # The schema rejects them at the door...
+    response = client.post("/ai/batch", json={"jobs": [{"type": "karaoke", "params": {}}]})
+    assert response.status_code == 422
+
+    # ...and a handler missing from the table fails only its own item
+    job = SimpleNamespace(id=None, type="karaoke", params={})
+    item = asyncio.run(ai._run_batch_job(0, job, None))
+    assert not item.ok
+    assert item.error.status == 422 and "karaoke" in item.error.detail
+
+
+def test_oversized_batch_is_rejected(client, handlers, monkeypatch):
+    monkeypatch.setattr(ai, "AI_BATCH_MAX_JOBS", 2)
+    jobs = [{"type": "melody", "params": {}} for _ in range(3)]
+
+    response = client.post("/ai/batch", json={"jobs": jobs})
+
+    assert response.status_code == 413
+    assert client.post("/ai/batch", json={"jobs": jobs[:2]}).status_code == 200
+
+
+def test_ndjson_streams_items_in_completion_order(client, handlers):
+    response = client.post("/ai/batch?stream=ndjson", json={"jobs": [
+        {"id": "slow", "type": "rhythm", "params": {}},
+        {"id": "fast", "type": "melody", "params": {}},
+        {"id": "bad", "type": "improv", "params": {}},
+    ]})
+
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert [e["event"] for e in events] == ["item", "item", "item", "done"]
+    assert events[-1]["data"] == {"count": 3}
+    # The slow job comes last even though it was listed first
+    assert events[2]["data"]["id"] == "slow"
+    assert {e["data"]["id"] for e in events[:2]} == {"fast", "bad"}
+
+
+def test_sse_streams_items_in_completion_order(client, handlers):
+    response = client.post("/ai/batch", headers={"Accept": "text/event-stream"}, json={"jobs": [
+        {"id": "slow", "type": "rhythm", "params": {}},
+        {"id": "fast", "type": "melody", "params": {}},
+    ]})
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    blocks = [block.splitlines() for block in response.text.strip().split("\n\n")]
+    assert [lines[0] for lines in blocks] == ["event: item", "event: item", "event: done"]
+    ids = [json.loads(lines[1][len("data: "):]).get("id") for lines in blocks[:2]]
+    assert ids == ["fast", "slow"]
@@ -0,0 +1,87 @@
+# tests/test_bulk_ingest.py
+import json
+
+from app.api import bulkIngest
+from app.models import Instrument, Song
+
+
+def test_bulk_songs_json_array_upserts_on_lookup_key(client, db):
+    db.add(Song(title="Wonderwall", artist="Oasis", genre="rock", lookup_key="wonderwall oasis"))
+    db.commit()
+
+    response = client.post("/songs/bulk", json=[
+        {"title": "Wonderwall!", "artist": "Oasis", "genre": "britpop"},
+        {"title": "Hallelujah", "artist": "Leonard Cohen"},
+        {"artist": "No title"},
+    ])
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [r["status"] for r in body["results"]] == ["updated", "inserted", "error"]
+    assert (body["inserted"], body["updated"], body["failed"]) == (1, 1, 1)
+    db.expire_all()
+    assert db.query(Song).filter(Song.lookup_key == "wonderwall oasis").one().genre == "britpop"
+
+
+def test_bulk_instruments_ndjson_skip_mode(client, db):
+    db.add(Instrument(name="Piano", type="Keyboard"))
+    db.commit()
+    lines = [{"name": "Piano", "type": "Changed"}, {"name": "Drums"}, {"name": "Drums", "type": "Percussion"}]
+    payload = "\n".join(json.dumps(line) for line in lines) + "\n{broken\n"
+
+    response = client.post(
+        "/instruments/bulk?on_conflict=skip",
+        content=payload,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    statuses = [r["status"] for r in response.json()["results"]]
+    assert statuses == ["skipped", "skipped", "inserted", "error"]
+    db.expire_all()
+    assert db.query(Instrument).filter(Instrument.name == "Piano").one().type == "Keyboard"
+    assert db.query(Instrument).filter(Instrument.name == "Drums").one().type == "Percussion"
+
+
+def test_bulk_lessons_reports_unknown_instrument(client, db):
+    guitar = Instrument(name="Guitar")
+    db.add(guitar)
+    db.commit()
+
+    response = client.post("/lessons/bulk", json=[
+        {"title": "Barre chords", "lesson_type": "video", "instrument_id": guitar.id},
+        {"title": "Scales", "lesson_type": "video", "instrument_id": 999},
+    ])
+
+    results = response.json()["results"]
+    assert results[0]["status"] == "inserted"
+    assert results[1] == {"index": 1, "status": "error", "id": None, "error": "Unknown instrument_id 999"}
+
+
+def test_bulk_rejects_non_array_body(client, db):
+    assert client.post("/songs/bulk", json={"title": "x"}).status_code == 400
+
+
+def test_bulk_update_keeps_fields_the_row_omits(client, db):
+    db.add(Song(title="Hallelujah", artist="Leonard Cohen", genre="folk", lookup_key="hallelujah leonard cohen"))
+    db.commit()
+
+    response = client.post("/songs/bulk", json=[
+        {"title": "Hallelujah", "artist": "Leonard Cohen"},
+        {"title": "Yesterday", "artist": "The Beatles", "genre": "pop"},
+    ])
+
+    assert [r["status"] for r in response.json()["results"]] == ["updated", "inserted"]
+    db.expire_all()
+    assert db.query(Song).filter(Song.title == "Hallelujah").one().genre == "folk"
+
+
+def test_bulk_ndjson_over_the_row_limit_reports_what_was_loaded(client, db, monkeypatch):
+    monkeypatch.setattr(bulkIngest, "BULK_MAX_ROWS", 3)
+    payload = "\n".join(json.dumps({"name": f"Instrument {i}"}) for i in range(5))
+
+    response = client.post("/instruments/bulk", content=payload, headers={"Content-Type": "application/x-ndjson"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["truncated"], body["inserted"], len(body["results"])) == (True, 3, 3)
+    assert db.query(Instrument).count() == 3
@@ -0,0 +1,154 @@
+# tests/test_catalog_search.py
+import threading
+import time
+
+import pytest
+
+from app.api import catalogSearch
+from app.models import Instrument, Lesson, Song
+from app.api.catalogSearch import catalog_search, trigrams
+from app.routers.songs import SONGS_SEARCH
+from app.routers.lessons import LESSONS_SEARCH
+
+
+@pytest.fixture(autouse=True)
+def fresh_search_indexes():
+    # Each test recreates the tables, so ids (and the index signature) repeat
+    catalog_search.clear()
+    yield
+    catalog_search.clear()
+
+
+def _songs(db):
+    db.add_all([
+        Song(title="Wonderwall", artist="Oasis", genre="britpop", lookup_key="wonderwall oasis"),
+        Song(title="Wonderful Tonight", artist="Eric Clapton", genre="rock", lookup_key="wonderful tonight eric clapton"),
+        Song(title="Hallelujah", artist="Leonard Cohen", genre="folk", lookup_key="hallelujah leonard cohen"),
+        Song(title="Jolene", artist="Dolly Parton", genre="country", lookup_key="jolene dolly parton"),
+    ])
+    db.commit()
+
+
+def test_trigrams_pad_words_like_pg_trgm():
+    assert trigrams("Ab") == {"  a", " ab", "ab "}
+
+
+def test_song_search_tolerates_typos_and_ranks_best_match_first(client, db):
+    _songs(db)
+
+    body = client.get("/songs/search", params={"q": "wonderwal oasis"}).json()
+
+    assert body["engine"] == "memory"
+    assert body["items"][0]["title"] == "Wonderwall"
+    assert "Hallelujah" not in [item["title"] for item in body["items"]]
+
+    items = client.get("/songs/search", params={"q": "halleluja"}).json()["items"]
+    assert [item["title"] for item in items] == ["Hallelujah"]
+
+
+def test_song_search_matches_artist_and_genre(client, db):
+    _songs(db)
+
+    assert [i["title"] for i in client.get("/songs/search", params={"q": "Dolly"}).json()["items"]] == ["Jolene"]
+    assert [i["title"] for i in client.get("/songs/search", params={"q": "country"}).json()["items"]] == ["Jolene"]
+
+
+def test_song_search_index_picks_up_new_rows(client, db, monkeypatch):
+    _songs(db)
+    client.get("/songs/search", params={"q": "jolene"})
+    builds = catalog_search.builds
+
+    client.get("/songs/search", params={"q": "jolene"})
+    assert catalog_search.builds == builds
+
+    db.add(Song(title="Yesterday", artist="The Beatles", lookup_key="yesterday the beatles"))
+    db.commit()
+    # Rows written outside the API are noticed once the signature is
+    # re-read; the old index answers until the rebuild is swapped in
+    monkeypatch.setattr("app.api.catalogSearch.SEARCH_SIGNATURE_TTL", 0)
+    assert client.get("/songs/search", params={"q": "yesterdy"}).json()["items"] == []
+    catalog_search.wait_until_built(SONGS_SEARCH)
+
+    items = client.get("/songs/search", params={"q": "yesterdy"}).json()["items"]
+    assert [i["title"] for i in items] == ["Yesterday"]
+    assert catalog_search.builds == builds + 1
+
+
+def test_searches_are_served_from_the_old_index_during_a_rebuild(client, db, monkeypatch):
+    _songs(db)
+    client.get("/songs/search", params={"q": "jolene"})
+    release = threading.Event()
+    original = catalogSearch.MemoryIndex
+
+    class SlowIndex(original):
+        def __init__(self, *args):
+            release.wait(5)
+            super().__init__(*args)
+
+    monkeypatch.setattr(catalogSearch, "MemoryIndex", SlowIndex)
+    assert client.post("/songs/", params={"title": "Yesterday", "artist": "The Beatles"}).status_code == 200
+
+    # The rebuild is blocked, yet searches answer at once from the old index
+    started = time.monotonic()
+    items = client.get("/songs/search", params={"q": "jolene"}).json()["items"]
+    assert time.monotonic() - started < 1
+    assert [i["title"] for i in items] == ["Jolene"]
+
+    release.set()
+    catalog_search.wait_until_built(SONGS_SEARCH, timeout=5)
+    items = client.get("/songs/search", params={"q": "yesterday"}).json()["items"]
+    assert [i["title"] for i in items] == ["Yesterday"]
+
+
+def test_song_search_reuses_the_signature_within_its_ttl(client, db, count_queries):
+    _songs(db)
+    client.get("/songs/search", params={"q": "jolene"})
+
+    with count_queries() as counter:
+        items = client.get("/songs/search", params={"q": "jolene"}).json()["items"]
+    assert counter.count == 0
+    assert [i["title"] for i in items] == ["Jolene"]
+
+
+def test_song_autocomplete_returns_title_prefix_matches_in_order(client, db):
+    _songs(db)
+
+    items = client.get("/songs/autocomplete", params={"prefix": "Wonder"}).json()["items"]
+
+    assert [i["title"] for i in items] == ["Wonderful Tonight", "Wonderwall"]
+    assert client.get("/songs/autocomplete", params={"prefix": "zz"}).json()["items"] == []
+
+
+def test_lesson_search_covers_content_and_is_not_shadowed_by_detail_route(client, db):
+    guitar = Instrument(name="Guitar", type="String")
+    db.add(guitar)
+    db.flush()
+    db.add_all([
+        Lesson(title="Barre Chords", lesson_type="technique", instrument_id=guitar.id,
+               content="Press one finger across every string to build moveable shapes."),
+        Lesson(title="Strumming Patterns", lesson_type="rhythm", instrument_id=guitar.id,
+               content="Down, down-up, up-down-up for a steady groove."),
+    ])
+    db.commit()
+
+    by_title = client.get("/lessons/search", params={"q": "bare chord"})
+    assert by_title.status_code == 200
+    assert by_title.json()["items"][0]["title"] == "Barre Chords"
+
+    by_content = client.get("/lessons/search", params={"q": "groove"}).json()["items"]
+    assert [i["title"] for i in by_content] == ["Strumming Patterns"]
+
+    completed = client.get("/lessons/autocomplete", params={"prefix": "str"}).json()["items"]
+    assert [i["title"] for i in completed] == ["Strumming Patterns"]
+
+
+def test_lesson_search_covers_the_whole_content(client, db):
+    guitar = Instrument(name="Guitar", type="String")
+    db.add(guitar)
+    db.flush()
+    db.add(Lesson(title="Fingerpicking", lesson_type="technique", instrument_id=guitar.id,
+                  content="Travis picking keeps the thumb steady. " + "Practice slowly. " * 500 + "Arpeggio"))
+    db.commit()
+
+    # Same columns as the PostgreSQL full-text index, end of the text included
+    assert [i["title"] for i in client.get("/lessons/search", params={"q": "arpeggio"}).json()["items"]] == ["Fingerpicking"]
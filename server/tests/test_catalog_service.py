@@ -0,0 +1,161 @@
+# tests/test_catalog_service.py
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from app.api import catalogService
+from app.api.catalogService import SongCatalogService, normalize_lookup_key, song_catalog
+from app.models import ChordProgression, Instrument, Song, SongAlias, utcnow
+from app.schemas import ChordProgressionRequest
+
+ARRANGEMENT = {
+    "songTitle": "Wonderwall", "artist": "Oasis", "key": "F#m", "instrument": "Guitar",
+    "progressionSummary": ["Em7", "G", "Dsus4", "A7sus4"],
+}
+
+
+@pytest.fixture
+def catalog(db):
+    service = SongCatalogService()
+    service.enabled = True
+    return service
+
+
+def request(query="wonderwall oasis", **fields):
+    return ChordProgressionRequest(songQuery=query, **fields)
+
+
+def test_normalize_lookup_key():
+    assert normalize_lookup_key("Wonderwall – Oasis!") == "wonderwall oasis"
+    assert normalize_lookup_key("  Café   del Mar ") == "cafe del mar"
+    assert normalize_lookup_key(None) == ""
+
+
+def test_save_then_lookup_round_trips(catalog, db):
+    db.add(Instrument(name="Guitar", type="String"))
+    db.commit()
+
+    assert asyncio.run(catalog.lookup(request())) is None
+    asyncio.run(catalog.save(request(), ARRANGEMENT))
+
+    assert asyncio.run(catalog.lookup(request())) == (ARRANGEMENT, False)
+    entry = db.query(ChordProgression).one()
+    assert (entry.variant, entry.progression, entry.skill_level) == ("guitar:simple", "Em7 G Dsus4 A7sus4", "Beginner")
+    assert entry.instrument_id == db.query(Instrument.id).scalar()
+    assert db.query(Song.lookup_key).scalar() == "wonderwall oasis"
+    assert catalog.stats() == {
+        "enabled": True, "hits": 1, "staleHits": 0, "misses": 1, "saves": 1, "refreshing": 0,
+    }
+
+
+def test_variants_are_stored_separately(catalog, db):
+    asyncio.run(catalog.save(request(), ARRANGEMENT))
+
+    assert asyncio.run(catalog.lookup(request(simplify=False))) is None
+    assert asyncio.run(catalog.lookup(request(instrument="Piano"))) is None
+
+    asyncio.run(catalog.save(request(simplify=False), {**ARRANGEMENT, "key": "G"}))
+    assert asyncio.run(catalog.lookup(request(simplify=False)))[0]["key"] == "G"
+    assert asyncio.run(catalog.lookup(request()))[0]["key"] == "F#m"
+    assert db.query(Song).count() == 1
+
+
+def test_queries_resolve_through_aliases(catalog, db):
+    # The model names the song; the user's wording is kept as an alias
+    asyncio.run(catalog.save(request("that oasis song wonderwall"), ARRANGEMENT))
+
+    assert db.query(SongAlias.alias).scalar() == "that oasis song wonderwall"
+    assert asyncio.run(catalog.lookup(request("That Oasis song — Wonderwall!"))) == (ARRANGEMENT, False)
+    # The canonical key finds it too, with no alias of its own
+    assert asyncio.run(catalog.lookup(request("Wonderwall, Oasis"))) == (ARRANGEMENT, False)
+
+    # A second wording of the same song joins it rather than duplicating it
+    asyncio.run(catalog.save(request("wonderwall"), {**ARRANGEMENT, "key": "Em"}))
+    assert db.query(Song).count() == 1
+    assert db.query(SongAlias).count() == 2
+    assert asyncio.run(catalog.lookup(request("that oasis song wonderwall")))[0]["key"] == "Em"
+
+
+def test_old_or_outdated_entries_are_stale(catalog, db, monkeypatch):
+    asyncio.run(catalog.save(request(), ARRANGEMENT))
+    entry = db.query(ChordProgression).one()
+
+    entry.refreshed_at = utcnow() - timedelta(days=catalogService.CATALOG_MAX_AGE_DAYS + 1)
+    db.commit()
+    assert asyncio.run(catalog.lookup(request())) == (ARRANGEMENT, True)
+
+    entry.refreshed_at = utcnow()
+    db.commit()
+    monkeypatch.setattr(catalogService, "CATALOG_VERSION", catalogService.CATALOG_VERSION + 1)
+    assert asyncio.run(catalog.lookup(request()))[1] is True
+
+    # Saving again brings it up to date
+    asyncio.run(catalog.save(request(), ARRANGEMENT))
+    assert asyncio.run(catalog.lookup(request()))[1] is False
+    assert catalog.stats()["staleHits"] == 2
+
+
+def test_disabled_catalog_is_a_no_op(catalog, db):
+    catalog.enabled = False
+
+    asyncio.run(catalog.save(request(), ARRANGEMENT))
+
+    assert asyncio.run(catalog.lookup(request())) is None
+    assert db.query(Song).count() == 0
+
+
+def test_refresh_runs_once_per_song_and_variant(catalog):
+    async def scenario():
+        release = asyncio.Event()
+        runs = []
+
+        async def regenerate():
+            runs.append(1)
+            await release.wait()
+
+        async def broken():
+            raise RuntimeError("upstream down")
+
+        for query in ("Wonderwall, Oasis", "wonderwall oasis"):
+            catalog.schedule_refresh(request(query), regenerate)
+        catalog.schedule_refresh(request(simplify=False), regenerate)
+        await asyncio.sleep(0)
+        assert catalog.stats()["refreshing"] == 2 and len(runs) == 2
+
+        release.set()
+        await asyncio.sleep(0.01)
+        assert catalog.stats()["refreshing"] == 0
+
+        # A failed refresh is logged and may be retried
+        catalog.schedule_refresh(request(), broken)
+        await asyncio.sleep(0.01)
+        assert catalog.stats()["refreshing"] == 0
+        catalog.schedule_refresh(request(), regenerate)
+        await asyncio.sleep(0.01)
+        assert len(runs) == 3
+
+    asyncio.run(scenario())
+
+
+def test_stale_hit_is_served_and_refreshed_in_the_background(client, db, monkeypatch):
+    monkeypatch.setattr(song_catalog, "enabled", True)
+    asyncio.run(song_catalog.save(request(), ARRANGEMENT))
+    entry = db.query(ChordProgression).one()
+    entry.refreshed_at = utcnow() - timedelta(days=catalogService.CATALOG_MAX_AGE_DAYS + 1)
+    db.commit()
+    scheduled = []
+    monkeypatch.setattr(song_catalog, "schedule_refresh", lambda req, regenerate: scheduled.append(req.songQuery))
+
+    response = client.post("/ai/chords", json={"songQuery": "Wonderwall – Oasis"})
+
+    assert response.status_code == 200
+    assert response.json()["songTitle"] == "Wonderwall"
+    assert [d["chord"] for d in response.json()["chordDiagrams"]] == ARRANGEMENT["progressionSummary"]
+    assert scheduled == ["Wonderwall – Oasis"]
+
+    # A fresh entry is served without a refresh
+    entry.refreshed_at = utcnow()
+    db.commit()
+    assert client.post("/ai/chords", json={"songQuery": "wonderwall oasis"}).status_code == 200
+    assert scheduled == ["Wonderwall – Oasis"]
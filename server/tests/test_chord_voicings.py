@@ -0,0 +1,137 @@
+# tests/test_chord_voicings.py
+import pytest
+
+from app.api.chordVoicings import (
+    chord_diagram, chord_diagrams, fretted_voicing, resolve_tuning, split_chord, warm_voicing_table,
+)
+from app.api.geminiService import gemini_music_service
+from app.schemas import ChordDiagram
+
+
+@pytest.mark.parametrize("chord, frets, fingers", [
+    ("C", ["X", 3, 2, 0, 1, 0], [None, 3, 2, 0, 1, 0]),
+    ("G", [3, 2, 0, 0, 0, 3], [2, 1, 0, 0, 0, 3]),
+    ("D", ["X", "X", 0, 2, 3, 2], [None, None, 0, 1, 3, 2]),
+    ("Am", ["X", 0, 2, 2, 1, 0], [None, 0, 2, 3, 1, 0]),
+    ("E", [0, 2, 2, 1, 0, 0], [0, 2, 3, 1, 0, 0]),
+    ("F", [1, 3, 3, 2, 1, 1], [1, 3, 4, 2, 1, 1]),
+    ("B7", ["X", 2, 1, 2, 0, 2], [None, 2, 1, 3, 0, 4]),
+])
+def test_standard_guitar_shapes(chord, frets, fingers):
+    diagram = chord_diagram(chord)
+
+    assert (diagram["frets"], diagram["fingers"]) == (frets, fingers)
+    ChordDiagram.model_validate(diagram)
+
+
+def frets(symbol: str, instrument: str = "Guitar", tuning: str = None, capo: int = 0) -> str:
+    return "".join("x" if f == "X" else str(f) for f in chord_diagram(symbol, instrument, tuning, capo)["frets"])
+
+
+@pytest.mark.parametrize("chord, shape", [
+    # Barre shapes rather than open strings mixed into fretted ones
+    ("Bm", "x24432"),
+    ("B", "x24442"),
+    ("F#m", "244222"),
+    ("Bb", "x13331"),
+    # Slash chords keep a full bass, not a three-string top
+    ("C/G", "332010"),
+    ("G/B", "x20003"),
+    ("D/F#", "200232"),
+])
+def test_scoring_prefers_standard_shapes(chord, shape):
+    assert frets(chord) == shape
+
+
+def test_drop_d_uses_the_low_string_without_a_wide_stretch():
+    assert frets("G", "Guitar", "Drop D") == "555433"
+    assert frets("D", "Guitar", "Drop D") == "000232"
+    assert frets("Bm", "Guitar", "Drop D") == "x24432"
+
+
+def test_warmed_table_covers_capo_and_alternate_tunings():
+    warm_voicing_table()
+    misses = fretted_voicing.cache_info().misses
+
+    chord_diagram("Bm", "Guitar", capo=2)
+    chord_diagram("G", "Guitar", "Drop D")
+    chord_diagram("C/E", "Guitar", "Open G")
+    chord_diagram("Am", "Ukulele", "Low G")
+    assert fretted_voicing.cache_info().misses == misses
+
+
+def test_capo_uses_the_shape_a_capo_lower():
+    diagram = chord_diagram("C", "Guitar", capo=3)
+
+    assert diagram["capoFret"] == 3
+    assert diagram["frets"] == chord_diagram("A")["frets"]
+    assert diagram["notes"][0] == "C3"
+
+
+def test_alternate_tunings():
+    assert resolve_tuning("Guitar", "Drop D") == resolve_tuning("Guitar", "D A D G B E")
+    assert resolve_tuning("Guitar", "Standard (E A D G B E)") == (40, 45, 50, 55, 59, 64)
+    assert resolve_tuning("Ukulele", "E A D G B E") == (67, 60, 64, 69)
+    assert chord_diagram("D", "Guitar", "Drop D")["frets"][:3] == [0, 0, 0]
+
+
+def test_ukulele_and_piano():
+    assert chord_diagram("C", "Ukulele")["frets"] == [0, 0, 0, 3]
+    assert chord_diagram("G", "Ukulele")["frets"] == [0, 2, 3, 2]
+
+    piano = chord_diagram("Am7", "Piano")
+    assert piano["notes"] == ["A3", "C4", "E4", "G4"]
+    assert piano["fingers"] == [1, 2, 3, 5]
+
+
+def test_unknown_extensions_fall_back_and_duplicates_collapse():
+    assert split_chord("C7b9") == (0, "7", None)
+    assert split_chord("Bbmaj7/F") == (10, "maj7", 5)
+    assert split_chord("N.C.") is None
+    assert split_chord("Bridge") is None and split_chord("Chorus") is None
+    assert [d["chord"] for d in chord_diagrams(["C", "G", "C", "N.C.", "Am"])] == ["C", "G", "Am"]
+
+
+def test_legacy_muted_frets_validate():
+    diagram = ChordDiagram.model_validate({"chord": "C", "frets": [-1, 3, 2, 0, 1, 0], "fingers": [0, 3, 2, 0, 1, 0]})
+    assert diagram.frets[0] == "X"
+
+
+def test_chords_endpoint_fills_diagrams_locally(client, db, monkeypatch):
+    async def arrangement(request):
+        return {
+            "songTitle": "Voicing Test", "artist": "Tester", "key": "G", "instrument": "Ukulele",
+            "tuning": "G C E A", "progressionSummary": ["G", "Em", "C", "D"],
+            "chordDiagrams": [{"chord": "G", "frets": [-1, 0, 0, 0], "fingers": [0, 0, 0, 0]}],
+        }
+    monkeypatch.setattr(gemini_music_service, "available", True)
+    monkeypatch.setattr(gemini_music_service, "generateSongArrangement", arrangement)
+
+    response = client.post("/ai/chords", json={"songQuery": "voicing test song", "instrument": "Ukulele"})
+
+    assert response.status_code == 200
+    diagrams = response.json()["chordDiagrams"]
+    assert [d["chord"] for d in diagrams] == ["G", "Em", "C", "D"]
+    assert diagrams[0]["frets"] == [0, 2, 3, 2]
+
+
+def test_startup_does_not_wait_for_the_voicing_table(monkeypatch):
+    import threading
+    from fastapi.testclient import TestClient
+    from app import main
+
+    release, started = threading.Event(), threading.Event()
+
+    def slow_warm():
+        started.set()
+        release.wait(5)
+        return 0
+
+    monkeypatch.setattr(main, "warm_voicing_table", slow_warm)
+    try:
+        with TestClient(main.app) as client:
+            assert started.wait(5)
+            assert not main.app.state.voicing_warmup.done()
+            assert client.get("/health").status_code == 200
+    finally:
+        release.set()
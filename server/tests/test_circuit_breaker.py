@@ -0,0 +1,110 @@
+# tests/test_circuit_breaker.py
+import pytest
+
+from app.api import circuitBreaker
+from app.api.circuitBreaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(circuitBreaker.time, "monotonic", lambda: now[0])
+    return now
+
+
+def breaker():
+    return CircuitBreaker("test", error_threshold=0.5, window=4, min_requests=3, cooldown=30)
+
+
+def test_trips_on_error_rate_once_enough_calls(clock):
+    b = breaker()
+    b.record_failure()
+    b.record_failure()
+    assert b.state == CLOSED  # below min_requests
+
+    b.record_success()
+    b.record_failure()
+    assert b.state == OPEN
+    assert b.snapshot()["tripCount"] == 1
+    assert not b.allow()
+
+
+def test_successes_keep_it_closed(clock):
+    b = breaker()
+    for outcome in (True, True, False, True, True, True, False):
+        b.record_success() if outcome else b.record_failure()
+
+    assert b.state == CLOSED
+    assert b.error_rate() == 0.25  # rolling window of the last 4
+
+
+def test_half_open_allows_a_single_trial(clock):
+    b = breaker()
+    for _ in range(3):
+        b.record_failure()
+    clock[0] += 30
+
+    assert b.allow()
+    assert b.state == HALF_OPEN
+    assert not b.allow()
+
+    b.record_failure()
+    assert b.state == OPEN and b.snapshot()["tripCount"] == 2
+
+    clock[0] += 30
+    assert b.allow()
+    b.record_success()
+    assert b.state == CLOSED
+    assert b.snapshot()["windowSize"] == 1
+
+
+def test_release_frees_the_trial_slot(clock):
+    b = breaker()
+    for _ in range(3):
+        b.record_failure()
+    clock[0] += 30
+    assert b.allow()
+
+    # The trial was cancelled without an outcome
+    b.release()
+
+    assert b.state == HALF_OPEN
+    assert b.allow()
+
+
+def test_snapshot_reports_time_until_retry(clock):
+    b = breaker()
+    for _ in range(3):
+        b.record_failure()
+    clock[0] += 10
+
+    assert b.snapshot()["retryInSeconds"] == 20
+
+
+def test_calls_started_before_a_trip_do_not_re_trip_it(clock):
+    b = breaker()
+    in_flight = [clock[0] - 1] * 5  # five calls to a provider that then went down
+    for started in in_flight[:3]:
+        b.record_failure(started)
+    assert b.state == OPEN
+    opened_at = b.opened_at
+
+    # The rest fail later, while open: no new trip, no longer cool-down
+    clock[0] += 5
+    b.record_failure(in_flight[3])
+    b.record_failure()
+    assert b.snapshot()["tripCount"] == 1
+    assert b.opened_at == opened_at
+    assert b.snapshot()["retryInSeconds"] == 25
+
+    # Nor does a straggler decide (or free) the half-open trial
+    clock[0] += 25
+    assert b.allow()
+    trial_started = clock[0]
+    b.record_failure(in_flight[4])
+    b.release(in_flight[4])
+    assert b.state == HALF_OPEN and not b.allow()
+
+    b.record_success(trial_started)
+    assert b.state == CLOSED
+    assert b.snapshot() == {"state": CLOSED, "tripCount": 1, "errorRate": 0.0, "windowSize": 1, "retryInSeconds": None}
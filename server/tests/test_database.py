@@ -0,0 +1,87 @@
+# tests/test_database.py
+import asyncio
+
+import pytest
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import async_database_url, async_engine
+from app.dependencies import get_db
+from app.models import Song
+
+
+def test_async_database_url_picks_the_async_driver():
+    assert async_database_url("sqlite:///tmp/x.db") == "sqlite+aiosqlite:///tmp/x.db"
+    assert async_database_url("postgres://u:p@h/db") == "postgresql+asyncpg://u:p@h/db"
+    assert (async_database_url("postgresql+psycopg2://u:p@h/db?sslmode=require")
+            == "postgresql+asyncpg://u:p@h/db?ssl=require")
+    with pytest.raises(ValueError):
+        async_database_url("mysql://u:p@h/db")
+
+
+def run(coro):
+    """asyncio.run, then drop pooled aiosqlite connections: they belong to
+    this event loop (and their worker threads would keep the process up)."""
+    async def main():
+        try:
+            return await coro
+        finally:
+            await async_engine.dispose()
+    return asyncio.run(main())
+
+
+async def _with_db(work):
+    """Drive get_db the way FastAPI does: take the yielded session, then
+    close the generator."""
+    dependency = get_db()
+    session = await dependency.__anext__()
+    try:
+        return session, await work(session)
+    finally:
+        await dependency.aclose()
+
+
+def test_get_db_yields_an_aiosqlite_session(db):
+    async def work(session):
+        session.add(Song(title="Jolene", artist="Dolly Parton"))
+        await session.commit()
+        return await session.scalar(select(func.count()).select_from(Song))
+
+    session, count = run(_with_db(work))
+
+    assert isinstance(session, AsyncSession)
+    assert async_engine.dialect.driver == "aiosqlite"
+    assert count == 1
+    # Committed through the async engine, visible to the sync one
+    assert db.query(Song).one().title == "Jolene"
+
+
+def test_get_db_discards_uncommitted_work_and_runs_sync_code(db):
+    async def work(session):
+        session.add(Song(title="Draft"))
+        await session.flush()
+        # Services written against Session run through run_sync
+        return await session.run_sync(lambda sync: sync.query(Song).count())
+
+    session, count = run(_with_db(work))
+
+    assert count == 1
+    assert not session.in_transaction()
+    assert db.query(Song).count() == 0
+
+
+def test_concurrent_requests_get_separate_sessions(db):
+    async def insert(title):
+        async def work(session):
+            session.add(Song(title=title))
+            await session.commit()
+        session, _ = await _with_db(work)
+        return session
+
+    async def main():
+        return await asyncio.gather(*(insert(f"Song {i}") for i in range(5)))
+
+    sessions = run(main())
+
+    assert len({id(session) for session in sessions}) == 5
+    assert db.query(Song).count() == 5
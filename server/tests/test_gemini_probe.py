@@ -0,0 +1,129 @@
+# tests/test_gemini_probe.py
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.api import geminiService
+from app.api.geminiService import GeminiMusicService
+
+
+class FakeModel:
+    """Stands in for genai.GenerativeModel; replies (or raises) from `replies`
+    in turn, repeating the last one."""
+
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.calls = 0
+
+    async def generate_content_async(self, prompt, **kwargs):
+        reply = self.replies[min(self.calls, len(self.replies) - 1)]
+        self.calls += 1
+        if isinstance(reply, Exception):
+            raise reply
+        if isinstance(reply, float):
+            await asyncio.sleep(reply)
+            return SimpleNamespace(text="OK")
+        return SimpleNamespace(text=reply)
+
+
+@pytest.fixture
+def genai(monkeypatch):
+    """A stubbed genai module recording configure() and model creation."""
+    stub = SimpleNamespace(configured_with=[], models=[], replies=["OK"])
+
+    def GenerativeModel(name):
+        model = FakeModel(stub.replies)
+        stub.models.append((name, model))
+        return model
+
+    stub.configure = lambda api_key: stub.configured_with.append(api_key)
+    stub.GenerativeModel = GenerativeModel
+    monkeypatch.setattr(geminiService, "genai", stub)
+    monkeypatch.setattr(geminiService, "GEMINI_API_KEY", "test-key")
+    monkeypatch.setattr(geminiService, "GEMINI_EXECUTION_MODE", "async")
+    return stub
+
+
+def test_model_is_created_lazily_once(genai):
+    service = GeminiMusicService()
+    assert service.model is None and genai.models == []
+
+    asyncio.run(service.probe())
+    asyncio.run(service.probe())
+
+    assert genai.configured_with == ["test-key"]
+    assert [name for name, _ in genai.models] == ["gemini-2.0-flash"]
+    assert genai.models[0][1].calls == 2
+
+
+def test_unknown_until_the_first_probe_then_ready(genai):
+    service = GeminiMusicService()
+    # A configured key is assumed usable before the first probe
+    assert service.available and service.status()["lastProbeAt"] is None
+
+    assert asyncio.run(service.probe()) is True
+
+    status = service.status()
+    assert status["available"] and status["lastProbeAt"] is not None
+    assert status["lastProbeError"] is None
+
+
+@pytest.mark.parametrize("reply, error", [
+    (ConnectionError("connection refused"), "connection refused"),
+    ("Hello!", "Unexpected probe reply"),
+])
+def test_failed_probe_marks_it_unavailable(genai, reply, error):
+    genai.replies = [reply]
+    service = GeminiMusicService()
+
+    assert asyncio.run(service.probe()) is False
+
+    assert not service.available
+    assert service.last_probe_error == error
+
+
+def test_probe_times_out(genai, monkeypatch):
+    monkeypatch.setattr(geminiService, "GEMINI_PROBE_TIMEOUT", 0.01)
+    genai.replies = [1.0]
+    service = GeminiMusicService()
+
+    assert asyncio.run(service.probe()) is False
+    assert service.last_probe_error == "TimeoutError"
+
+
+def test_missing_key_is_never_available(genai, monkeypatch):
+    monkeypatch.setattr(geminiService, "GEMINI_API_KEY", None)
+    service = GeminiMusicService()
+
+    assert not service.available
+    assert asyncio.run(service.probe()) is False
+    assert genai.models == []
+    service.start_readiness_probe()  # no key, no loop
+    assert service._probe_task is None
+
+
+def test_probe_loop_recovers_on_a_later_probe(genai, monkeypatch):
+    monkeypatch.setattr(geminiService, "GEMINI_PROBE_INTERVAL", 0)
+    genai.replies = [ConnectionError("down"), ConnectionError("down"), "OK"]
+    service = GeminiMusicService()
+    history = []
+    probe = service.probe
+
+    async def recording_probe():
+        history.append(await probe())
+        return history[-1]
+
+    service.probe = recording_probe
+
+    async def run():
+        service.start_readiness_probe()
+        while len(history) < 4:
+            await asyncio.sleep(0)
+        await service.stop_readiness_probe()
+
+    asyncio.run(run())
+
+    assert history[:4] == [False, False, True, True]
+    assert service.available and service.last_probe_error is None
+    assert service._probe_task is None
@@ -0,0 +1,129 @@
+# tests/test_grok_retries.py
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app.api import grokService
+from app.api.grokService import GrokRetryableError, GrokService, _backoff_delay, _parse_retry_after
+
+
+@pytest.fixture
+def backoff(monkeypatch):
+    monkeypatch.setattr(grokService, "GROK_BACKOFF_BASE", 0.5)
+    monkeypatch.setattr(grokService, "GROK_BACKOFF_MAX", 8.0)
+
+
+def test_full_jitter_stays_within_the_exponential_ceiling(backoff, monkeypatch):
+    bounds = []
+    monkeypatch.setattr(grokService.random, "uniform", lambda low, high: bounds.append((low, high)) or high)
+
+    delays = [_backoff_delay(attempt) for attempt in range(6)]
+
+    assert bounds == [(0, 0.5), (0, 1.0), (0, 2.0), (0, 4.0), (0, 8.0), (0, 8.0)]
+    assert delays == [0.5, 1.0, 2.0, 4.0, 8.0, 8.0]
+
+
+def test_jitter_is_random_below_the_ceiling(backoff):
+    delays = [_backoff_delay(3) for _ in range(200)]
+
+    assert all(0 <= delay <= 4.0 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_retry_after_wins_but_is_capped(backoff):
+    assert _backoff_delay(0, retry_after=3.0) == 3.0
+    assert _backoff_delay(5, retry_after=0.0) == 0.0
+    assert _backoff_delay(0, retry_after=120.0) == 8.0
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("5", 5.0),
+    ("2.5", 2.5),
+    ("-3", 0.0),
+    ("", None),
+    (None, None),
+    ("soon", None),
+])
+def test_parse_retry_after_seconds(value, expected):
+    assert _parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_http_date():
+    later = datetime.now(timezone.utc) + timedelta(seconds=30)
+    earlier = datetime.now(timezone.utc) - timedelta(seconds=30)
+
+    assert 28 <= _parse_retry_after(format_datetime(later, usegmt=True)) <= 30
+    assert _parse_retry_after(format_datetime(earlier, usegmt=True)) == 0.0
+
+
+def grok_with(monkeypatch, responses):
+    """A GrokService whose HTTP calls return `responses` in turn; records
+    the requests made and the backoff sleeps taken."""
+    calls, waits = [], []
+
+    def handler(request):
+        calls.append(request)
+        return responses[min(len(calls), len(responses)) - 1]
+
+    async def sleep(seconds):
+        waits.append(seconds)
+
+    monkeypatch.setattr(grokService, "asyncio", SimpleNamespace(sleep=sleep))
+    service = GrokService()
+    service.headers = {"Authorization": "Bearer test"}
+    service._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return service, calls, waits
+
+
+def ok(text="done"):
+    return httpx.Response(200, json={"choices": [{"message": {"content": text}}]})
+
+
+@pytest.mark.parametrize("status", [429, 500, 502, 503])
+def test_rate_limits_and_server_errors_are_retried(backoff, monkeypatch, status):
+    service, calls, waits = grok_with(monkeypatch, [
+        httpx.Response(status, headers={"Retry-After": "1.5"}), ok(),
+    ])
+
+    assert asyncio.run(service._call_grok("hi")) == "done"
+    assert len(calls) == 2
+    assert waits == [1.5]
+
+
+@pytest.mark.parametrize("status", [400, 401, 404, 422])
+def test_client_errors_are_not_retried(backoff, monkeypatch, status):
+    service, calls, waits = grok_with(monkeypatch, [httpx.Response(status), ok()])
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(service._call_grok("hi"))
+    assert len(calls) == 1 and waits == []
+
+
+def test_gives_up_after_the_last_retry(backoff, monkeypatch):
+    service, calls, waits = grok_with(monkeypatch, [httpx.Response(503)])
+
+    with pytest.raises(GrokRetryableError) as error:
+        asyncio.run(service._call_grok("hi", retries=2))
+    assert "503" in str(error.value)
+    assert len(calls) == 3 and len(waits) == 2
+    assert all(0 <= wait <= 8.0 for wait in waits)
+
+
+def test_transport_errors_are_retried(backoff, monkeypatch):
+    attempts = []
+
+    def handler(request):
+        attempts.append(request)
+        if len(attempts) == 1:
+            raise httpx.ConnectError("connection reset")
+        return ok()
+
+    service, _, waits = grok_with(monkeypatch, [ok()])
+    service._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    assert asyncio.run(service._call_grok("hi")) == "done"
+    assert len(attempts) == 2 and len(waits) == 1
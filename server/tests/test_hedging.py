@@ -0,0 +1,143 @@
+# tests/test_hedging.py
+import asyncio
+import time
+
+import pytest
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+from app.api.circuitBreaker import CircuitBreaker, provider_breakers
+from app.api.geminiService import gemini_music_service
+from app.api.providerLimiter import ProviderBusyError
+from app.routers import ai
+
+BUDGET = 0.05
+
+
+class Reply(BaseModel):
+    text: str
+
+
+@pytest.fixture
+def endpoint(monkeypatch):
+    """A hedged test endpoint with fresh circuits for both providers."""
+    name = "hedge-test"
+    monkeypatch.setattr(ai, "AI_HEDGE_ENABLED", True)
+    monkeypatch.setitem(ai.AI_HEDGE_BUDGETS, name, BUDGET)
+    monkeypatch.setattr(gemini_music_service, "available", True)
+    for provider in ("gemini", "grok"):
+        monkeypatch.setitem(provider_breakers, provider, CircuitBreaker(
+            provider, error_threshold=0.5, window=10, min_requests=3, cooldown=60))
+    yield name
+    ai.dispatch_stats.pop(name, None)
+
+
+class Provider:
+    """Fake provider call: waits `delay`, then returns `reply` or raises it.
+    Records when it started and whether it was cancelled."""
+
+    def __init__(self, delay: float, reply):
+        self.delay = delay
+        self.reply = reply
+        self.started_at = None
+        self.cancelled = False
+
+    async def __call__(self):
+        self.started_at = time.monotonic()
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if isinstance(self.reply, Exception):
+            raise self.reply
+        return self.reply
+
+
+def dispatch(endpoint, gemini, grok):
+    async def run():
+        started = time.monotonic()
+        result = await ai._try_gemini_first(endpoint, Reply, gemini, grok)
+        # Let cancelled tasks finish unwinding
+        await asyncio.sleep(0)
+        return result, started
+    return asyncio.run(run())
+
+
+def test_fast_gemini_never_starts_grok(endpoint):
+    gemini, grok = Provider(0, {"text": "gemini"}), Provider(0, {"text": "grok"})
+
+    result, _ = dispatch(endpoint, gemini, grok)
+
+    assert result.text == "gemini"
+    assert grok.started_at is None
+    stats = ai.dispatch_stats[endpoint]
+    assert (stats["hedged"], stats["wins"]["gemini"]) == (0, 1)
+
+
+def test_grok_starts_when_the_budget_runs_out_and_the_winner_cancels_the_loser(endpoint):
+    gemini, grok = Provider(5, {"text": "gemini"}), Provider(0, {"text": "grok"})
+
+    result, started = dispatch(endpoint, gemini, grok)
+
+    assert result.text == "grok"
+    assert grok.started_at - started >= BUDGET
+    assert gemini.cancelled
+    stats = ai.dispatch_stats[endpoint]
+    assert (stats["requests"], stats["hedged"], stats["wins"]["grok"]) == (1, 1, 1)
+
+
+def test_slow_gemini_still_wins_if_it_answers_first(endpoint):
+    gemini, grok = Provider(BUDGET * 2, {"text": "gemini"}), Provider(5, {"text": "grok"})
+
+    result, _ = dispatch(endpoint, gemini, grok)
+
+    assert result.text == "gemini"
+    assert grok.started_at is not None and grok.cancelled
+    stats = ai.dispatch_stats[endpoint]
+    assert (stats["hedged"], stats["wins"]["gemini"]) == (1, 1)
+
+
+def test_early_gemini_failure_starts_grok_at_once(endpoint):
+    gemini, grok = Provider(0, ConnectionError("reset")), Provider(0, {"text": "grok"})
+
+    result, started = dispatch(endpoint, gemini, grok)
+
+    assert result.text == "grok"
+    assert grok.started_at - started < BUDGET
+    stats = ai.dispatch_stats[endpoint]
+    assert (stats["hedged"], stats["wins"]["grok"]) == (0, 1)
+
+
+def test_invalid_grok_reply_falls_back_to_gemini(endpoint):
+    gemini, grok = Provider(BUDGET * 3, {"text": "gemini"}), Provider(0, {"wrong": "shape"})
+
+    result, _ = dispatch(endpoint, gemini, grok)
+
+    assert result.text == "gemini"
+    stats = ai.dispatch_stats[endpoint]
+    assert stats["invalid"] == {"gemini": 0, "grok": 1}
+    assert (stats["hedged"], stats["wins"]["gemini"]) == (1, 1)
+
+
+def test_both_failing_is_503(endpoint):
+    gemini, grok = Provider(0, ValueError("empty reply")), Provider(0, ConnectionError("reset"))
+
+    with pytest.raises(HTTPException) as error:
+        dispatch(endpoint, gemini, grok)
+
+    assert error.value.status_code == 503
+    stats = ai.dispatch_stats[endpoint]
+    assert (stats["failures"], stats["invalid"]["gemini"]) == (1, 1)
+
+
+def test_busy_provider_fails_over_without_tripping_its_circuit(endpoint):
+    gemini = Provider(0, ProviderBusyError("Gemini queue is full"))
+    grok = Provider(0, {"text": "grok"})
+
+    for _ in range(5):
+        result, _ = dispatch(endpoint, gemini, grok)
+        assert result.text == "grok"
+
+    snapshot = provider_breakers["gemini"].snapshot()
+    assert (snapshot["state"], snapshot["windowSize"]) == ("closed", 0)
@@ -0,0 +1,134 @@
+# tests/test_job_queue.py
+import asyncio
+from datetime import timedelta
+
+import pytest
+from pydantic import BaseModel
+
+from app.api import jobService
+from app.api.jobService import JobQueue, QueueFullError, retry_delay, QUEUED, RUNNING, SUCCEEDED, FAILED
+from app.models import AIJob, utcnow
+
+
+class Echo(BaseModel):
+    value: int
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(jobService, "retry_delay", lambda attempts: 0)
+
+
+def test_jobs_persist_and_complete(db):
+    async def scenario():
+        queue = JobQueue()
+        await queue.start({"echo": lambda params, cc: asyncio.sleep(0, Echo(value=params["x"]))})
+        job = await queue.submit("echo", {"x": 7}, priority=5)
+        done = await queue.wait(job["id"], timeout=5)
+        await queue.stop()
+        return done
+
+    done = run(scenario())
+
+    assert (done["status"], done["result"], done["attempts"]) == (SUCCEEDED, {"value": 7}, 1)
+    assert db.get(AIJob, done["id"]).expires_at is not None
+
+
+def test_retryable_failures_back_off_and_retry(db, no_backoff):
+    calls = []
+
+    async def flaky(params, cc):
+        calls.append(params)
+        if len(calls) < 3:
+            raise RuntimeError("upstream reset")
+        return Echo(value=len(calls))
+
+    async def scenario():
+        queue = JobQueue()
+        await queue.start({"flaky": flaky, "bad": lambda params, cc: asyncio.sleep(0, params["missing"])})
+        flaky_job = await queue.submit("flaky", {}, priority=5)
+        bad_job = await queue.submit("bad", {}, priority=5)
+        results = [await queue.wait(flaky_job["id"], 5), await queue.wait(bad_job["id"], 5)]
+        await queue.stop()
+        return queue, results
+
+    queue, (flaky_done, bad_done) = run(scenario())
+
+    assert (flaky_done["status"], flaky_done["attempts"], queue.retried) == (SUCCEEDED, 3, 2)
+    # KeyError: the request itself is bad, retrying can't help
+    assert (bad_done["status"], bad_done["attempts"]) == (FAILED, 1)
+    assert [retry_delay(n) for n in (1, 2, 3, 10)] == [2, 4, 8, 60]
+
+
+def test_concurrent_submits_never_overflow_the_queue(db, monkeypatch):
+    monkeypatch.setattr(jobService, "AI_JOB_QUEUE_SIZE", 2)
+
+    async def scenario():
+        queue = JobQueue()  # no workers, so nothing drains
+        return await asyncio.gather(*(queue.submit("echo", {}, 5) for _ in range(5)), return_exceptions=True)
+
+    results = run(scenario())
+
+    assert sum(isinstance(r, QueueFullError) for r in results) == 3
+    assert db.query(AIJob).filter(AIJob.status == QUEUED).count() == 2
+
+
+def test_a_job_is_claimed_once(db):
+    calls = []
+
+    async def handler(params, cc):
+        calls.append(params)
+        await asyncio.sleep(0.01)
+        return Echo(value=1)
+
+    async def scenario():
+        # Two processes that recovered the same job
+        first, second = JobQueue(), JobQueue()
+        first._handlers = second._handlers = {"echo": handler}
+        job = await first.submit("echo", {}, 5)
+        await asyncio.gather(first._run(job["id"]), second._run(job["id"]))
+        return await first.get(job["id"])
+
+    job = run(scenario())
+
+    assert len(calls) == 1
+    assert (job["status"], job["attempts"]) == (SUCCEEDED, 1)
+
+
+def test_restart_recovers_queued_and_stale_running_jobs(db):
+    db.add_all([
+        AIJob(id="queued", type="echo", params="{}", status=QUEUED, priority=5, attempts=0),
+        AIJob(id="stale", type="echo", params="{}", status=RUNNING, priority=5, attempts=1,
+              updated_at=utcnow() - timedelta(hours=1)),
+        AIJob(id="busy", type="echo", params="{}", status=RUNNING, priority=5, attempts=1),
+    ])
+    db.commit()
+
+    async def scenario():
+        queue = JobQueue()
+        await queue.start({"echo": lambda params, cc: asyncio.sleep(0, Echo(value=1))})
+        jobs = [await queue.wait(job_id, 5) for job_id in ("queued", "stale")]
+        jobs.append(await queue.get("busy"))
+        await queue.stop()
+        return jobs
+
+    queued, stale, busy = run(scenario())
+
+    assert (queued["status"], stale["status"], stale["attempts"]) == (SUCCEEDED, SUCCEEDED, 2)
+    assert busy["status"] == RUNNING
+
+
+def test_waiters_that_time_out_leave_nothing_behind(db):
+    async def scenario():
+        queue = JobQueue()  # no workers: the job never finishes
+        job = await queue.submit("echo", {}, 5)
+        await asyncio.gather(*(queue.wait(job["id"], 0.01) for _ in range(3)))
+        return queue
+
+    queue = run(scenario())
+
+    assert queue._done_events == {} and queue._waiters == {}
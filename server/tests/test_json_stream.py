@@ -0,0 +1,58 @@
+# tests/test_json_stream.py
+import pytest
+
+from app.api.jsonStream import StreamingJSONScanner, extract_json
+
+
+def scan(text: str, step: int = 1, **keys):
+    scanner = StreamingJSONScanner(**keys)
+    events = []
+    for i in range(0, len(text), step):
+        events += scanner.feed(text[i:i + step])
+    return scanner, events
+
+
+@pytest.mark.parametrize("step", [1, 3, 1000])
+def test_streams_items_and_text(step):
+    text = 'Sure! {"tablature": [{"section": "V"}, {"section": "C"}], "lesson": "Play \\"slow\\"", "key": "G"} done'
+
+    scanner, events = scan(text, step, item_keys=["tablature"], text_keys=["lesson"])
+
+    assert [e for e in events if e[0] == "item"] == [
+        ("item", "tablature", {"section": "V"}), ("item", "tablature", {"section": "C"}),
+    ]
+    assert "".join(e[2] for e in events if e[0] == "text") == 'Play "slow"'
+    assert scanner.result()["key"] == "G"
+
+
+@pytest.mark.parametrize("prose", [
+    "Here is {your} arrangement: ",
+    "Use {braces} and { this } too: ",
+    'Quoted {"your"} song: ',
+])
+def test_braces_in_prose_before_the_json(prose):
+    scanner, _ = scan(prose + '{"songTitle": "Hey {Jude}"}')
+
+    assert scanner.result() == {"songTitle": "Hey {Jude}"}
+
+
+def test_unfinished_stream_raises():
+    scanner, _ = scan('{"songTitle": "x", "tablature": [')
+
+    assert not scanner.done
+    with pytest.raises(ValueError):
+        scanner.result()
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('Here you go:\n{"key": "G", "capoFret": 0}\nEnjoy!', {"key": "G", "capoFret": 0}),
+    ('```json\n{"key": "G"}\n```', {"key": "G"}),
+    ('{"a": {"b": [1, "}"]}} and then {"c": 2}', {"a": {"b": [1, "}"]}}),
+    ("{x} " * 20 + '{"ok": true}', {"ok": True}),
+    ('{"tablature": [{"section": "V", "lines": []}],}', None),
+    ('{"songTitle": "x", "tablature": [{"section": "V"}', None),
+    ("no json here", None),
+    ("", None),
+])
+def test_extract_json(text, expected):
+    assert extract_json(text) == expected
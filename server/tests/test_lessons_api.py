@@ -0,0 +1,20 @@
+# tests/test_lessons_api.py
+from app.models import Instrument
+
+
+def test_create_lesson_checks_the_instrument(client, db):
+    guitar = Instrument(name="Guitar", type="String")
+    db.add(guitar)
+    db.commit()
+    lesson = {"title": "Barre chords", "lesson_type": "Technique", "instrument_id": guitar.id}
+
+    response = client.post("/lessons/", params=lesson)
+    assert response.status_code == 200
+    assert response.json()["instrument_id"] == guitar.id
+
+    # Only a real (title, instrument) duplicate is a conflict
+    assert client.post("/lessons/", params=lesson).status_code == 409
+
+    missing = client.post("/lessons/", params={**lesson, "instrument_id": guitar.id + 100})
+    assert missing.status_code == 404
+    assert missing.json()["detail"] == "Instrument not found"
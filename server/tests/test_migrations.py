@@ -0,0 +1,87 @@
+# tests/test_migrations.py
+import os
+
+import pytest
+import sqlalchemy as sa
+from alembic import command
+from alembic.config import Config
+
+SERVER_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+@pytest.fixture
+def alembic_db(tmp_path):
+    url = f"sqlite:///{tmp_path / 'migrations.db'}"
+    config = Config(os.path.join(SERVER_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(SERVER_DIR, "migrations"))
+    config.set_main_option("sqlalchemy.url", url)
+    engine = sa.create_engine(url)
+    yield config, engine
+    engine.dispose()
+
+
+def test_natural_keys_merge_existing_duplicates(alembic_db):
+    config, engine = alembic_db
+    command.upgrade(config, "9a4d6b2e8c51")
+    with engine.begin() as conn:
+        conn.execute(sa.text(
+            "INSERT INTO instruments (id, name) VALUES (1, 'Guitar'), (2, 'Piano'), (3, 'Guitar')"
+        ))
+        conn.execute(sa.text("INSERT INTO users (id, name, email, password) VALUES (1, 'Ann', 'ann@example.com', 'x')"))
+        conn.execute(sa.text("INSERT INTO user_instruments (user_id, instrument_id) VALUES (1, 1), (1, 3)"))
+        # Duplicate only once the instruments are merged
+        conn.execute(sa.text(
+            "INSERT INTO lessons (id, title, instrument_id) VALUES (1, 'Barre chords', 1), (2, 'Barre chords', 3)"
+        ))
+        conn.execute(sa.text(
+            "INSERT INTO practice_sessions (user_id, lesson_id, duration_minutes) VALUES (1, 1, 10), (1, 2, 20)"
+        ))
+        conn.execute(sa.text(
+            "INSERT INTO practice_rollups (user_id, day, lesson_id, song_id, minutes, session_count) "
+            "VALUES (1, '2026-10-01', 1, 0, 10, 1), (1, '2026-10-01', 2, 0, 20, 1), (1, '2026-10-02', 2, 0, 5, 1)"
+        ))
+        conn.execute(sa.text("INSERT INTO songs (id, title, artist) VALUES (1, 'Wonderwall', 'Oasis')"))
+
+    command.upgrade(config, "c3e8f1a5d920")
+
+    with engine.connect() as conn:
+        def rows(sql):
+            return [tuple(row) for row in conn.execute(sa.text(sql))]
+        assert rows("SELECT id, name FROM instruments ORDER BY id") == [(1, "Guitar"), (2, "Piano")]
+        assert rows("SELECT user_id, instrument_id FROM user_instruments") == [(1, 1)]
+        assert rows("SELECT id, instrument_id FROM lessons") == [(1, 1)]
+        assert rows("SELECT lesson_id, duration_minutes FROM practice_sessions ORDER BY id") == [(1, 10), (1, 20)]
+        assert rows("SELECT day, lesson_id, minutes, session_count FROM practice_rollups ORDER BY day") == [
+            ("2026-10-01", 1, 30, 2), ("2026-10-02", 1, 5, 1),
+        ]
+        assert rows("SELECT lookup_key FROM songs") == [("wonderwall oasis",)]
+
+    command.upgrade(config, "head")
+    command.downgrade(config, "base")
+
+
+def test_progression_index_backfills_existing_rows(alembic_db):
+    from app.api.chordTheory import parse_progression, ngrams
+
+    config, engine = alembic_db
+    command.upgrade(config, "e5a1c8f3b276")
+    with engine.begin() as conn:
+        conn.execute(sa.text(
+            "INSERT INTO chord_progressions (id, progression, arrangement) VALUES "
+            "(1, 'Chorus: C G Am F', NULL), (2, 'Em C G D', '{\"key\": \"Em\"}'), (3, 'Intro Verse', NULL)"
+        ))
+
+    command.upgrade(config, "f2c6a9d4e815")
+
+    with engine.connect() as conn:
+        rows = {row.id: row for row in conn.execute(sa.text(
+            "SELECT id, tonic, degrees, ngram_count FROM chord_progressions"
+        ))}
+        postings = {}
+        for gram, progression_id in conn.execute(sa.text("SELECT gram, progression_id FROM progression_ngrams")):
+            postings.setdefault(progression_id, set()).add(gram)
+    for row_id, text, key in [(1, "C G Am F", None), (2, "Em C G D", "Em")]:
+        encoded = parse_progression(text, key)
+        assert (rows[row_id].tonic, bytes(rows[row_id].degrees)) == (encoded.tonic, encoded.codes)
+        assert postings[row_id] == ngrams(encoded.codes)
+    assert rows[3].degrees is None and 3 not in postings
@@ -0,0 +1,87 @@
+# tests/test_pagination.py
+import base64
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.dependencies import encode_cursor, decode_cursor
+from app.models import Song, User
+
+
+def add_songs(db, count: int):
+    db.add_all([Song(title=f"Song {i}", artist="Artist", genre="rock" if i % 2 else "folk") for i in range(count)])
+    db.commit()
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(12345)) == 12345
+
+
+def test_pages_cover_every_row_once(client, db):
+    add_songs(db, 23)
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        params = {"limit": 5, **({"cursor": cursor} if cursor else {})}
+        body = client.get("/songs/", params=params).json()
+        assert body["limit"] == 5 and len(body["items"]) <= 5
+        seen += [item["id"] for item in body["items"]]
+        pages += 1
+        cursor = body["nextCursor"]
+        if cursor is None:
+            break
+
+    assert pages == 5
+    assert seen == sorted(seen) and len(set(seen)) == 23
+
+
+def test_filtered_pages_keep_the_filter(client, db):
+    add_songs(db, 10)
+    first = client.get("/songs/", params={"limit": 3, "genre": "rock"}).json()
+    second = client.get("/songs/", params={"limit": 3, "genre": "rock", "cursor": first["nextCursor"]}).json()
+
+    genres = {item["genre"] for item in first["items"] + second["items"]}
+    assert genres == {"rock"}
+    assert second["nextCursor"] is None  # 5 rock songs: 3 + 2
+
+
+def test_tampered_cursors_are_rejected(client, db):
+    add_songs(db, 3)
+    not_json = base64.urlsafe_b64encode(b"id=3").decode()
+    wrong_type = base64.urlsafe_b64encode(b'{"id":"3 OR 1=1"}').decode()
+    missing_id = base64.urlsafe_b64encode(b'{"last":3}').decode()
+
+    for cursor in ("%%%", not_json, wrong_type, missing_id, encode_cursor(1)[:-2] + "!!"):
+        response = client.get("/songs/", params={"cursor": cursor})
+        assert response.status_code == 400, cursor
+        assert response.json()["detail"] == "Invalid cursor"
+
+
+def test_projection_returns_only_requested_fields(client, db):
+    add_songs(db, 2)
+    items = client.get("/songs/", params={"fields": "title"}).json()["items"]
+    # id is always included because the cursor is built from it
+    assert [set(item) for item in items] == [{"id", "title"}, {"id", "title"}]
+
+
+def test_projection_rejects_fields_outside_allow_list(client, db):
+    db.add(User(name="a", email="a@example.com", password="secret"))
+    db.commit()
+
+    response = client.get("/users/", params={"fields": "name,password"})
+    assert response.status_code == 400
+    assert "password" in response.json()["detail"]
+    assert all("password" not in item for item in client.get("/users/").json()["items"])
+
+
+def test_admin_routers_require_the_api_key(db):
+    anonymous = TestClient(app)
+    for path in ("/songs/", "/lessons/", "/instruments/", "/users/"):
+        assert anonymous.get(path).status_code == 401
+    assert anonymous.get("/users/", headers={"X-API-Key": "wrong"}).status_code == 401
+    assert anonymous.get("/health").status_code == 200
+
+
+def test_admin_routers_are_closed_without_a_configured_key(client, monkeypatch):
+    monkeypatch.setattr("app.dependencies.ADMIN_API_KEY", "")
+    assert client.get("/songs/").status_code == 403
@@ -0,0 +1,46 @@
+# tests/test_practice_api.py
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models import User, Instrument, Lesson, Song
+
+
+def setup(db):
+    user = User(name="p", email="p@example.com", password="secret")
+    lesson = Lesson(title="Scales", lesson_type="Theory", instrument=Instrument(name="Piano", type="Keyboard"))
+    song = Song(title="Imagine", artist="John Lennon")
+    db.add_all([user, lesson, song])
+    db.commit()
+    return user.id, lesson.id, song.id
+
+
+def test_log_session_and_read_analytics(client, db):
+    user_id, lesson_id, song_id = setup(db)
+
+    response = client.post("/practice/sessions", json={"user_id": user_id, "lesson_id": lesson_id, "duration_minutes": 20})
+    assert response.status_code == 201
+    assert client.post("/practice/sessions", json={"user_id": user_id, "song_id": song_id, "duration_minutes": 10}).status_code == 201
+
+    analytics = client.get(f"/practice/users/{user_id}/analytics").json()
+    assert (analytics["totalMinutes"], analytics["totalSessions"]) == (30, 2)
+
+
+def test_unknown_references_are_404(client, db):
+    user_id, lesson_id, song_id = setup(db)
+
+    for body, detail in (
+        ({"user_id": 999, "duration_minutes": 5}, "User not found"),
+        ({"user_id": user_id, "lesson_id": 999, "duration_minutes": 5}, "Lesson not found"),
+        ({"user_id": user_id, "song_id": 999, "duration_minutes": 5}, "Song not found"),
+    ):
+        response = client.post("/practice/sessions", json=body)
+        assert (response.status_code, response.json()["detail"]) == (404, detail)
+    assert client.get("/practice/users/999/analytics").status_code == 404
+
+
+def test_practice_requires_the_api_key(db):
+    user_id, _, _ = setup(db)
+    anonymous = TestClient(app)
+
+    assert anonymous.post("/practice/sessions", json={"user_id": user_id, "duration_minutes": 5}).status_code == 401
+    assert anonymous.get(f"/practice/users/{user_id}/analytics").status_code == 401
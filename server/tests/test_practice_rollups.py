@@ -0,0 +1,94 @@
+# tests/test_practice_rollups.py
+from datetime import datetime, timezone
+
+from sqlalchemy import func
+
+from app.api.practiceAnalytics import rebuild_rollups, user_analytics
+from app.models import User, Instrument, Lesson, Song, PracticeSession, PracticeRollup
+
+
+def at(day: int, hour: int = 12) -> datetime:
+    return datetime(2026, 3, day, hour, tzinfo=timezone.utc)
+
+
+def rollups(db) -> dict:
+    return {
+        (r.user_id, r.day, r.lesson_id, r.song_id): (r.minutes, r.session_count)
+        for r in db.query(PracticeRollup).all()
+    }
+
+
+def raw_aggregate(db) -> dict:
+    """What the rollups should hold, computed straight from the sessions."""
+    day = func.date(PracticeSession.created_at)
+    lesson_id = func.coalesce(PracticeSession.lesson_id, 0)
+    song_id = func.coalesce(PracticeSession.song_id, 0)
+    rows = (
+        db.query(PracticeSession.user_id, day, lesson_id, song_id,
+                 func.sum(PracticeSession.duration_minutes), func.count())
+        .filter(PracticeSession.user_id.isnot(None))
+        .group_by(PracticeSession.user_id, day, lesson_id, song_id)
+        .all()
+    )
+    return {
+        (user_id, datetime.fromisoformat(d).date(), lesson, song): (minutes, count)
+        for user_id, d, lesson, song, minutes, count in rows
+    }
+
+
+def setup_sessions(db):
+    user = User(name="p", email="p@example.com", password="secret")
+    instrument = Instrument(name="Guitar", type="String")
+    lessons = [Lesson(title=f"Lesson {i}", instrument=instrument) for i in range(2)]
+    song = Song(title="Song", artist="Artist")
+    sessions = [
+        PracticeSession(user=user, lesson=lessons[0], duration_minutes=20, created_at=at(1)),
+        PracticeSession(user=user, lesson=lessons[0], duration_minutes=10, created_at=at(1, 18)),
+        PracticeSession(user=user, lesson=lessons[1], duration_minutes=15, created_at=at(2)),
+        PracticeSession(user=user, song=song, duration_minutes=30, created_at=at(3)),
+    ]
+    db.add_all(sessions)
+    db.commit()
+    return user, lessons, song, sessions
+
+
+def test_insert_matches_raw_aggregate(db):
+    setup_sessions(db)
+    assert rollups(db) == raw_aggregate(db)
+
+
+def test_updates_move_minutes_between_rollup_rows(db):
+    user, lessons, song, sessions = setup_sessions(db)
+
+    sessions[0].duration_minutes = 45           # same row, new minutes
+    sessions[1].lesson = lessons[1]             # other lesson
+    sessions[2].created_at = at(5)              # other day, leaves an empty row behind
+    sessions[3].feedback = "Nice"               # no rollup column changed
+    db.commit()
+
+    assert rollups(db) == raw_aggregate(db)
+    assert all(count > 0 for _, count in rollups(db).values())
+
+
+def test_deletes_take_sessions_out(db):
+    user, lessons, song, sessions = setup_sessions(db)
+
+    db.delete(sessions[1])
+    db.delete(sessions[3])
+    db.commit()
+
+    assert rollups(db) == raw_aggregate(db)
+    assert (user.id, at(3).date(), 0, song.id) not in rollups(db)
+    analytics = user_analytics(db, user.id, days=7, today=at(5).date())
+    assert (analytics["totalMinutes"], analytics["totalSessions"]) == (35, 2)
+
+
+def test_rebuild_agrees_with_incremental_rollups(db):
+    user, lessons, song, sessions = setup_sessions(db)
+    sessions[0].duration_minutes = 5
+    db.delete(sessions[2])
+    db.commit()
+    incremental = rollups(db)
+
+    rebuild_rollups(db)
+    assert rollups(db) == incremental == raw_aggregate(db)
@@ -0,0 +1,146 @@
+# tests/test_practice_stats.py
+import json
+from datetime import date, timedelta
+
+import pytest
+
+from app.api.practiceStats import TOP_GROUPS, TREND_WINDOW_DAYS, summarize_sessions
+
+TODAY = date(2026, 10, 17)
+
+
+def day(offset: int) -> str:
+    return (TODAY - timedelta(days=offset)).isoformat()
+
+
+def test_empty_history():
+    assert summarize_sessions([], today=TODAY) == {"sessionCount": 0, "totalMinutes": 0}
+    assert summarize_sessions(None, today=TODAY) == {"sessionCount": 0, "totalMinutes": 0}
+    assert summarize_sessions(["not a session"], today=TODAY) == {"sessionCount": 0, "totalMinutes": 0}
+
+
+def test_streaks_count_consecutive_active_days():
+    # Active 10..8 days ago (3 days), then yesterday and today (2 days)
+    sessions = [{"date": day(offset), "duration": 20} for offset in (10, 9, 8, 1, 0, 0)]
+
+    summary = summarize_sessions(sessions, today=TODAY)
+
+    assert summary["longestStreakDays"] == 3
+    assert summary["currentStreakDays"] == 2
+    assert summary["activeDays"] == 5
+    assert summary["activeDayRatio"] == round(5 / 11, 2)
+    assert summary["firstSession"] == day(10) and summary["lastSession"] == day(0)
+    assert summary["daysSinceLastSession"] == 0
+
+
+def test_streak_lapses_after_a_missed_day():
+    sessions = [{"date": day(offset), "duration": 15} for offset in (4, 3, 2)]
+
+    summary = summarize_sessions(sessions, today=TODAY)
+
+    assert summary["longestStreakDays"] == 3
+    assert summary["currentStreakDays"] == 0
+    assert summary["daysSinceLastSession"] == 2
+
+
+def test_trend_slope_follows_daily_minutes():
+    rising = [{"date": day(offset), "duration": TREND_WINDOW_DAYS - offset} for offset in range(TREND_WINDOW_DAYS)]
+    falling = [{"date": day(offset), "duration": offset + 1} for offset in range(TREND_WINDOW_DAYS)]
+
+    assert summarize_sessions(rising, today=TODAY)["trendMinutesPerDay"] == pytest.approx(1.0)
+    assert summarize_sessions(falling, today=TODAY)["trendMinutesPerDay"] == pytest.approx(-1.0)
+    # Sessions outside the window leave it flat
+    old = [{"date": day(TREND_WINDOW_DAYS + 5), "duration": 30}]
+    summary = summarize_sessions(old, today=TODAY)
+    assert summary["trendMinutesPerDay"] == 0.0
+    assert summary["last4WeeksMinutes"] == [0.0, 0.0, 0.0, 0.0]
+
+
+def test_weekly_totals_cover_the_window_oldest_first():
+    sessions = [{"date": day(0), "duration": 30}, {"date": day(TREND_WINDOW_DAYS - 1), "duration": 10}]
+
+    assert summarize_sessions(sessions, today=TODAY)["last4WeeksMinutes"] == [10.0, 0.0, 0.0, 30.0]
+
+
+def test_breakdowns_keep_top_groups_and_fold_the_rest_into_other():
+    sessions = [
+        {"date": day(0), "duration": 10 * (i + 1), "instrument": f"inst{i}", "focus": "scales"}
+        for i in range(TOP_GROUPS + 3)
+    ]
+
+    summary = summarize_sessions(sessions, today=TODAY)
+
+    by_instrument = summary["minutesByInstrument"]
+    assert len(by_instrument) == TOP_GROUPS + 1
+    assert list(by_instrument)[:TOP_GROUPS] == [f"inst{i}" for i in range(TOP_GROUPS + 2, 2, -1)]
+    assert by_instrument["other"] == 10 + 20 + 30
+    assert sum(by_instrument.values()) == summary["totalMinutes"]
+    assert summary["minutesByFocus"] == {"scales": summary["totalMinutes"]}
+    assert "minutesByLesson" not in summary
+
+
+def test_stored_session_fields_are_understood():
+    sessions = [
+        {"created_at": f"{day(1)}T18:30:00", "duration_minutes": 25, "lesson_id": 3},
+        {"created_at": f"{day(0)}T08:00:00", "duration_minutes": 35, "song_id": 7},
+    ]
+
+    summary = summarize_sessions(sessions, today=TODAY)
+
+    assert summary["totalMinutes"] == 60
+    assert summary["currentStreakDays"] == 2
+    assert summary["minutesByLesson"] == {"3": 25.0}
+    assert summary["minutesBySong"] == {"7": 35.0}
+
+
+def test_malformed_and_future_dates_are_left_out_of_day_stats():
+    sessions = [
+        {"date": day(0), "duration": 20},
+        {"date": "not a date", "duration": 30},
+        {"duration": 10},
+        {"date": day(-3), "duration": 40},      # client clock ahead
+        {"date": day(1), "duration": "abc"},    # unusable minutes
+        {"date": day(2), "duration": -5},
+    ]
+
+    summary = summarize_sessions(sessions, today=TODAY)
+
+    # Minutes still count wherever they're valid...
+    assert summary["sessionCount"] == 4
+    assert summary["totalMinutes"] == 100
+    # ...but only well-dated, past sessions shape the calendar
+    assert summary["activeDays"] == 1
+    assert summary["lastSession"] == day(0)
+    assert summary["currentStreakDays"] == 1
+
+
+def test_sessions_without_usable_minutes():
+    summary = summarize_sessions([{"date": day(0), "duration": None}], today=TODAY)
+
+    assert summary == {"sessionCount": 1, "totalMinutes": 0}
+
+
+def test_recent_notes_are_newest_first_and_truncated():
+    sessions = [{"date": day(offset), "duration": 10, "notes": f"note {offset} " + "x" * 200} for offset in range(5)]
+
+    notes = summarize_sessions(sessions, today=TODAY)["recentNotes"]
+
+    assert [note.split()[1] for note in notes] == ["0", "1", "2"]
+    assert all(len(note) == 120 for note in notes)
+
+
+def test_summary_size_is_fixed_as_history_grows():
+    def history(count: int) -> list:
+        return [
+            {"date": day(i % 400), "duration": 5 + i % 60, "instrument": f"inst{i % 40}",
+             "focus": f"focus{i % 25}", "lesson_id": i % 90, "song_id": i % 70, "notes": f"session {i}"}
+            for i in range(count)
+        ]
+
+    small = summarize_sessions(history(200), today=TODAY)
+    large = summarize_sessions(history(20000), today=TODAY)
+
+    assert small.keys() == large.keys()
+    assert len(json.dumps(large)) <= len(json.dumps(small)) * 1.2
+    for key in ("minutesByInstrument", "minutesByFocus", "minutesByLesson", "minutesBySong"):
+        assert len(large[key]) == TOP_GROUPS + 1
@@ -0,0 +1,96 @@
+# tests/test_progression_index.py
+import pytest
+
+from app.models import ChordProgression, ProgressionNgram, Song
+from app.api.chordTheory import parse_progression, ngrams, contains
+
+
+@pytest.mark.parametrize("text, key, expected_key, numerals", [
+    ("C G Am F", None, "C", ["I", "V", "vi", "IV"]),
+    ("E B C#m A", None, "E", ["I", "V", "vi", "IV"]),
+    ("I–V–vi–IV", None, "C", ["I", "V", "vi", "IV"]),
+    ("Em C G D", "Em", "G", ["vi", "IV", "I", "V"]),
+    ("Dm7 G7 Cmaj7", None, "C", ["ii", "V7", "I"]),
+    ("Bbsus4 F/A Gm7b5 Ebaug", "Bb", "Bb", ["Isus", "V", "vi°", "IV+"]),
+])
+def test_parse_progression_to_key_relative_numerals(text, key, expected_key, numerals):
+    encoded = parse_progression(text, key)
+
+    assert encoded.key == expected_key
+    assert encoded.numerals() == numerals
+    assert len(encoded.codes) == len(numerals)
+
+
+def test_strict_parse_rejects_unknown_tokens():
+    assert parse_progression("C G ?? F").numerals() == ["I", "V", "IV"]
+    with pytest.raises(ValueError):
+        parse_progression("C G ?? F", strict=True)
+    # Section labels start with chord letters / numerals but aren't chords
+    for label in ("Chorus", "Bridge", "Intro", "Verse"):
+        with pytest.raises(ValueError):
+            parse_progression(f"{label} C G", strict=True)
+
+
+def test_loops_match_their_rotations():
+    axis = parse_progression("I V vi IV").codes
+    rotated = parse_progression("vi IV I V").codes
+
+    assert ngrams(axis) == ngrams(rotated)
+    assert contains(rotated, parse_progression("IV I V").codes)
+    assert not contains(rotated, parse_progression("V IV").codes)
+
+
+def test_postings_follow_orm_writes(db):
+    entry = ChordProgression(progression="C G Am F")
+    db.add(entry)
+    db.commit()
+    assert db.query(ProgressionNgram).filter_by(progression_id=entry.id).count() == 4
+
+    entry.progression = "C F"
+    db.commit()
+    assert entry.degrees == parse_progression("I IV").codes
+    assert db.query(ProgressionNgram).filter_by(progression_id=entry.id).count() == 2
+
+
+def _catalog(db):
+    songs = [Song(title=title, lookup_key=title.lower()) for title in ("Let It Be", "Africa", "Blues", "Jazz")]
+    db.add_all(songs)
+    db.flush()
+    db.add_all([
+        ChordProgression(song_id=songs[0].id, progression="C G Am F"),
+        ChordProgression(song_id=songs[1].id, progression="Am F C G", arrangement='{"key": "Am"}'),
+        ChordProgression(song_id=songs[2].id, progression="A7 D7 A7 E7 D7 A7"),
+        ChordProgression(song_id=songs[3].id, progression="Dm7 G7 Cmaj7 Am7"),
+    ])
+    db.commit()
+
+
+def test_similar_search_ranks_rotations_first(client, db):
+    _catalog(db)
+
+    response = client.get("/progressions/search", params={"q": "G D Em C"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["query"]["numerals"] == ["I", "V", "vi", "IV"]
+    titles = [item["songTitle"] for item in body["items"]]
+    assert titles[:2] == ["Let It Be", "Africa"]
+    assert body["items"][0]["score"] == 1.0
+    # The blues loop shares only "IV I V"; the ii-V-I shares no trigram
+    assert titles[2:] == ["Blues"] and body["items"][2]["score"] < 0.5
+
+
+def test_contains_search_requires_adjacent_chords(client, db):
+    _catalog(db)
+
+    items = client.get("/progressions/search", params={"q": "vi IV", "mode": "contains"}).json()["items"]
+    assert sorted(item["songTitle"] for item in items) == ["Africa", "Let It Be"]
+
+    items = client.get("/progressions/search", params={"q": "ii V I", "mode": "contains"}).json()["items"]
+    assert [item["songTitle"] for item in items] == ["Jazz"]
+
+
+def test_unparseable_query_is_rejected(client, db):
+    assert client.get("/progressions/search", params={"q": "hello world"}).status_code == 400
+    assert client.get("/progressions/parse", params={"q": "C G", "key": "H"}).status_code == 400
+    assert client.get("/progressions/parse", params={"q": "Chorus"}).status_code == 400
@@ -0,0 +1,108 @@
+# tests/test_provider_limiter.py
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.api import providerLimiter
+from app.api.providerLimiter import ProviderLimiter, ProviderBusyError
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake monotonic clock for the limiter; its sleeps advance the clock
+    instead of waiting and are recorded."""
+    now = [1000.0]
+    sleeps = []
+
+    async def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+        await asyncio.sleep(0)
+
+    monkeypatch.setattr(providerLimiter, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    monkeypatch.setattr(providerLimiter, "asyncio", SimpleNamespace(Semaphore=asyncio.Semaphore, sleep=sleep))
+    return SimpleNamespace(now=now, sleeps=sleeps)
+
+
+async def hold(limiter, started, release):
+    async with limiter.slot():
+        started.append(limiter.in_flight)
+        await release.wait()
+
+
+def test_concurrency_is_capped(clock):
+    async def scenario():
+        limiter = ProviderLimiter("test", max_concurrency=2)
+        started, release = [], asyncio.Event()
+        tasks = [asyncio.create_task(hold(limiter, started, release)) for _ in range(5)]
+        await asyncio.sleep(0.01)
+
+        assert limiter.in_flight == 2 and len(started) == 2
+        assert limiter.snapshot()["queueDepth"] == 3
+        assert limiter.snapshot()["peakQueueDepth"] == 3
+
+        release.set()
+        await asyncio.gather(*tasks)
+        assert max(started) == 2
+        snapshot = limiter.snapshot()
+        assert (snapshot["inFlight"], snapshot["queueDepth"], snapshot["totalCalls"]) == (0, 0, 5)
+        assert snapshot["rejected"] == 0 and snapshot["maxQueueDepth"] is None
+
+    asyncio.run(scenario())
+
+
+def test_token_bucket_allows_a_burst_then_paces(clock):
+    async def scenario():
+        limiter = ProviderLimiter("test", max_concurrency=2, rate_per_minute=60)
+        starts = []
+        for _ in range(5):
+            async with limiter.slot():
+                starts.append(clock.now[0])
+        return starts
+
+    starts = asyncio.run(scenario())
+
+    # Two tokens up front, then one per second
+    assert [round(t - 1000.0, 6) for t in starts] == [0.0, 0.0, 1.0, 2.0, 3.0]
+    assert clock.sleeps == pytest.approx([1.0, 1.0, 1.0])
+
+
+def test_token_bucket_refills_while_idle_up_to_the_burst(clock):
+    async def scenario():
+        limiter = ProviderLimiter("test", max_concurrency=2, rate_per_minute=30)
+        for _ in range(2):
+            async with limiter.slot():
+                pass
+        clock.now[0] += 60  # would be 30 tokens, but the bucket holds 2
+        for _ in range(3):
+            async with limiter.slot():
+                pass
+
+    asyncio.run(scenario())
+
+    assert clock.sleeps == pytest.approx([2.0])
+
+
+def test_full_queue_rejects_new_callers(clock):
+    async def scenario():
+        limiter = ProviderLimiter("test", max_concurrency=1, max_queue=2)
+        started, release = [], asyncio.Event()
+        tasks = [asyncio.create_task(hold(limiter, started, release)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        assert limiter.waiting == 2
+
+        with pytest.raises(ProviderBusyError):
+            async with limiter.slot():
+                pass
+        assert limiter.snapshot()["rejected"] == 1
+        assert limiter.snapshot()["maxQueueDepth"] == 2
+
+        # Rejection doesn't leak a queue position or a slot
+        release.set()
+        await asyncio.gather(*tasks)
+        async with limiter.slot():
+            assert limiter.in_flight == 1
+        assert (limiter.waiting, limiter.in_flight, limiter.total_calls) == (0, 0, 4)
+
+    asyncio.run(scenario())
@@ -0,0 +1,80 @@
+# tests/test_query_counts.py
+from app.models import (
+    User, Instrument, Lesson, Song, ChordProgression, Melody, UserSong, UserSettings,
+)
+
+
+def make_user(db, name: str, rows: int) -> int:
+    """A user with `rows` entries in every relationship the profile shows."""
+    instruments = [Instrument(name=f"{name}-inst{i}", type="String") for i in range(rows)]
+    songs = [Song(title=f"{name}-song{i}", artist="Artist") for i in range(rows)]
+    user = User(
+        name=name,
+        email=f"{name}@example.com",
+        password="secret",
+        skill_level="Beginner",
+        instruments=instruments,
+        settings=UserSettings(tuning_reference="A440", preferred_metronome_tempo=90),
+    )
+    user.chord_progressions = [
+        ChordProgression(progression="C G Am F", instrument=instruments[i]) for i in range(rows)
+    ]
+    user.melodies = [Melody(melody_data="C D E", instrument=instruments[i]) for i in range(rows)]
+    user.user_songs = [UserSong(song=song) for song in songs]
+    db.add(user)
+    db.commit()
+    return user.id
+
+
+def test_user_profile_query_count_is_constant(client, db, count_queries):
+    small = make_user(db, "small", 2)
+    large = make_user(db, "large", 25)
+
+    with count_queries(max_queries=5) as small_counter:
+        small_response = client.get(f"/users/{small}")
+    with count_queries(max_queries=5) as large_counter:
+        large_response = client.get(f"/users/{large}")
+
+    assert small_response.status_code == 200
+    assert large_response.status_code == 200
+    assert small_counter.count == large_counter.count, (small_counter.count, large_counter.count)
+
+    profile = large_response.json()
+    assert "password" not in profile
+    assert profile["settings"]["preferred_metronome_tempo"] == 90
+    assert len(profile["instruments"]) == 25
+    assert len(profile["chord_progressions"]) == 25
+    assert len(profile["melodies"]) == 25
+    assert len(profile["user_songs"]) == 25
+    assert profile["user_songs"][0]["song"]["artist"] == "Artist"
+
+
+def test_user_profile_not_found(client, db):
+    assert client.get("/users/999").status_code == 404
+
+
+def test_lesson_detail_is_a_single_query(client, db, count_queries):
+    guitar = Instrument(name="Guitar", type="String")
+    lesson = Lesson(title="Barre chords", lesson_type="video", difficulty="Intermediate", instrument=guitar)
+    db.add(lesson)
+    db.commit()
+
+    with count_queries(max_queries=1):
+        response = client.get(f"/lessons/{lesson.id}")
+
+    assert response.status_code == 200
+    assert response.json()["instrument"]["name"] == "Guitar"
+    assert client.get("/lessons/999").status_code == 404
+
+
+def test_list_pages_are_a_single_query(client, db, count_queries):
+    db.add_all(Song(title=f"Song {i}", genre="rock") for i in range(30))
+    db.commit()
+
+    with count_queries(max_queries=1):
+        first = client.get("/songs/?limit=10&genre=rock").json()
+    with count_queries(max_queries=1):
+        second = client.get(f"/songs/?limit=10&genre=rock&cursor={first['nextCursor']}").json()
+
+    assert len(first["items"]) == 10
+    assert second["items"][0]["id"] > first["items"][-1]["id"]
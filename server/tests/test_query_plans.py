@@ -0,0 +1,113 @@
+# tests/test_query_plans.py
+"""Query-plan regression tests: the hot lookups must be served by an index,
+not a full table scan, so dropping or renaming an index fails here first."""
+from datetime import date
+
+import pytest
+from sqlalchemy import select
+
+from app.database import engine
+from app.models import (
+    User, Lesson, Song, ChordProgression, Melody, PracticeSession, PracticeRollup,
+    UserSong, UserSettings, SongAlias, ProgressionNgram, user_instruments_table,
+)
+
+
+def explain(conn, stmt) -> str:
+    sql = str(stmt.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+    if conn.dialect.name == "postgresql":
+        # Tiny test tables would always be seq-scanned; ask whether an index *can* serve the query
+        conn.exec_driver_sql("SET enable_seqscan = off")
+        return "\n".join(row[0] for row in conn.exec_driver_sql(f"EXPLAIN {sql}"))
+    return "\n".join(row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}"))
+
+
+def assert_index_only_access(plan: str, table: str, sorted_by_index: bool = False):
+    if "Seq Scan" in plan:
+        pytest.fail(f"Sequential scan in plan:\n{plan}")
+    for line in plan.splitlines():
+        # SQLite: "SCAN t" is a full scan, "SCAN t USING (COVERING) INDEX" walks an index
+        if line.startswith(f"SCAN {table}") and "INDEX" not in line:
+            pytest.fail(f"Full scan of {table}:\n{plan}")
+    if sorted_by_index:
+        assert "TEMP B-TREE" not in plan and "Sort" not in plan, f"Extra sort step:\n{plan}"
+
+
+HOT_QUERIES = {
+    "practice history": (
+        select(PracticeSession).where(PracticeSession.user_id == 1)
+        .order_by(PracticeSession.created_at.desc()).limit(20),
+        "practice_sessions", True,
+    ),
+    "practice by lesson": (
+        select(PracticeSession.id).where(PracticeSession.lesson_id == 1), "practice_sessions", False,
+    ),
+    "practice by song": (
+        select(PracticeSession.id).where(PracticeSession.song_id == 1), "practice_sessions", False,
+    ),
+    "chord progression history": (
+        select(ChordProgression).where(ChordProgression.user_id == 1)
+        .order_by(ChordProgression.created_at.desc()).limit(20),
+        "chord_progressions", True,
+    ),
+    "chord progressions for a song": (
+        select(ChordProgression).where(ChordProgression.song_id == 1), "chord_progressions", False,
+    ),
+    "melody history": (
+        select(Melody).where(Melody.user_id == 1).order_by(Melody.created_at.desc()).limit(20),
+        "melodies", True,
+    ),
+    "user songs": (
+        select(UserSong).where(UserSong.user_id.in_([1, 2])), "user_songs", False,
+    ),
+    "song followers": (
+        select(UserSong.user_id).where(UserSong.song_id == 1), "user_songs", False,
+    ),
+    "user instruments": (
+        select(user_instruments_table).where(user_instruments_table.c.user_id.in_([1, 2])),
+        "user_instruments", False,
+    ),
+    "user settings": (
+        select(UserSettings).where(UserSettings.user_id.in_([1, 2])), "user_settings", False,
+    ),
+    "login by email": (
+        select(User).where(User.email == "a@example.com"), "users", False,
+    ),
+    "lessons for an instrument": (
+        select(Lesson.id, Lesson.title).where(Lesson.instrument_id == 1, Lesson.id > 10)
+        .order_by(Lesson.id).limit(50),
+        "lessons", True,
+    ),
+    "songs by genre page": (
+        select(Song.id, Song.title).where(Song.genre == "Rock", Song.id > 10).order_by(Song.id).limit(50),
+        "songs", True,
+    ),
+    "song by lookup key": (
+        select(Song.id).where(Song.lookup_key == "wonderwall oasis"), "songs", False,
+    ),
+    "song aliases": (
+        select(SongAlias.alias).where(SongAlias.song_id == 1), "song_aliases", False,
+    ),
+    "practice analytics window": (
+        select(PracticeRollup.day, PracticeRollup.minutes).where(
+            PracticeRollup.user_id == 1, PracticeRollup.day >= date(2026, 1, 1)
+        ),
+        "practice_rollups", False,
+    ),
+    "progression trigram postings": (
+        select(ProgressionNgram.progression_id).where(ProgressionNgram.gram.in_([65864, 3680584])),
+        "progression_ngrams", False,
+    ),
+    "progression trigram prefix": (
+        select(ProgressionNgram.progression_id).where(ProgressionNgram.gram.between(65536, 65791)),
+        "progression_ngrams", False,
+    ),
+}
+
+
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+def test_hot_query_uses_index(db, name):
+    stmt, table, sorted_by_index = HOT_QUERIES[name]
+    with engine.connect() as conn:
+        plan = explain(conn, stmt)
+    assert_index_only_access(plan, table, sorted_by_index)
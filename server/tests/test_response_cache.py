@@ -0,0 +1,57 @@
+# tests/test_response_cache.py
+import asyncio
+
+from app.api import responseCache
+from app.api.responseCache import ResponseCache, cache_key
+
+
+def test_cache_key_folds_case_only_for_named_params():
+    assert cache_key("rhythm", {"timeSignature": "4/4", "level": "Beginner"}) == \
+        cache_key("rhythm", {"timeSignature": "4/4", "level": " beginner "})
+    assert cache_key("lyrics", {"topic": "Rain in  Paris"}) == cache_key("lyrics", {"topic": "Rain in Paris"})
+    assert cache_key("lyrics", {"topic": "Rain in Paris"}) != cache_key("lyrics", {"topic": "rain in paris"})
+
+
+def test_byte_cap_counts_utf8_bytes_and_evicts_oldest():
+    cache = ResponseCache(ttl=60, max_bytes=40)
+
+    async def scenario():
+        await cache.set("a", {"t": "ééééé"})   # 18 bytes, 13 characters
+        await cache.set("b", {"t": "ééééé"})
+        await cache.set("c", {"t": "x"})
+        return [await cache.get(key) for key in ("a", "b", "c")]
+
+    assert asyncio.run(scenario()) == [None, {"t": "ééééé"}, {"t": "x"}]
+    assert cache.stats()["bytes"] <= 40 and cache.evictions == 1
+
+
+def test_expired_entries_miss():
+    cache = ResponseCache(ttl=-1, max_bytes=1000)
+
+    async def scenario():
+        await cache.set("a", {"v": 1})
+        return await cache.get("a")
+
+    assert asyncio.run(scenario()) is None
+
+
+def test_disk_store_survives_restart_and_purges_expired_rows(tmp_path, monkeypatch):
+    path = str(tmp_path / "cache.db")
+
+    async def write():
+        await ResponseCache(ttl=60, max_bytes=1000, disk_path=path).set("fresh", {"v": 1})
+        await ResponseCache(ttl=-1, max_bytes=1000, disk_path=path).set("stale", {"v": 2})
+
+    asyncio.run(write())
+    restarted = ResponseCache(ttl=60, max_bytes=1000, disk_path=path)
+
+    assert asyncio.run(restarted.get("fresh")) == {"v": 1}
+    assert restarted.stats()["diskHits"] == 1
+    # Purged on open, without ever being read
+    assert restarted._disk._conn.execute("SELECT key FROM ai_cache").fetchall() == [("fresh",)]
+
+    monkeypatch.setattr(responseCache, "DISK_PURGE_INTERVAL", 0)
+    expiring = ResponseCache(ttl=-1, max_bytes=1000, disk_path=path)
+    asyncio.run(expiring.set("gone", {"v": 3}))
+    asyncio.run(expiring.set("also-gone", {"v": 4}))
+    assert ("gone",) not in expiring._disk._conn.execute("SELECT key FROM ai_cache").fetchall()
@@ -0,0 +1,60 @@
+# tests/test_rhythm_patterns.py
+
+import pytest
+
+from app.api.rhythmPatterns import RHYTHM_PATTERNS, rule_based_rhythm
+from app.api.geminiService import gemini_music_service
+from app.schemas import RhythmPatternResult
+
+SIXTEENTHS = {"sixteenth": 1, "eighth": 2, "dotted eighth": 3, "quarter": 4,
+              "dotted quarter": 6, "half": 8, "dotted half": 12, "whole": 16}
+
+
+@pytest.mark.parametrize("time_sig, level", sorted(RHYTHM_PATTERNS))
+def test_every_pattern_fills_one_bar(time_sig, level):
+    result = RhythmPatternResult.model_validate(rule_based_rhythm(time_sig, level))
+
+    beats, unit = (int(part) for part in time_sig.split("/"))
+    assert sum(SIXTEENTHS[step["duration"]] for step in result.pattern) == beats * 16 // unit
+    assert result.pattern[0]["beat"] == 1 and result.pattern[0]["stroke"] == "Down"
+
+
+def test_beginner_common_time_is_quarter_downstrums():
+    result = rule_based_rhythm("4/4", "Beginner")
+
+    assert [(s["count"], s["stroke"], s["duration"]) for s in result["pattern"]] == [
+        ("1", "Down", "quarter"), ("2", "Down", "quarter"), ("3", "Down", "quarter"), ("4", "Down", "quarter"),
+    ]
+    assert rule_based_rhythm("4/4", "beginner") == result
+
+
+def test_unusual_requests_are_left_to_the_model():
+    assert rule_based_rhythm("7/8", "beginner") is None
+    assert rule_based_rhythm("4/4", "virtuoso") is None
+    assert rule_based_rhythm("4/4", "beginner", style="bossa nova") is None
+    assert rule_based_rhythm("4/4", "beginner", style="Folk") is not None
+
+
+def test_rhythm_endpoint_escalates_only_when_needed(client, monkeypatch):
+    calls = []
+
+    async def model(time_sig, level, style=None):
+        calls.append((time_sig, level, style))
+        return {"name": "Model", "timeSignature": time_sig, "description": "From the model",
+                "pattern": [{"beat": 1, "count": "1", "stroke": "Down", "duration": "whole"}]}
+    monkeypatch.setattr(gemini_music_service, "available", True)
+    monkeypatch.setattr(gemini_music_service, "generate_rhythm_pattern", model)
+
+    local = client.post("/ai/rhythm", json={"timeSignature": "3/4", "level": "intermediate"})
+    assert local.status_code == 200
+    assert local.json()["name"] == "Waltz Strum"
+    assert calls == []
+
+    odd = client.post("/ai/rhythm", json={"timeSignature": "7/8", "level": "advanced"})
+    assert odd.json()["name"] == "Model"
+    asked = client.post("/ai/rhythm", json={"timeSignature": "4/4", "level": "beginner", "generator": "ai"})
+    assert asked.json()["name"] == "Model"
+    assert calls == [("7/8", "advanced", None), ("4/4", "beginner", None)]
+
+    rules_only = client.post("/ai/rhythm", json={"timeSignature": "5/4", "level": "beginner", "generator": "rules"})
+    assert rules_only.status_code == 400
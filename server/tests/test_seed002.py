@@ -0,0 +1,91 @@
+# tests/test_seed002.py
+import pytest
+from sqlalchemy import func
+
+from app.api.chordTheory import ngrams, parse_progression
+from app.api.progressionIndex import find_similar
+from app.models import (
+    User, Instrument, Lesson, Song, ChordProgression, ProgressionNgram,
+    Melody, PracticeSession, PracticeRollup, UserSong, UserSettings, user_instruments_table,
+)
+from app.seeders.seed002 import SyntheticSeeder, INSTRUMENTS
+
+COUNTS = dict(users=200, songs=300, lessons=40, chord_progressions=400,
+              melodies=100, practice_sessions=4000, user_songs=500)
+
+
+@pytest.fixture
+def seeded(db):
+    SyntheticSeeder(seed=7, counts=COUNTS, history_days=60).run()
+    return db
+
+
+def top_share(db, column, top: int) -> float:
+    """Share of practice sessions that go to the `top` busiest ids."""
+    counts = sorted(
+        (n for _, n in db.query(column, func.count()).filter(column.isnot(None)).group_by(column)),
+        reverse=True,
+    )
+    return sum(counts[:top]) / sum(counts)
+
+
+def test_row_counts(seeded):
+    db = seeded
+    assert db.query(Instrument).count() == len(INSTRUMENTS)
+    for model, name in ((User, "users"), (Song, "songs"), (Lesson, "lessons"),
+                        (ChordProgression, "chord_progressions"), (Melody, "melodies"),
+                        (PracticeSession, "practice_sessions"), (UserSong, "user_songs")):
+        assert db.query(model).count() == COUNTS[name], name
+    assert db.query(UserSettings).count() == COUNTS["users"]
+    links = db.query(func.count()).select_from(user_instruments_table).scalar()
+    assert COUNTS["users"] <= links <= 3 * COUNTS["users"]
+
+
+def test_activity_is_zipf_skewed(seeded):
+    db = seeded
+    # Uniform traffic would give the top 5% of users/songs about 5% of the
+    # sessions; the power law hands them a large share
+    assert top_share(db, PracticeSession.user_id, COUNTS["users"] // 20) > 0.4
+    assert top_share(db, PracticeSession.song_id, COUNTS["songs"] // 20) > 0.4
+    # ...while the long tail still shows up
+    active_users = db.query(func.count(func.distinct(PracticeSession.user_id))).scalar()
+    assert active_users > COUNTS["users"] // 4
+
+
+def test_rollups_match_the_sessions(seeded):
+    db = seeded
+    minutes, sessions = db.query(func.sum(PracticeRollup.minutes), func.sum(PracticeRollup.session_count)).one()
+    assert sessions == COUNTS["practice_sessions"]
+    assert minutes == db.query(func.sum(PracticeSession.duration_minutes)).scalar()
+
+    day = func.date(PracticeSession.created_at)
+    raw = {
+        (user_id, d, lesson or 0, song or 0): (total, count)
+        for user_id, d, lesson, song, total, count in (
+            db.query(PracticeSession.user_id, day, PracticeSession.lesson_id, PracticeSession.song_id,
+                     func.sum(PracticeSession.duration_minutes), func.count())
+            .group_by(PracticeSession.user_id, day, PracticeSession.lesson_id, PracticeSession.song_id)
+        )
+    }
+    rollups = {
+        (r.user_id, r.day.isoformat(), r.lesson_id, r.song_id): (r.minutes, r.session_count)
+        for r in db.query(PracticeRollup)
+    }
+    assert rollups == raw
+
+
+def test_progressions_are_encoded_and_indexed(seeded):
+    db = seeded
+    rows = db.query(ChordProgression.id, ChordProgression.degrees, ChordProgression.ngram_count).all()
+    assert all(degrees is not None for _, degrees, _ in rows)
+
+    postings = dict(
+        db.query(ProgressionNgram.progression_id, func.count()).group_by(ProgressionNgram.progression_id).all()
+    )
+    for row_id, degrees, ngram_count in rows:
+        assert postings[row_id] == ngram_count == len(ngrams(degrees))
+
+    # The four-chord loop is seeded in several keys; rotations match too
+    matches = find_similar(db, parse_progression("Am F C G"), limit=5)
+    assert len(matches) == 5
+
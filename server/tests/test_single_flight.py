@@ -0,0 +1,88 @@
+# tests/test_single_flight.py
+import asyncio
+
+import pytest
+
+from app.api.singleFlight import SingleFlight
+
+
+def test_concurrent_callers_share_one_upstream_call():
+    calls = []
+
+    async def upstream():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"value": 42}
+
+    async def scenario():
+        flight = SingleFlight()
+        results = await asyncio.gather(*(flight.do("k", upstream) for _ in range(4)))
+        after = await flight.do("k", upstream)
+        return flight, results, after
+
+    flight, results, after = asyncio.run(scenario())
+
+    assert results == [{"value": 42}] * 4 and after == {"value": 42}
+    assert len(calls) == 2
+    assert flight.stats() == {"callers": 5, "upstreamCalls": 2, "fanInRatio": 2.5, "inFlight": 0}
+
+
+def test_errors_reach_every_caller():
+    async def upstream():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    async def scenario():
+        flight = SingleFlight()
+        return await asyncio.gather(*(flight.do("k", upstream) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_a_caller_leaving_does_not_cancel_the_others():
+    async def scenario():
+        flight = SingleFlight()
+        started = asyncio.Event()
+
+        async def upstream():
+            started.set()
+            await asyncio.sleep(0.02)
+            return "done"
+
+        leaver = asyncio.create_task(flight.do("k", upstream))
+        stayer = asyncio.create_task(flight.do("k", upstream))
+        await started.wait()
+        leaver.cancel()
+        return await stayer, leaver
+
+    result, leaver = asyncio.run(scenario())
+
+    assert result == "done"
+    assert leaver.cancelled()
+
+
+def test_upstream_is_cancelled_when_every_caller_leaves():
+    async def scenario():
+        flight = SingleFlight()
+        cancelled = asyncio.Event()
+
+        async def upstream():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        callers = [asyncio.create_task(flight.do("k", upstream)) for _ in range(2)]
+        await asyncio.sleep(0)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.wait_for(cancelled.wait(), 1)
+        await asyncio.sleep(0)
+        return flight
+
+    flight = asyncio.run(scenario())
+
+    assert flight.stats()["inFlight"] == 0
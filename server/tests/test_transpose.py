@@ -0,0 +1,77 @@
+# tests/test_transpose.py
+import json
+
+from app.models import ChordProgression
+from app.api.arrangementTranspose import transpose_arrangement, transpose_chord_line
+
+ARRANGEMENT = {
+    "songTitle": "Transpose Test", "artist": "Tester", "key": "G", "instrument": "Guitar",
+    "tuning": "E A D G B E", "capoFret": 0,
+    "progressionSummary": ["G", "D/F#", "Em", "C"],
+    "tablature": [{"section": "Verse", "lines": [
+        {"lyrics": "G       D/F#      Em   C", "isChordLine": True},
+        {"lyrics": "Go tell it on the mountain", "isChordLine": False},
+    ]}],
+    "chordDiagrams": [{"chord": "G", "frets": [3, 2, 0, 0, 0, 3], "fingers": [2, 1, 0, 0, 0, 3]}],
+    "substitutions": [{"originalChord": "C", "substitutedChord": "Am7", "theory": "Relative minor"}],
+    "practiceTips": [],
+}
+
+
+def test_chord_lines_keep_their_columns():
+    line = "G   E   Bb|  (Am7)  N.C."
+
+    assert transpose_chord_line(line, 2, 9) == "A   F#  C|   (Bm7)  N.C."
+    assert transpose_chord_line(line, 10, 5) == "F   D   Ab|  (Gm7)  N.C."
+    # A chord that grows pushes its neighbour only when they would touch
+    assert transpose_chord_line("E F", 2, 2) == "F# G"
+
+
+def test_new_key_rewrites_every_chord():
+    result = transpose_arrangement(ARRANGEMENT, key="Bb")
+
+    assert result["key"] == "Bb"
+    assert result["progressionSummary"] == ["Bb", "F/A", "Gm", "Eb"]
+    assert result["tablature"][0]["lines"][0]["lyrics"] == "Bb      F/A       Gm   Eb"
+    assert result["tablature"][0]["lines"][1] == ARRANGEMENT["tablature"][0]["lines"][1]
+    assert result["substitutions"][0]["substitutedChord"] == "Cm7"
+    assert [d["chord"] for d in result["chordDiagrams"]] == ["Bb", "F/A", "Gm", "Eb"]
+    assert ARRANGEMENT["key"] == "G"
+
+
+def test_minor_songs_keep_their_mode():
+    song = {**ARRANGEMENT, "key": "E minor", "progressionSummary": ["Em", "C", "G", "D"]}
+
+    result = transpose_arrangement(song, key="F#")
+
+    assert result["key"] == "F#m"
+    assert result["progressionSummary"] == ["F#m", "D", "A", "E"]
+
+
+def test_capo_changes_shapes_not_chords():
+    result = transpose_arrangement(ARRANGEMENT, capo=2)
+
+    assert result["progressionSummary"] == ARRANGEMENT["progressionSummary"]
+    g = result["chordDiagrams"][0]
+    assert (g["chord"], g["capoFret"], g["frets"]) == ("G", 2, [1, 3, 3, 2, 1, 1])
+    assert g["notes"][0] == "G2"
+
+
+def test_transpose_endpoint(client, db):
+    entry = ChordProgression(progression="G D/F# Em C", arrangement=json.dumps(ARRANGEMENT))
+    db.add(entry)
+    db.commit()
+
+    by_id = client.post("/arrangements/transpose", json={"catalogId": entry.id, "key": "A", "capoFret": 2})
+    assert by_id.status_code == 200
+    assert by_id.json()["key"] == "A"
+    assert by_id.json()["capoFret"] == 2
+    # A with a capo on 2 plays the G shape
+    assert by_id.json()["chordDiagrams"][0]["frets"] == [3, 2, 0, 0, 0, 3]
+
+    inline = client.post("/arrangements/transpose", json={"arrangement": ARRANGEMENT, "key": "C"})
+    assert inline.json()["progressionSummary"] == ["C", "G/B", "Am", "F"]
+
+    assert client.post("/arrangements/transpose", json={"catalogId": 999, "key": "C"}).status_code == 404
+    assert client.post("/arrangements/transpose", json={"arrangement": ARRANGEMENT, "key": "H"}).status_code == 400
+    assert client.post("/arrangements/transpose", json={"arrangement": ARRANGEMENT}).status_code == 422